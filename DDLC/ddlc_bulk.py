@@ -0,0 +1,352 @@
+"""Bulk onboarding; no Streamlit dependency.
+
+DL2 → Foundation: an uploaded .sql dump, or a zip of DDL files, is split
+into pieces at CREATE statements and the pieces are parsed with
+parse_ddl_tables, in a process pool when there is enough DDL to be worth it.
+Every table found then becomes one batch of Foundation mappings with the
+mandatory audit columns, exactly as a single pasted DDL does.
+
+Foundation → Information: every model under a dbt project's models/ folder
+(a local directory or an uploaded zip) is parsed with parse_dbt_script. Its
+source table comes from its ref()/source() calls, its Information table from
+its file name or alias, and TYPE 1/TYPE 2 from its config block. Parsed
+models are cached by a hash of their content, so a re-scan only parses the
+models that changed.
+"""
+import io
+import os
+import re
+import zipfile
+from datetime import datetime
+
+from ddlc_parsing import UNKNOWN_TRANSFORMATION, ParseCache, parse_dbt_script, parse_ddl_tables, script_digest
+
+# Appended to every Foundation table: (column, data type)
+FOUNDATION_AUDIT_COLUMNS = [
+    ("LOAD_TS", "TIMESTAMP_LTZ(9)"),
+    ("LOAD_DT", "VARCHAR(10)"),
+    ("ETL_CREA_NR", "NUMBER(19,0)")
+]
+
+def get_type1_audit_columns():
+    """Return TYPE 1 Information layer mandatory audit columns."""
+    return [
+        ("N/A", "CREA_PRTY_ID", "ETL-generated: Creation party ID"),
+        ("N/A", "CREA_TS", "ETL-generated: Creation timestamp"),
+        ("N/A", "UPDT_PRTY_ID", "ETL-generated: Update party ID"),
+        ("N/A", "UPDT_TS", "ETL-generated: Update timestamp"),
+        ("N/A", "ETL_CREA_TS", "ETL-generated: ETL creation timestamp"),
+        ("ETL_CREA_NR", "ETL_CREA_NR", "Maps to ETL_CREA_NR from Foundation layer"),
+        ("N/A", "ETL_UPDT_TS", "ETL-generated: ETL update timestamp"),
+        ("N/A", "ETL_UPDT_NR", "ETL-generated: ETL update number"),
+        ("LOAD_TS", "FNDN_LOAD_TS", "Maps to LOAD_TS from Foundation layer")
+    ]
+
+def get_type2_audit_columns():
+    """Return TYPE 2 Information layer mandatory audit columns."""
+    return [
+        ("N/A", "CURR_REC_IND", "ETL-generated: Current record indicator for SCD Type 2"),
+        ("N/A", "SRC_SYS_REC_EFF_TS", "ETL-generated: Source system record effective timestamp"),
+        ("N/A", "SRC_SYS_REC_EXP_TS", "ETL-generated: Source system record expiration timestamp"),
+        ("N/A", "CREA_PRTY_ID", "ETL-generated: Creation party ID"),
+        ("N/A", "CREA_TS", "ETL-generated: Creation timestamp"),
+        ("N/A", "UPDT_PRTY_ID", "ETL-generated: Update party ID"),
+        ("N/A", "UPDT_TS", "ETL-generated: Update timestamp"),
+        ("N/A", "ETL_CREA_TS", "ETL-generated: ETL creation timestamp"),
+        ("ETL_CREA_NR", "ETL_CREA_NR", "Maps to ETL_CREA_NR from Foundation layer"),
+        ("N/A", "ETL_UPDT_TS", "ETL-generated: ETL update timestamp"),
+        ("N/A", "ETL_UPDT_NR", "ETL-generated: ETL update number"),
+        ("LOAD_TS", "FNDN_LOAD_TS", "Maps to LOAD_TS from Foundation layer")
+    ]
+
+DDL_FILE_EXTENSIONS = (".sql", ".ddl", ".txt")
+
+# Below this much DDL, starting worker processes costs more than it saves
+PARALLEL_PARSE_MIN_CHARS = 1_000_000
+PIECES_PER_WORKER = 4
+
+# Parsed dbt models kept per process, keyed by content hash; least recently scanned dropped first
+DBT_MODEL_CACHE_SIZE = 5000
+# Below this many models to parse, worker processes cost more than they save
+PARALLEL_MODELS_MIN = 50
+
+_CONFIG_BLOCK = re.compile(r"\{\{\s*config\s*\((.*?)\)\s*\}\}", re.IGNORECASE | re.DOTALL)
+_CONFIG_ALIAS = re.compile(r"""\balias\s*=\s*['"]([^'"]+)['"]""", re.IGNORECASE)
+# SCD type 2 markers in a config block: scd_type=2, table_type='TYPE 2', a snapshot, or a type2/scd2 tag
+_TYPE2_CONFIG = re.compile(r"""\bscd_?type\s*[=:]\s*['"]?(?:type[ _]?)?2\b"""
+                           r"""|\btable_type\s*[=:]\s*['"]type[ _]?2['"]"""
+                           r"""|\bmaterialized\s*=\s*['"]snapshot['"]"""
+                           r"""|['"](?:scd_?(?:type_?)?2|type_?2)['"]""", re.IGNORECASE)
+_RELATION_CALL = re.compile(r"\b(ref|source)\s*\(([^)]*)\)")
+_QUOTED = re.compile(r"""['"]([^'"]+)['"]""")
+
+dbt_model_cache = ParseCache(DBT_MODEL_CACHE_SIZE)
+
+# A line that starts a CREATE statement; pieces of a dump are cut before these
+_STATEMENT_START = re.compile(r"^[ \t]*CREATE\b", re.IGNORECASE | re.MULTILINE)
+
+def read_ddl_upload(file_name, data):
+    """(file name, DDL text) for an uploaded .sql file, or for each DDL file in an uploaded zip."""
+    if file_name.lower().endswith(".zip"):
+        files = []
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for member in sorted(archive.namelist()):
+                base_name = os.path.basename(member)
+                if base_name.startswith(".") or not base_name.lower().endswith(DDL_FILE_EXTENSIONS):
+                    continue
+                files.append((member, archive.read(member).decode("utf-8-sig", errors="replace")))
+        return files
+    return [(file_name, data.decode("utf-8-sig", errors="replace"))]
+
+def split_ddl_script(script, pieces):
+    """Cut a script into at most `pieces` parts, each starting at a CREATE statement.
+
+    Cuts are made at lines that begin with CREATE, so a CREATE at the start of a
+    line inside a block comment or string literal could start a piece early;
+    schema dumps don't write those.
+    """
+    if pieces <= 1 or len(script) < 2:
+        return [script]
+    target = len(script) // pieces
+    parts = []
+    start = 0
+    for match in _STATEMENT_START.finditer(script, target):
+        if match.start() - start >= target:
+            parts.append(script[start:match.start()])
+            start = match.start()
+    parts.append(script[start:])
+    return parts
+
+def _parse_piece(piece):
+    return parse_ddl_tables(piece)
+
+def parse_ddl_files(files, executor=None, workers=None):
+    """Parse every CREATE TABLE in files, a list of (file name, DDL text).
+
+    Returns (file name, table name, columns) in file and script order. With an
+    executor (e.g. a ProcessPoolExecutor of `workers` processes) and at least
+    PARALLEL_PARSE_MIN_CHARS of DDL, the files are split into pieces that are
+    parsed in parallel; otherwise everything is parsed here.
+    """
+    total = sum(len(text) for _, text in files)
+    if executor is None or total < PARALLEL_PARSE_MIN_CHARS:
+        return [(file_name, table, columns) for file_name, text in files for table, columns in parse_ddl_tables(text)]
+    workers = workers or os.cpu_count() or 1
+    pieces = []
+    for file_name, text in files:
+        # Big files are split; small ones go to a worker whole
+        share = max(1, round(len(text) / total * workers * PIECES_PER_WORKER))
+        pieces.extend((file_name, piece) for piece in split_ddl_script(text, share))
+    chunksize = max(1, len(pieces) // (workers * PIECES_PER_WORKER))
+    results = executor.map(_parse_piece, [piece for _, piece in pieces], chunksize=chunksize)
+    return [(file_name, table, columns) for (file_name, _), tables in zip(pieces, results) for table, columns in tables]
+
+def derive_source_table(target_table, target_prefix="", source_prefix=""):
+    """Source (DL2) table name for a Foundation table: target_prefix is swapped for source_prefix."""
+    if target_prefix and target_table.upper().startswith(target_prefix.upper()):
+        target_table = target_table[len(target_prefix):]
+    return source_prefix + target_table
+
+def build_foundation_mappings(columns, source_database, source_schema, source_table,
+                              target_database, target_schema, target_table, timestamp=None):
+    """DL2 → Foundation mapping dicts for a table's columns followed by the mandatory audit columns.
+
+    Business columns get "Straight Move" and an empty source field to be
+    filled in later; audit columns are ETL-generated and have no source.
+    """
+    timestamp = timestamp or datetime.now()
+    audit_names = {name for name, _ in FOUNDATION_AUDIT_COLUMNS}
+    mappings = []
+    for column_name, data_type in list(columns) + FOUNDATION_AUDIT_COLUMNS:
+        audit = column_name in audit_names
+        mappings.append({
+            'layer_transition': 'DL2_to_Foundation',
+            'source_database': source_database,
+            'source_schema': source_schema,
+            'source_table': source_table,
+            'source_field': "N/A" if audit else "",
+            'target_database': target_database,
+            'target_schema': target_schema,
+            'target_table': target_table,
+            'target_field': column_name,
+            'target_data_type': data_type,
+            'transformation_logic': "ETL-generated audit column" if audit else "Straight Move",
+            'change_type': 'New Field Added',
+            'timestamp': timestamp
+        })
+    return mappings
+
+def build_bulk_foundation_mappings(parsed_tables, source_database, source_schema, target_database, target_schema,
+                                   target_prefix="", source_prefix=""):
+    """Mappings for every parsed (file name, table name, columns), in one list.
+
+    The Foundation table is the last part of the DDL's table name and its
+    source table is derived with derive_source_table. A table defined more
+    than once keeps its last definition. Returns (mappings, summary): summary
+    has "tables", a (target table, source table, columns, file name) tuple per
+    table mapped, and the names of tables that were "redefined" or "empty".
+    """
+    timestamp = datetime.now()
+    tables = {}
+    summary = {"tables": [], "redefined": [], "empty": []}
+    for file_name, qualified_name, columns in parsed_tables:
+        table = qualified_name.rsplit(".", 1)[-1]
+        if not columns:
+            summary["empty"].append(table)
+            continue
+        if table in tables:
+            summary["redefined"].append(table)
+        tables[table] = (file_name, columns)
+    mappings = []
+    for table, (file_name, columns) in tables.items():
+        source_table = derive_source_table(table, target_prefix, source_prefix)
+        mappings.extend(build_foundation_mappings(columns, source_database, source_schema, source_table,
+                                                  target_database, target_schema, table, timestamp))
+        summary["tables"].append((table, source_table, len(columns), file_name))
+    return mappings, summary
+
+def build_information_mappings(field_mappings, table_type, source_database, source_schema, source_table,
+                               target_database, target_schema, target_table, timestamp=None):
+    """Foundation → Information mapping dicts for parsed DBT fields followed by the TYPE 1/TYPE 2 audit columns.
+
+    UNKNOWN fields keep the source table; only their field and transformation
+    are left for manual input. The table type is stored as target_data_type.
+    """
+    timestamp = timestamp or datetime.now()
+    audit_columns = get_type1_audit_columns() if table_type == "TYPE 1" else get_type2_audit_columns()
+    mappings = []
+    for source_field, target_field, transformation in list(field_mappings) + audit_columns:
+        mappings.append({
+            'layer_transition': 'Foundation_to_Information',
+            'source_database': source_database,
+            'source_schema': source_schema,
+            'source_table': source_table,
+            'source_field': source_field,
+            'target_database': target_database,
+            'target_schema': target_schema,
+            'target_table': target_table,
+            'target_field': target_field,
+            'target_data_type': f"{table_type}",
+            'transformation_logic': UNKNOWN_TRANSFORMATION if source_field == "UNKNOWN" else transformation,
+            'change_type': 'New Field Added',
+            'timestamp': timestamp
+        })
+    return mappings
+
+def _models_path(path):
+    """Path relative to a dbt project's models/ folder, or None when the file is not under one."""
+    parts = path.replace("\\", "/").split("/")
+    if "models" not in parts[:-1] or not parts[-1].lower().endswith(".sql"):
+        return None
+    return "/".join(parts[parts.index("models") + 1:])
+
+def read_dbt_project(root):
+    """(path under models/, SQL) for every models/**/*.sql of the dbt project at root."""
+    root = os.path.abspath(root)
+    if not os.path.isdir(os.path.join(root, "models")) and os.path.basename(root) == "models":
+        root = os.path.dirname(root)
+    models = []
+    for directory, subdirectories, files in os.walk(os.path.join(root, "models")):
+        subdirectories.sort()
+        for file_name in sorted(files):
+            if file_name.lower().endswith(".sql"):
+                full_path = os.path.join(directory, file_name)
+                with open(full_path, encoding="utf-8-sig", errors="replace") as handle:
+                    models.append((os.path.relpath(full_path, os.path.join(root, "models")).replace(os.sep, "/"), handle.read()))
+    return models
+
+def read_dbt_project_zip(data):
+    """(path under models/, SQL) for every models/**/*.sql in a zipped dbt project."""
+    models = []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for member in sorted(archive.namelist()):
+            path = _models_path(member)
+            if path and not os.path.basename(path).startswith("."):
+                models.append((path, archive.read(member).decode("utf-8-sig", errors="replace")))
+    return models
+
+def describe_dbt_model(sql):
+    """What a model's SQL says about its mapping: field_mappings, table_type, alias, refs and sources.
+
+    refs are the referenced model names and sources the source table names, in
+    order of appearance; table_type is "TYPE 2" when a config block marks the
+    model as SCD type 2 (see _TYPE2_CONFIG), else "TYPE 1".
+    """
+    config = " ".join(_CONFIG_BLOCK.findall(sql))
+    alias = _CONFIG_ALIAS.search(config)
+    refs = []
+    sources = []
+    for function, arguments in _RELATION_CALL.findall(sql):
+        names = _QUOTED.findall(arguments)
+        if names:
+            # ref('package', 'model') and source('source', 'table'): the relation is the last name
+            (refs if function == "ref" else sources).append(names[-1])
+    return {
+        "field_mappings": parse_dbt_script(sql),
+        "table_type": "TYPE 2" if _TYPE2_CONFIG.search(config) else "TYPE 1",
+        "alias": alias.group(1) if alias else None,
+        "refs": refs,
+        "sources": sources,
+    }
+
+def scan_dbt_models(models, executor=None):
+    """Describe every (path, SQL) model, reusing the per-process cache of models already parsed.
+
+    Only models whose content hash is not cached are parsed: on the executor
+    (e.g. a ProcessPoolExecutor) when there are at least PARALLEL_MODELS_MIN of
+    them, else here. Returns a list of dicts with path, model (file name
+    without .sql), target_table (the alias, else the model), source_table
+    (the first ref, else the first source, else ""), table_type,
+    field_mappings, refs, sources and cached, names upper-cased as Snowflake
+    stores them. field_mappings and the lists are shared with the cache and
+    must not be modified.
+    """
+    keys = [script_digest(sql) for _, sql in models]
+    descriptions = {}
+    for key in keys:
+        if key not in descriptions:
+            description = dbt_model_cache.get(key)
+            if description is not None:
+                descriptions[key] = description
+    cached = set(descriptions)
+    missing = {}
+    for key, (_, sql) in zip(keys, models):
+        if key not in descriptions:
+            missing.setdefault(key, sql)
+    if missing:
+        if executor is not None and len(missing) >= PARALLEL_MODELS_MIN:
+            described = executor.map(describe_dbt_model, missing.values(), chunksize=max(1, len(missing) // 16))
+        else:
+            described = map(describe_dbt_model, missing.values())
+        for key, description in zip(missing, described):
+            descriptions[key] = description
+            dbt_model_cache.put(key, description)
+    results = []
+    for key, (path, _) in zip(keys, models):
+        description = descriptions[key]
+        model = os.path.splitext(os.path.basename(path))[0]
+        relations = description["refs"] or description["sources"]
+        results.append({
+            "path": path,
+            "model": model,
+            "target_table": (description["alias"] or model).upper(),
+            "source_table": relations[0].upper() if relations else "",
+            "table_type": description["table_type"],
+            "field_mappings": description["field_mappings"],
+            "refs": description["refs"],
+            "sources": description["sources"],
+            "cached": key in cached,
+        })
+    return results
+
+def replace_table_mappings(mappings, new_mappings):
+    """mappings with new_mappings added, replacing any earlier mappings of the same tables.
+
+    A table is its layer transition and target table, as the overview groups
+    them. Returns (mappings, sorted names of the tables that were replaced).
+    """
+    tables = {(mapping['layer_transition'], mapping['target_table']) for mapping in new_mappings}
+    kept = [mapping for mapping in mappings if (mapping['layer_transition'], mapping['target_table']) not in tables]
+    replaced = {mapping['target_table'] for mapping in mappings
+                if (mapping['layer_transition'], mapping['target_table']) in tables}
+    return kept + list(new_mappings), sorted(replaced)
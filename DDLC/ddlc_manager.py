@@ -1,10 +1,17 @@
+import multiprocessing
+import os
 import streamlit as st
-import pandas as pd
-import io
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import xlsxwriter
 from collections import defaultdict
-import re
+from ddlc_bulk import (PARALLEL_PARSE_MIN_CHARS, build_bulk_foundation_mappings, build_foundation_mappings,
+                       build_information_mappings,
+                       parse_ddl_files, read_ddl_upload, read_dbt_project, read_dbt_project_zip, replace_table_mappings,
+                       scan_dbt_models)
+from ddlc_parsing import cached_parse_dbt_script, cached_parse_ddl_tables, parse_ddl_script
+from ddlc_reports import generate_foundation_excel_report, generate_information_excel_report
+# pandas is imported where it is used: the mappings table is only needed on
+# some reruns, and ddlc_reports imports xlsxwriter only when a report is built
 
 # Page configuration
 st.set_page_config(
@@ -45,6 +52,8 @@ if 'mappings' not in st.session_state:
 if 'project_info' not in st.session_state:
     st.session_state.project_info = {}
 
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
 def main():
     st.markdown('<h1 class="main-header">🏗️ DDLC Manager</h1>', unsafe_allow_html=True)
     st.markdown('<div class="info-box">Data Definition Language Changes Manager for Medallion Architecture</div>', unsafe_allow_html=True)
@@ -133,46 +142,20 @@ def dl2_foundation_mapping_page():
         
         if submitted and target_table and ddl_script and source_table:
             try:
-                # Parse DDL script to extract columns
-                columns = parse_ddl_script(ddl_script)
+                # Parse DDL script to extract columns; a script parsed before comes from the shared cache
+                tables = cached_parse_ddl_tables(ddl_script)
+                columns = tables[0][1] if tables else parse_ddl_script(ddl_script)
+                if len(tables) > 1:
+                    st.warning(f"⚠️ The script defines {len(tables)} tables; only the first one ({tables[0][0]}) was mapped to {target_table}.")
                 
                 if columns:
-                    # Add mandatory Foundation audit columns
-                    foundation_audit_columns = [
-                        ("LOAD_TS", "TIMESTAMP_LTZ(9)"),
-                        ("LOAD_DT", "VARCHAR(10)"),
-                        ("ETL_CREA_NR", "NUMBER(19,0)")
-                    ]
-                    columns.extend(foundation_audit_columns)
-                    
-                    # Generate mappings for each column
-                    mappings_added = 0
-                    for column_name, data_type in columns:
-                        # Check if it's an audit column to set appropriate source mapping
-                        if column_name in ["LOAD_TS", "LOAD_DT", "ETL_CREA_NR"]:
-                            source_field_val = "N/A"  # Audit columns have no source field
-                            transformation_logic_val = "ETL-generated audit column"
-                        else:
-                            source_field_val = ""  # To be filled by user
-                            transformation_logic_val = "Straight Move"  # Default transformation logic
-                            
-                        mapping = {
-                            'layer_transition': 'DL2_to_Foundation',
-                            'source_database': source_database,
-                            'source_schema': source_schema,
-                            'source_table': source_table,
-                            'source_field': source_field_val,
-                            'target_database': target_database,
-                            'target_schema': target_schema,
-                            'target_table': target_table,
-                            'target_field': column_name,
-                            'target_data_type': data_type,
-                            'transformation_logic': transformation_logic_val,
-                            'change_type': 'New Field Added',
-                            'timestamp': datetime.now()
-                        }
-                        st.session_state.mappings.append(mapping)
-                        mappings_added += 1
+                    # Mandatory Foundation audit columns are added after the table's own columns
+                    mappings = build_foundation_mappings(columns, source_database, source_schema, source_table,
+                                                         target_database, target_schema, target_table)
+                    st.session_state.mappings, replaced = replace_table_mappings(st.session_state.mappings, mappings)
+                    mappings_added = len(mappings)
+                    if replaced:
+                        st.toast(f"♻️ {target_table} was already loaded; its mappings were replaced.")
                     
                     st.success(f"🎉 Successfully parsed DDL script and added {mappings_added} field mappings for {target_table}!")
                     st.info("📝 Note: Mandatory audit columns added automatically. Source field names and transformation logic for business columns are left empty for you to fill in later.")
@@ -182,10 +165,69 @@ def dl2_foundation_mapping_page():
             except Exception as e:
                 st.error(f"❌ Error parsing DDL script: {str(e)}")
     
+    bulk_foundation_import()
+    
     # Add overview of all tables at the bottom
     st.markdown('<h3 class="section-header">📊 All DL2 → Foundation Tables Overview</h3>', unsafe_allow_html=True)
     display_current_mappings("DL2_to_Foundation")
 
+@st.cache_resource
+def get_parse_executor():
+    """Worker processes for bulk DDL parsing, started on first use and shared by all sessions."""
+    # spawn: forking the multi-threaded Streamlit server is not safe
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def bulk_foundation_import():
+    """Map every table in an uploaded schema dump (.sql) or zip of DDL files in one submit."""
+    with st.expander("📦 Bulk import from a schema dump", expanded=False):
+        st.caption("Upload a .sql dump with any number of CREATE TABLE statements, or a zip of DDL files. "
+                   "Each table becomes a Foundation table with the mandatory audit columns; its source table "
+                   "name is the Foundation table name with the prefix below swapped.")
+        with st.form("dl2_foundation_bulk_form"):
+            upload = st.file_uploader("Schema dump", type=["sql", "zip"])
+            col1, col2 = st.columns(2)
+            with col1:
+                source_database = st.text_input("Source Database", value="PROD_DL2_CHIEF_FINANCIAL_OFFICE_RQ", key="bulk_source_database")
+                source_schema = st.text_input("Source Schema", value="ENTERPRISE", key="bulk_source_schema")
+                source_prefix = st.text_input("Source Table Prefix", value="", placeholder="e.g., EWJ_DW_", key="bulk_source_prefix")
+            with col2:
+                target_database = st.text_input("Foundation Database", value="PCFOPAYMENTSDBI", key="bulk_target_database")
+                target_schema = st.text_input("Foundation Schema", value="APP_CFOPYMT5", key="bulk_target_schema")
+                target_prefix = st.text_input("Foundation Table Prefix", value="", placeholder="e.g., APP_", key="bulk_target_prefix")
+            submitted = st.form_submit_button("🚀 Parse Dump and Generate Mappings")
+        
+        if submitted and upload is not None:
+            try:
+                files = read_ddl_upload(upload.name, upload.getvalue())
+                total = sum(len(text) for _, text in files)
+                executor = get_parse_executor() if total >= PARALLEL_PARSE_MIN_CHARS and PARSE_WORKERS > 1 else None
+                with st.spinner(f"Parsing {len(files)} file(s)..."):
+                    parsed = parse_ddl_files(files, executor, PARSE_WORKERS)
+                mappings, summary = build_bulk_foundation_mappings(parsed, source_database, source_schema, target_database,
+                                                                   target_schema, target_prefix, source_prefix)
+                if mappings:
+                    # One batch and one rerun for the whole dump; tables imported before are replaced
+                    st.session_state.mappings, replaced = replace_table_mappings(st.session_state.mappings, mappings)
+                    st.session_state.bulk_import_summary = {"files": len(files), "mappings": len(mappings),
+                                                            "replaced": replaced, **summary}
+                    st.rerun()
+                else:
+                    st.error("❌ Could not find any CREATE TABLE with columns in the upload. Please check the files.")
+            except Exception as e:
+                st.error(f"❌ Error importing schema dump: {str(e)}")
+        
+        summary = st.session_state.get('bulk_import_summary')
+        if summary:
+            st.success(f"🎉 Imported {len(summary['tables'])} tables from {summary['files']} file(s): {summary['mappings']} field mappings, audit columns included.")
+            if summary['replaced']:
+                st.info(f"♻️ Already loaded, mappings replaced: {', '.join(summary['replaced'])}")
+            if summary['redefined']:
+                st.warning(f"⚠️ Defined more than once (the last definition was used): {', '.join(sorted(set(summary['redefined'])))}")
+            if summary['empty']:
+                st.warning(f"⚠️ Skipped tables without a column list: {', '.join(summary['empty'])}")
+            st.dataframe([{"Foundation table": table, "Source table": source, "Columns": count, "File": file_name}
+                          for table, source, count, file_name in summary['tables']], use_container_width=True)
+
 def foundation_information_mapping_page():
     st.markdown('<h2 class="section-header">🔄 Foundation → Information Layer Mapping</h2>', unsafe_allow_html=True)
     st.info("Note: Only Foundation → Information Final mappings are supported in DDLC")
@@ -234,51 +276,21 @@ def foundation_information_mapping_page():
         
         if submitted and target_table and dbt_script and source_table:
             try:
-                # Parse DBT script to extract field mappings
-                field_mappings = parse_dbt_script(dbt_script)
+                # Parse DBT script to extract field mappings; a script parsed before comes from the shared cache
+                field_mappings = cached_parse_dbt_script(dbt_script)
                 
-                # Add mandatory Information audit columns based on type
-                if table_type == "TYPE 1":
-                    info_audit_columns = get_type1_audit_columns()
-                else:
-                    info_audit_columns = get_type2_audit_columns()
-                
-                # Add audit columns to field mappings
-                for source_field, target_field, transformation in info_audit_columns:
-                    field_mappings.append((source_field, target_field, transformation))
+                # Mandatory Information audit columns are added after the parsed fields
+                mappings = build_information_mappings(field_mappings, table_type, source_database, source_schema, source_table,
+                                                      target_database, target_schema, target_table)
                 
-                if field_mappings:
-                    # Generate mappings for each field
-                    mappings_added = 0
-                    for source_field, target_field, transformation in field_mappings:
-                        # Handle UNKNOWN fields - keep same source table, only field and transformation are unknown
-                        if source_field == "UNKNOWN":
-                            source_field_val = "UNKNOWN"  # Mark field as unknown
-                            transformation_val = "UNKNOWN - Manual input required"  # Mark transformation as unknown
-                        else:
-                            source_field_val = source_field
-                            transformation_val = transformation
-                            
-                        mapping = {
-                            'layer_transition': 'Foundation_to_Information',
-                            'source_database': source_database,
-                            'source_schema': source_schema,
-                            'source_table': source_table,  # Always use the same source table
-                            'source_field': source_field_val,
-                            'target_database': target_database,
-                            'target_schema': target_schema,
-                            'target_table': target_table,
-                            'target_field': target_field,
-                            'target_data_type': f"{table_type}",
-                            'transformation_logic': transformation_val,
-                            'change_type': 'New Field Added',
-                            'timestamp': datetime.now()
-                        }
-                        st.session_state.mappings.append(mapping)
-                        mappings_added += 1
+                if mappings:
+                    st.session_state.mappings, replaced = replace_table_mappings(st.session_state.mappings, mappings)
+                    mappings_added = len(mappings)
+                    if replaced:
+                        st.toast(f"♻️ {target_table} was already loaded; its mappings were replaced.")
                     
-                    audit_count = len(info_audit_columns)
-                    business_count = mappings_added - audit_count
+                    business_count = len(field_mappings)
+                    audit_count = mappings_added - business_count
                     st.success(f"🎉 Successfully parsed DBT script and added {mappings_added} field mappings for {target_table}!")
                     st.info(f"📝 Breakdown: {business_count} business fields + {audit_count} mandatory {table_type} audit columns")
                     st.rerun()
@@ -287,16 +299,88 @@ def foundation_information_mapping_page():
             except Exception as e:
                 st.error(f"❌ Error parsing DBT script: {str(e)}")
     
+    dbt_project_scan()
+    
     # Add overview of all tables at the bottom
     st.markdown('<h3 class="section-header">📊 All Foundation → Information Tables Overview</h3>', unsafe_allow_html=True)
     display_current_mappings("Foundation_to_Information")
 
+def dbt_project_scan():
+    """Map every model of a dbt project (local directory or zip) to an Information table in one submit."""
+    with st.expander("📦 Scan a dbt project", expanded=False):
+        st.caption("Reads models/**/*.sql. Each model maps to the Information table named by its alias or file name, "
+                   "from the table of its first ref() (or source()); a config block with scd_type=2, "
+                   "table_type='TYPE 2', a type2/scd2 tag or materialized='snapshot' makes it TYPE 2. "
+                   "Models already parsed are reused from a cache, so re-scans only parse changed models, "
+                   "and re-scanned tables replace their earlier mappings.")
+        with st.form("dbt_project_scan_form"):
+            project_dir = st.text_input("dbt project directory", placeholder="e.g., /home/me/dbt/cfo_payments")
+            project_zip = st.file_uploader("...or a zipped dbt project", type=["zip"])
+            model_filter = st.text_input("Only models under", value="", placeholder="e.g., information/",
+                                         help="Path prefix below models/; leave empty for every model")
+            col1, col2 = st.columns(2)
+            with col1:
+                source_database = st.text_input("Source Database", value="PCFOPAYMENTSDBI", key="scan_source_database")
+                source_schema = st.text_input("Source Schema", value="APP_CFOPYMT5", key="scan_source_schema")
+            with col2:
+                target_database = st.text_input("Information Database", value="PCFOINFOMDBI", key="scan_target_database")
+                target_schema = st.text_input("Information Schema", value="APP_CFOPYMT5", key="scan_target_schema")
+            submitted = st.form_submit_button("🚀 Scan Project and Generate Mappings")
+        
+        if submitted and (project_dir or project_zip is not None):
+            try:
+                if project_zip is not None:
+                    models = read_dbt_project_zip(project_zip.getvalue())
+                else:
+                    models = read_dbt_project(project_dir)
+                models = [(path, sql) for path, sql in models if path.startswith(model_filter.strip().lstrip("/"))]
+                if not models:
+                    st.error("❌ No models/**/*.sql files found. Please check the project directory or zip.")
+                    return
+                with st.spinner(f"Parsing {len(models)} model(s)..."):
+                    scanned = scan_dbt_models(models, get_parse_executor() if PARSE_WORKERS > 1 else None)
+                # Models without aliased columns (e.g. select * staging models) have nothing to map
+                skipped = [model["path"] for model in scanned if not model["field_mappings"]]
+                scanned = [model for model in scanned if model["field_mappings"]]
+                timestamp = datetime.now()
+                mappings = []
+                for model in scanned:
+                    mappings.extend(build_information_mappings(
+                        model["field_mappings"], model["table_type"], source_database, source_schema, model["source_table"],
+                        target_database, target_schema, model["target_table"], timestamp))
+                # Re-scanned tables replace their earlier mappings; one batch and one rerun for the whole project
+                st.session_state.mappings, _ = replace_table_mappings(st.session_state.mappings, mappings)
+                st.session_state.dbt_scan_summary = {
+                    "mappings": len(mappings),
+                    "skipped": skipped,
+                    "models": [{"Model": model["path"], "Information table": model["target_table"],
+                                "Source table": model["source_table"], "Type": model["table_type"],
+                                "Fields": len(model["field_mappings"]), "Cached": model["cached"]} for model in scanned],
+                }
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error scanning dbt project: {str(e)}")
+        
+        summary = st.session_state.get('dbt_scan_summary')
+        if summary:
+            models = summary['models']
+            reparsed = sum(1 for model in models if not model["Cached"])
+            st.success(f"🎉 Scanned {len(models)} models ({reparsed} parsed, {len(models) - reparsed} unchanged): {summary['mappings']} field mappings, audit columns included.")
+            missing_source = [model["Model"] for model in models if not model["Source table"]]
+            if missing_source:
+                st.warning(f"⚠️ No ref() or source() found, source table left empty: {', '.join(missing_source)}")
+            if summary['skipped']:
+                st.warning(f"⚠️ Skipped models without `... AS column` fields: {', '.join(summary['skipped'])}")
+            st.dataframe(models, use_container_width=True)
+
 def display_current_mappings(layer_type):
     st.markdown(f'<h3 class="section-header">📊 All {layer_type.replace("_", " → ")} Tables Overview</h3>', unsafe_allow_html=True)
     
     filtered_mappings = [m for m in st.session_state.mappings if m['layer_transition'] == layer_type]
     
     if filtered_mappings:
+        import pandas as pd
+
         # Group by target table
         tables = defaultdict(list)
         for mapping in filtered_mappings:
@@ -348,233 +432,6 @@ def display_current_mappings(layer_type):
     else:
         st.info("No mappings added yet.")
 
-def parse_ddl_script(ddl_script):
-    """Parse DDL script to extract column names and data types."""
-    columns = []
-    
-    # Clean the script and extract the part between parentheses
-    ddl_script = ddl_script.strip()
-    
-    # Find the table definition part (between parentheses)
-    start_paren = ddl_script.find('(')
-    end_paren = ddl_script.rfind(')')
-    
-    if start_paren == -1 or end_paren == -1:
-        return columns
-    
-    table_def = ddl_script[start_paren+1:end_paren]
-    
-    # Split by lines and process each line
-    lines = table_def.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('--') or line.startswith('/*'):
-            continue
-            
-        # Remove trailing comma and clean up
-        line = line.rstrip(',').strip()
-        
-        # Skip constraint definitions
-        if any(keyword in line.upper() for keyword in ['PRIMARY KEY', 'FOREIGN KEY', 'CONSTRAINT', 'INDEX', 'KEY']):
-            continue
-            
-        # Match column definition pattern: COLUMN_NAME DATA_TYPE(size)
-        # Handle various patterns like VARCHAR(16777216), NUMBER(38,0), etc.
-        match = re.match(r'^([A-Za-z_][A-Za-z0-9_]*)\s+([A-Za-z]+(?:\([^)]+\))?)', line)
-        
-        if match:
-            column_name = match.group(1)
-            data_type = match.group(2)
-            columns.append((column_name, data_type))
-    
-    return columns
-
-def parse_dbt_script(dbt_script):
-    """Parse DBT script to extract field mappings and transformations with detailed logic."""
-    field_mappings = []
-    
-    # Split by lines and process each line
-    lines = dbt_script.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('--') or line.startswith('/*'):
-            continue
-            
-        # Remove trailing comma
-        line = line.rstrip(',').strip()
-        
-        # Pattern 1: {{ handle_empty_or_null_value(...) }} AS target_field
-        dbt_function_match = re.search(r'\{\{\s*handle_empty_or_null_value\(([^}]+)\)\s*\}\}\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
-        
-        if dbt_function_match:
-            function_params = dbt_function_match.group(1).strip()
-            target_field = dbt_function_match.group(2).strip()
-            
-            # Parse the function parameters
-            source_field, transformation_description = parse_handle_empty_or_null_value(function_params)
-            
-            field_mappings.append((source_field, target_field, transformation_description))
-            continue
-        
-        # Pattern 2: Other {{ function(...) }} AS target_field (NON handle_empty_or_null_value)
-        other_dbt_function_match = re.search(r'\{\{\s*([^}]+)\s*\}\}\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
-        
-        if other_dbt_function_match:
-            transformation = other_dbt_function_match.group(1).strip()
-            target_field = other_dbt_function_match.group(2).strip()
-            
-            # Mark as UNKNOWN since it's not handle_empty_or_null_value
-            field_mappings.append(("UNKNOWN", target_field, "UNKNOWN - Manual input required"))
-            continue
-        
-        # Pattern 3: source_field AS target_field
-        simple_alias_match = re.search(r'^([A-Za-z_][A-Za-z0-9_]*)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
-        
-        if simple_alias_match:
-            source_field = simple_alias_match.group(1).strip()
-            target_field = simple_alias_match.group(2).strip()
-            field_mappings.append((source_field, target_field, "Direct mapping"))
-            continue
-        
-        # Pattern 4: CASE statements, functions, etc.
-        case_match = re.search(r'(CASE\s+.+?END)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE | re.DOTALL)
-        
-        if case_match:
-            transformation = case_match.group(1).strip()
-            target_field = case_match.group(2).strip()
-            # Mark as UNKNOWN for complex transformations
-            field_mappings.append(("UNKNOWN", target_field, "UNKNOWN - Manual input required"))
-            continue
-        
-        # Pattern 5: Any other pattern with AS (catch-all)
-        general_as_match = re.search(r'^(.+?)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
-        
-        if general_as_match:
-            source_expression = general_as_match.group(1).strip()
-            target_field = general_as_match.group(2).strip()
-            # Mark as UNKNOWN for any other pattern
-            field_mappings.append(("UNKNOWN", target_field, "UNKNOWN - Manual input required"))
-    
-    return field_mappings
-
-def parse_handle_empty_or_null_value(params_str):
-    """Parse handle_empty_or_null_value function parameters and generate transformation description."""
-    
-    # Extract parameters using regex
-    chk_type_match = re.search(r"chk_type=['\"]([^'\"]+)['\"]", params_str)
-    first_val_match = re.search(r"first_val=['\"]([^'\"]+)['\"]", params_str)
-    length_match = re.search(r"length=(\d+)", params_str)
-    precision_match = re.search(r"precision=(\d+)", params_str)
-    default_val_match = re.search(r"default_val=['\"]([^'\"]+)['\"]", params_str)
-    empty_val_match = re.search(r"empty_val=['\"]([^'\"]*)['\"]", params_str)
-    format_match = re.search(r"format=['\"]([^'\"]+)['\"]", params_str)
-    is_string_match = re.search(r"is_string=(\w+)", params_str)
-    
-    # Extract values
-    chk_type = chk_type_match.group(1) if chk_type_match else ""
-    source_field = first_val_match.group(1) if first_val_match else ""
-    length = int(length_match.group(1)) if length_match else 0
-    precision = int(precision_match.group(1)) if precision_match else 0
-    default_val = default_val_match.group(1) if default_val_match else ""
-    empty_val = empty_val_match.group(1) if empty_val_match else ""
-    format_val = format_match.group(1) if format_match else ""
-    is_string = is_string_match.group(1).lower() == 'true' if is_string_match else False
-    
-    # Generate transformation description based on data type and parameters
-    transformation_parts = []
-    
-    if chk_type.upper() == 'VARCHAR':
-        transformation_parts.append(f"Transform {source_field} to VARCHAR({length})")
-        transformation_parts.append("Replace NULL values with '!'")
-    
-    elif chk_type.upper() == 'NUMBER':
-        if precision == 0:
-            transformation_parts.append(f"Transform {source_field} to NUMBER({length},{precision})")
-            transformation_parts.append("Replace NULL values with '-1'")
-        else:
-            transformation_parts.append(f"Transform {source_field} to NUMBER({length},{precision})")
-            transformation_parts.append("NULL values remain NULL (precision > 0)")
-    
-    elif chk_type.upper() == 'TIMESTAMP':
-        transformation_parts.append(f"Transform {source_field} to TIMESTAMP")
-        if default_val:
-            transformation_parts.append(f"Set default value to '{default_val}' if empty")
-        if format_val:
-            transformation_parts.append(f"Format: {format_val}")
-    
-    elif chk_type.upper() == 'DATE':
-        transformation_parts.append(f"Transform {source_field} to DATE")
-        if default_val:
-            transformation_parts.append(f"Set default value to '{default_val}' if empty")
-        if format_val:
-            transformation_parts.append(f"Format: {format_val}")
-        if empty_val:
-            transformation_parts.append(f"Empty value representation: '{empty_val}'")
-    
-    else:
-        # Generic handling for other types
-        transformation_parts.append(f"Transform {source_field} to {chk_type}")
-        if default_val:
-            transformation_parts.append(f"Default value: '{default_val}'")
-    
-    # Add string conversion note if applicable
-    if is_string:
-        transformation_parts.append("Convert to string representation")
-    
-    transformation_description = "; ".join(transformation_parts)
-    
-    return source_field, transformation_description
-
-def get_type1_audit_columns():
-    """Return TYPE 1 Information layer mandatory audit columns."""
-    return [
-        ("N/A", "CREA_PRTY_ID", "ETL-generated: Creation party ID"),
-        ("N/A", "CREA_TS", "ETL-generated: Creation timestamp"),
-        ("N/A", "UPDT_PRTY_ID", "ETL-generated: Update party ID"),
-        ("N/A", "UPDT_TS", "ETL-generated: Update timestamp"),
-        ("N/A", "ETL_CREA_TS", "ETL-generated: ETL creation timestamp"),
-        ("ETL_CREA_NR", "ETL_CREA_NR", "Maps to ETL_CREA_NR from Foundation layer"),
-        ("N/A", "ETL_UPDT_TS", "ETL-generated: ETL update timestamp"),
-        ("N/A", "ETL_UPDT_NR", "ETL-generated: ETL update number"),
-        ("LOAD_TS", "FNDN_LOAD_TS", "Maps to LOAD_TS from Foundation layer")
-    ]
-
-def get_type2_audit_columns():
-    """Return TYPE 2 Information layer mandatory audit columns."""
-    return [
-        ("N/A", "CURR_REC_IND", "ETL-generated: Current record indicator for SCD Type 2"),
-        ("N/A", "SRC_SYS_REC_EFF_TS", "ETL-generated: Source system record effective timestamp"),
-        ("N/A", "SRC_SYS_REC_EXP_TS", "ETL-generated: Source system record expiration timestamp"),
-        ("N/A", "CREA_PRTY_ID", "ETL-generated: Creation party ID"),
-        ("N/A", "CREA_TS", "ETL-generated: Creation timestamp"),
-        ("N/A", "UPDT_PRTY_ID", "ETL-generated: Update party ID"),
-        ("N/A", "UPDT_TS", "ETL-generated: Update timestamp"),
-        ("N/A", "ETL_CREA_TS", "ETL-generated: ETL creation timestamp"),
-        ("ETL_CREA_NR", "ETL_CREA_NR", "Maps to ETL_CREA_NR from Foundation layer"),
-        ("N/A", "ETL_UPDT_TS", "ETL-generated: ETL update timestamp"),
-        ("N/A", "ETL_UPDT_NR", "ETL-generated: ETL update number"),
-        ("LOAD_TS", "FNDN_LOAD_TS", "Maps to LOAD_TS from Foundation layer")
-    ]
-
-def extract_source_field_from_transformation(transformation):
-    """Extract source field name from transformation logic."""
-    # Look for field names in quotes or as parameters
-    
-    # Pattern 1: first_val='FIELD_NAME'
-    first_val_match = re.search(r"first_val=['\"]([^'\"]+)['\"]", transformation)
-    if first_val_match:
-        return first_val_match.group(1)
-    
-    # Pattern 2: Look for field names (assume uppercase with underscores)
-    field_match = re.search(r'\b([A-Z][A-Z0-9_]*)\b', transformation)
-    if field_match:
-        return field_match.group(1)
-    
-    # If no source field found, return empty string
-    return ""
-
 def generate_reports_page():
     st.markdown('<h2 class="section-header">📊 Generate Reports</h2>', unsafe_allow_html=True)
     
@@ -646,181 +503,5 @@ def generate_reports_page():
     col3.metric("Foundation Tables", len(foundation_tables))
     col4.metric("Information Tables", len(information_tables))
 
-def generate_foundation_excel_report(mappings):
-    output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-    
-    # Define formats
-    header_format = workbook.add_format({
-        'bold': True,
-        'fg_color': '#4472C4',
-        'font_color': 'white',
-        'align': 'center',
-        'valign': 'vcenter',
-        'border': 1
-    })
-    
-    source_format = workbook.add_format({
-        'fg_color': '#D5E4BC',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    transform_format = workbook.add_format({
-        'fg_color': '#9BC2E6',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    target_format = workbook.add_format({
-        'fg_color': '#D1C4E9',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    # Group mappings by target table
-    tables = defaultdict(list)
-    for mapping in mappings:
-        tables[mapping['target_table']].append(mapping)
-    
-    # Create a worksheet for each table
-    for table_name, table_mappings in tables.items():
-        # Clean table name for sheet name (Excel has restrictions)
-        sheet_name = table_name[:31]  # Excel sheet names max 31 chars
-        worksheet = workbook.add_worksheet(sheet_name)
-        
-        # Headers
-        headers = ['Database', 'Schema', 'Table Name', 'Field Name', 'Transformation Logic', 
-                  'Database', 'Schema', 'Table Name', 'Column Name']
-        
-        # Add table info at the top
-        worksheet.merge_range('A1:I1', f'Foundation Layer - {table_name}', header_format)
-        worksheet.write('A2', f'Total Fields: {len(table_mappings)}', header_format)
-        
-        # Write section headers
-        worksheet.merge_range('A3:D3', 'SOURCE (DL2)', header_format)
-        worksheet.merge_range('E3:E3', 'TRANSFORMATION', header_format) 
-        worksheet.merge_range('F3:I3', 'TARGET (Foundation)', header_format)
-        
-        # Write column headers
-        for col, header in enumerate(headers):
-            worksheet.write(3, col, header, header_format)
-        
-        # Write data
-        for row, mapping in enumerate(table_mappings, start=4):
-            # Source columns (DL2)
-            worksheet.write(row, 0, mapping.get('source_database', ''), source_format)
-            worksheet.write(row, 1, mapping.get('source_schema', ''), source_format)
-            worksheet.write(row, 2, mapping.get('source_table', ''), source_format)
-            worksheet.write(row, 3, mapping.get('source_field', ''), source_format)
-            
-            # Transformation
-            worksheet.write(row, 4, mapping.get('transformation_logic', ''), transform_format)
-            
-            # Target columns (Foundation)
-            worksheet.write(row, 5, mapping.get('target_database', ''), target_format)
-            worksheet.write(row, 6, mapping.get('target_schema', ''), target_format)
-            worksheet.write(row, 7, mapping.get('target_table', ''), target_format)
-            worksheet.write(row, 8, mapping.get('target_field', ''), target_format)
-        
-        # Adjust column widths
-        for col in range(9):
-            worksheet.set_column(col, col, 20)
-    
-    workbook.close()
-    output.seek(0)
-    return output.getvalue()
-
-def generate_information_excel_report(mappings):
-    output = io.BytesIO()
-    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-    
-    # Define formats
-    header_format = workbook.add_format({
-        'bold': True,
-        'fg_color': '#4472C4',
-        'font_color': 'white',
-        'align': 'center',
-        'valign': 'vcenter',
-        'border': 1
-    })
-    
-    source_format = workbook.add_format({
-        'fg_color': '#D5E4BC',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    transform_format = workbook.add_format({
-        'fg_color': '#9BC2E6',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    target_format = workbook.add_format({
-        'fg_color': '#D1C4E9',
-        'border': 1,
-        'align': 'left',
-        'valign': 'vcenter'
-    })
-    
-    # Group mappings by target table
-    tables = defaultdict(list)
-    for mapping in mappings:
-        tables[mapping['target_table']].append(mapping)
-    
-    # Create a worksheet for each table
-    for table_name, table_mappings in tables.items():
-        # Clean table name for sheet name (Excel has restrictions)
-        sheet_name = table_name[:31]  # Excel sheet names max 31 chars
-        worksheet = workbook.add_worksheet(sheet_name)
-        
-        # Headers
-        headers = ['Database', 'Schema', 'Table Name', 'Field Name', 'Transformation Logic', 
-                  'Database', 'Schema', 'Table Name', 'Column Name']
-        
-        # Add table info at the top
-        worksheet.merge_range('A1:I1', f'Information Layer - {table_name}', header_format)
-        worksheet.write('A2', f'Total Fields: {len(table_mappings)}', header_format)
-        
-        # Write section headers
-        worksheet.merge_range('A3:D3', 'SOURCE (Foundation)', header_format)
-        worksheet.merge_range('E3:E3', 'TRANSFORMATION', header_format) 
-        worksheet.merge_range('F3:I3', 'TARGET (Information)', header_format)
-        
-        # Write column headers
-        for col, header in enumerate(headers):
-            worksheet.write(3, col, header, header_format)
-        
-        # Write data
-        for row, mapping in enumerate(table_mappings, start=4):
-            # Source columns (Foundation)
-            worksheet.write(row, 0, mapping.get('source_database', ''), source_format)
-            worksheet.write(row, 1, mapping.get('source_schema', ''), source_format)
-            worksheet.write(row, 2, mapping.get('source_table', ''), source_format)
-            worksheet.write(row, 3, mapping.get('source_field', ''), source_format)
-            
-            # Transformation
-            worksheet.write(row, 4, mapping.get('transformation_logic', ''), transform_format)
-            
-            # Target columns (Information)
-            worksheet.write(row, 5, mapping.get('target_database', ''), target_format)
-            worksheet.write(row, 6, mapping.get('target_schema', ''), target_format)
-            worksheet.write(row, 7, mapping.get('target_table', ''), target_format)
-            worksheet.write(row, 8, mapping.get('target_field', ''), target_format)
-        
-        # Adjust column widths
-        for col in range(9):
-            worksheet.set_column(col, col, 20)
-    
-    workbook.close()
-    output.seek(0)
-    return output.getvalue()
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
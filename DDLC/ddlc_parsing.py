@@ -0,0 +1,477 @@
+"""Parsers for the DDL and DBT scripts pasted into the DDLC Manager; no Streamlit dependency."""
+import hashlib
+import re
+import threading
+
+# One token per match, after any whitespace, SQL comments and Jinja {# #} comments
+# and {% %} tags. A {{ }} expression is a single token. Every alternative either
+# matches or falls through to \S, and unterminated quotes and comments run to the
+# end of the script, so findall() never backtracks and the scan stays linear.
+_SQL_TOKEN = re.compile(r"""
+    (?:\s+|--[^\n]*|//[^\n]*|/\*.*?(?:\*/|\Z)|\{\#.*?(?:\#\}|\Z)|\{%.*?(?:%\}|\Z))*
+    (
+        \{\{.*?(?:\}\}|\Z)
+      | [A-Za-z_][A-Za-z0-9_$]*
+      | "[^"]*(?:""[^"]*)*"?
+      | `[^`]*`?
+      | '[^']*(?:''[^']*)*'?
+      | \d+(?:\.\d*)?
+      | ::
+      | \S
+      | \Z
+    )""", re.VERBOSE | re.DOTALL)
+
+# Words allowed between CREATE and TABLE, e.g. CREATE OR REPLACE TRANSIENT TABLE
+_CREATE_TABLE_MODIFIERS = {"OR", "REPLACE", "TEMP", "TEMPORARY", "TRANSIENT", "VOLATILE", "LOCAL",
+                           "GLOBAL", "EXTERNAL", "HYBRID", "DYNAMIC", "ICEBERG", "UNLOGGED", "MULTISET", "SET"}
+
+# First words of table constraints and indexes in a column list
+_DDL_CONSTRAINT_WORDS = {"CONSTRAINT", "PRIMARY", "FOREIGN", "UNIQUE", "CHECK", "INDEX", "KEY",
+                         "FULLTEXT", "SPATIAL", "EXCLUDE", "LIKE", "PERIOD"}
+
+# Words that continue a data type, e.g. DOUBLE PRECISION or CHARACTER VARYING(10)
+_DDL_TYPE_WORDS = {"PRECISION", "VARYING", "UNSIGNED", "SIGNED", "ZEROFILL"}
+
+def _sql_tokens(script):
+    """The script's tokens, without the empty match at its end."""
+    tokens = _SQL_TOKEN.findall(script)
+    if tokens and not tokens[-1]:
+        tokens.pop()
+    return tokens
+
+def _is_identifier(token):
+    return token[:1].isalpha() or token[:1] in ('_', '"', '`')
+
+def _identifier_name(token):
+    """Identifier text without its quotes."""
+    if token[:1] == '"':
+        return token[1:-1].replace('""', '"') if len(token) > 1 and token.endswith('"') else token[1:]
+    if token[:1] == '`':
+        return token.strip('`')
+    return token
+
+def _join_tokens(tokens):
+    """Tokens as SQL text, with a space only between adjacent words and numbers."""
+    if len(tokens) == 1:
+        return tokens[0]
+    parts = []
+    previous_word = False
+    for token in tokens:
+        word = token[:1].isalnum() or token[:1] == '_'
+        if word and previous_word:
+            parts.append(' ')
+        parts.append(token)
+        previous_word = word
+    return ''.join(parts)
+
+def _parenthesised(tokens, i):
+    """Index after the parenthesised group starting at tokens[i] == '('."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        token = tokens[j]
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        elif token == ';':
+            return j
+    return len(tokens)
+
+def _ddl_data_type(tokens, i):
+    """The data type starting at tokens[i], e.g. NUMBER(38,0), and the index after it."""
+    if i >= len(tokens) or not tokens[i][:1].isalpha():
+        return '', i
+    type_parts = [tokens[i]]
+    i += 1
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        if token == '(':
+            if i + 2 < n and tokens[i + 2] == ')':
+                # The usual single argument, e.g. VARCHAR(16777216)
+                end = i + 3
+            else:
+                end = _parenthesised(tokens, i)
+            type_parts[-1] += '(' + _join_tokens(tokens[i + 1:end - 1]) + ')'
+            i = end
+            continue
+        if not token[:1].isalpha():
+            break
+        word = token.upper()
+        if word in _DDL_TYPE_WORDS:
+            type_parts.append(token)
+            i += 1
+        elif word in ('WITH', 'WITHOUT') and i + 1 < n and tokens[i + 1].upper() in ('TIME', 'LOCAL'):
+            # TIMESTAMP WITH [LOCAL] TIME ZONE
+            end = i + 1
+            while end < n and tokens[end].upper() in ('LOCAL', 'TIME', 'ZONE'):
+                end += 1
+            type_parts.extend(tokens[i:end])
+            i = end
+        else:
+            break
+    return ' '.join(type_parts), i
+
+def _ddl_column_list(tokens, i):
+    """Columns of the list that starts after the '(' before tokens[i], and the index after it.
+
+    Each entry's name and data type are read where the entry starts; the rest
+    of it (defaults, comments, collations, ...) is skipped up to its comma.
+    """
+    columns = []
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        if token == ')':
+            return columns, i + 1
+        if token == ';':
+            # An unclosed column list ends with its statement
+            return columns, i
+        if _is_identifier(token) and not (token[:1] not in ('"', '`') and token.upper() in _DDL_CONSTRAINT_WORDS):
+            data_type, i = _ddl_data_type(tokens, i + 1)
+            columns.append((_identifier_name(token), data_type))
+        depth = 0
+        while i < n:
+            token = tokens[i]
+            if token == '(':
+                depth += 1
+            elif token == ')':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif token == ';' or (token == ',' and depth == 0):
+                break
+            i += 1
+        if i < n and tokens[i] == ',':
+            i += 1
+    return columns, i
+
+def parse_ddl_tables(ddl_script):
+    """Parse every CREATE TABLE statement in a DDL script.
+
+    Returns a list of (table name, columns) in script order, where the table
+    name is as written (e.g. DB.SCHEMA.TABLE, without identifier quotes) and
+    columns is a list of (column name, data type). Comments, quoted
+    identifiers, string literals and nested parentheses are skipped over in a
+    single pass; constraints and indexes in the column list are left out.
+    Statements other than CREATE TABLE, and CREATE TABLE ... AS SELECT/LIKE/
+    CLONE without a column list, are ignored.
+    """
+    tokens = _sql_tokens(ddl_script)
+    tables = []
+    n = len(tokens)
+    i = 0
+    while i < n:
+        token = tokens[i]
+        i += 1
+        if token.upper() != 'CREATE':
+            continue
+        while i < n and tokens[i].upper() in _CREATE_TABLE_MODIFIERS:
+            i += 1
+        if i >= n or tokens[i].upper() != 'TABLE':
+            continue
+        i += 1
+        if [token.upper() for token in tokens[i:i + 3]] == ['IF', 'NOT', 'EXISTS']:
+            i += 3
+        name_parts = []
+        while i < n and _is_identifier(tokens[i]):
+            name_parts.append(_identifier_name(tokens[i]))
+            i += 1
+            if i < n and tokens[i] == '.':
+                i += 1
+            else:
+                break
+        if not name_parts or i >= n or tokens[i] != '(':
+            continue
+        columns, i = _ddl_column_list(tokens, i + 1)
+        tables.append(('.'.join(name_parts), columns))
+    return tables
+
+def parse_ddl_script(ddl_script):
+    """Parse DDL script to extract column names and data types.
+
+    Returns the (column name, data type) pairs of the first CREATE TABLE in the
+    script (see parse_ddl_tables); a bare column list in parentheses is parsed
+    too.
+    """
+    tables = parse_ddl_tables(ddl_script)
+    if tables:
+        return tables[0][1]
+    tokens = _sql_tokens(ddl_script)
+    if '(' not in tokens:
+        return []
+    return _ddl_column_list(tokens, tokens.index('(') + 1)[0]
+
+# Words that end a select list when they appear at its own nesting level
+_SELECT_LIST_END = {"FROM", "WHERE", "GROUP", "HAVING", "QUALIFY", "WINDOW", "ORDER", "LIMIT",
+                    "UNION", "INTERSECT", "EXCEPT", "MINUS", "INTO", ";"}
+
+# Single words that are values rather than source columns
+_SQL_VALUE_WORDS = {"NULL", "TRUE", "FALSE", "CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP",
+                    "SYSDATE", "CURRENT_USER", "LOCALTIMESTAMP"}
+
+_HANDLE_EMPTY_OR_NULL_VALUE = re.compile(r"\{\{\s*handle_empty_or_null_value\s*\((.*)\)\s*\}\}", re.IGNORECASE | re.DOTALL)
+
+# name=value keyword arguments of a macro call; quoted values keep their quotes here
+_MACRO_KWARG = re.compile(r"""(\w+)\s*=\s*('[^']*'|"[^"]*"|[^,)\s]+)""")
+
+UNKNOWN_TRANSFORMATION = "UNKNOWN - Manual input required"
+
+def _select_items(tokens):
+    """(tokens, alias position) for the items of every select list, split at top-level commas.
+
+    Parentheses, CASE ... END and {{ }} (a single token) nest, so commas and
+    keywords inside them never split an item. A select list runs from SELECT
+    to a keyword such as FROM at its own level, or to the parenthesis that
+    closes its CTE or subquery; a SELECT inside a select item (a scalar
+    subquery) is just part of that item. A script without SELECT is read as
+    select lists separated by ";". The alias position is that of the item's last AS outside
+    any nesting, or None.
+    """
+    items = []
+    bare = not any(token.upper() == 'SELECT' for token in tokens)
+    # Nesting depth of the open select list, or None between select lists
+    list_depth = 0 if bare else None
+    item = []
+    alias_at = None
+    depth = 0
+    for token in tokens:
+        word = token.upper() if token[:1].isalpha() else token
+        if list_depth is None:
+            if word == 'SELECT':
+                list_depth = depth
+                item = []
+                alias_at = None
+            elif word == '(' or word == 'CASE':
+                depth += 1
+            elif word == ')' or word == 'END':
+                depth -= 1
+            continue
+        if depth == list_depth:
+            if word == ',':
+                items.append((item, alias_at))
+                item = []
+                alias_at = None
+                continue
+            if word in _SELECT_LIST_END:
+                items.append((item, alias_at))
+                item = []
+                alias_at = None
+                # Without SELECT keywords, the next statement is another bare select list
+                list_depth = depth if bare and word == ';' else None
+                continue
+            if word == 'AS':
+                alias_at = len(item)
+        if word == '(' or word == 'CASE':
+            depth += 1
+        elif word == ')' or word == 'END':
+            depth -= 1
+            if depth < list_depth:
+                items.append((item, alias_at))
+                list_depth = None
+                continue
+        item.append(token)
+    if list_depth is not None:
+        items.append((item, alias_at))
+    return items
+
+def _dbt_field_mapping(item, alias_at):
+    """(source field, target field, transformation) for a select item with an AS alias, else None.
+
+    The alias is the identifier after alias_at, the item's last top-level AS;
+    anything after it (a stray word) is ignored.
+    """
+    if not alias_at or alias_at + 1 == len(item) or not _is_identifier(item[alias_at + 1]):
+        return None
+    target_field = _identifier_name(item[alias_at + 1])
+    expression = item[:alias_at]
+    while expression and expression[0].upper() in ('DISTINCT', 'ALL'):
+        expression = expression[1:]
+    if len(expression) == 1 and expression[0].startswith('{{'):
+        macro = _HANDLE_EMPTY_OR_NULL_VALUE.fullmatch(expression[0])
+        if macro:
+            source_field, transformation_description = parse_handle_empty_or_null_value(macro.group(1))
+            return (source_field, target_field, transformation_description)
+        return ("UNKNOWN", target_field, UNKNOWN_TRANSFORMATION)
+    # A column, optionally qualified as in SRC.COLUMN
+    if (len(expression) % 2 == 1 and all(token == '.' for token in expression[1::2])
+            and all(_is_identifier(token) for token in expression[::2])
+            and expression[-1].upper() not in _SQL_VALUE_WORDS):
+        return (_identifier_name(expression[-1]), target_field, "Direct mapping")
+    return ("UNKNOWN", target_field, UNKNOWN_TRANSFORMATION)
+
+def parse_dbt_script(dbt_script):
+    """Parse DBT script to extract field mappings and transformations with detailed logic.
+
+    Returns (source field, target field, transformation) for every aliased
+    item (`... AS TARGET`) of the script's select lists, in one pass over the
+    script; items may span lines. handle_empty_or_null_value macros are
+    described from their arguments, plain column references are direct
+    mappings and any other expression is UNKNOWN for manual input.
+    """
+    field_mappings = []
+    for item, alias_at in _select_items(_sql_tokens(dbt_script)):
+        mapping = _dbt_field_mapping(item, alias_at)
+        if mapping:
+            field_mappings.append(mapping)
+    return field_mappings
+
+def parse_handle_empty_or_null_value(params_str):
+    """Parse handle_empty_or_null_value function parameters and generate transformation description."""
+    
+    # All keyword arguments in one scan; quoted values lose their quotes
+    params = {name: value[1:-1] if value[:1] in ('"', "'") else value
+              for name, value in _MACRO_KWARG.findall(params_str)}
+    
+    # Extract values
+    chk_type = params.get('chk_type', "")
+    source_field = params.get('first_val', "")
+    length = int(params['length']) if params.get('length', "").isdigit() else 0
+    precision = int(params['precision']) if params.get('precision', "").isdigit() else 0
+    default_val = params.get('default_val', "")
+    empty_val = params.get('empty_val', "")
+    format_val = params.get('format', "")
+    is_string = params.get('is_string', "").lower() == 'true'
+    
+    # Generate transformation description based on data type and parameters
+    transformation_parts = []
+    
+    if chk_type.upper() == 'VARCHAR':
+        transformation_parts.append(f"Transform {source_field} to VARCHAR({length})")
+        transformation_parts.append("Replace NULL values with '!'")
+    
+    elif chk_type.upper() == 'NUMBER':
+        if precision == 0:
+            transformation_parts.append(f"Transform {source_field} to NUMBER({length},{precision})")
+            transformation_parts.append("Replace NULL values with '-1'")
+        else:
+            transformation_parts.append(f"Transform {source_field} to NUMBER({length},{precision})")
+            transformation_parts.append("NULL values remain NULL (precision > 0)")
+    
+    elif chk_type.upper() == 'TIMESTAMP':
+        transformation_parts.append(f"Transform {source_field} to TIMESTAMP")
+        if default_val:
+            transformation_parts.append(f"Set default value to '{default_val}' if empty")
+        if format_val:
+            transformation_parts.append(f"Format: {format_val}")
+    
+    elif chk_type.upper() == 'DATE':
+        transformation_parts.append(f"Transform {source_field} to DATE")
+        if default_val:
+            transformation_parts.append(f"Set default value to '{default_val}' if empty")
+        if format_val:
+            transformation_parts.append(f"Format: {format_val}")
+        if empty_val:
+            transformation_parts.append(f"Empty value representation: '{empty_val}'")
+    
+    else:
+        # Generic handling for other types
+        transformation_parts.append(f"Transform {source_field} to {chk_type}")
+        if default_val:
+            transformation_parts.append(f"Default value: '{default_val}'")
+    
+    # Add string conversion note if applicable
+    if is_string:
+        transformation_parts.append("Convert to string representation")
+    
+    transformation_description = "; ".join(transformation_parts)
+    
+    return source_field, transformation_description
+
+def extract_source_field_from_transformation(transformation):
+    """Extract source field name from transformation logic."""
+    # Look for field names in quotes or as parameters
+    
+    # Pattern 1: first_val='FIELD_NAME'
+    first_val_match = re.search(r"first_val=['\"]([^'\"]+)['\"]", transformation)
+    if first_val_match:
+        return first_val_match.group(1)
+    
+    # Pattern 2: Look for field names (assume uppercase with underscores)
+    field_match = re.search(r'\b([A-Z][A-Z0-9_]*)\b', transformation)
+    if field_match:
+        return field_match.group(1)
+    
+    # If no source field found, return empty string
+    return ""
+
+class ParseCache:
+    """Bounded LRU cache of parse results by content key, shared by every session in the process.
+
+    Thread-safe. Cached values are shared, so callers must not modify them.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            # Move to the end: the least recently used entries are dropped first
+            value = self._entries[key] = self._entries.pop(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+PARSE_CACHE_SIZE = 256
+
+# Parsed DDL and DBT scripts, keyed by ("DDL" or "DBT", script_digest)
+parse_cache = ParseCache(PARSE_CACHE_SIZE)
+
+def normalise_script(script):
+    """Script text without the whitespace differences the parsers ignore: line endings, trailing spaces and blank edges."""
+    return "\n".join(line.rstrip() for line in script.strip().lstrip("\ufeff").splitlines())
+
+def script_digest(script):
+    """SHA-256 of the normalised script: the same text pasted twice gets the same digest."""
+    return hashlib.sha256(normalise_script(script).encode("utf-8")).hexdigest()
+
+def cached_parse_ddl_tables(ddl_script):
+    """parse_ddl_tables through parse_cache, as read-only tuples: ((name, ((column, type), ...)), ...).
+
+    The result is the cached object itself, shared with every other caller.
+    """
+    key = ("DDL", script_digest(ddl_script))
+    tables = parse_cache.get(key)
+    if tables is None:
+        tables = tuple((name, tuple(columns)) for name, columns in parse_ddl_tables(ddl_script))
+        parse_cache.put(key, tables)
+    return tables
+
+def cached_parse_dbt_script(dbt_script):
+    """parse_dbt_script through parse_cache, as a read-only tuple of (source, target, transformation).
+
+    The result is the cached object itself, shared with every other caller.
+    """
+    key = ("DBT", script_digest(dbt_script))
+    field_mappings = parse_cache.get(key)
+    if field_mappings is None:
+        field_mappings = tuple(parse_dbt_script(dbt_script))
+        parse_cache.put(key, field_mappings)
+    return field_mappings
@@ -0,0 +1,184 @@
+"""Excel mapping reports for the DDLC Manager; xlsxwriter is imported only when a report is built."""
+from collections import defaultdict
+
+def generate_foundation_excel_report(mappings):
+    import io
+    import xlsxwriter
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    
+    # Define formats
+    header_format = workbook.add_format({
+        'bold': True,
+        'fg_color': '#4472C4',
+        'font_color': 'white',
+        'align': 'center',
+        'valign': 'vcenter',
+        'border': 1
+    })
+    
+    source_format = workbook.add_format({
+        'fg_color': '#D5E4BC',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    transform_format = workbook.add_format({
+        'fg_color': '#9BC2E6',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    target_format = workbook.add_format({
+        'fg_color': '#D1C4E9',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    # Group mappings by target table
+    tables = defaultdict(list)
+    for mapping in mappings:
+        tables[mapping['target_table']].append(mapping)
+    
+    # Create a worksheet for each table
+    for table_name, table_mappings in tables.items():
+        # Clean table name for sheet name (Excel has restrictions)
+        sheet_name = table_name[:31]  # Excel sheet names max 31 chars
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Headers
+        headers = ['Database', 'Schema', 'Table Name', 'Field Name', 'Transformation Logic', 
+                  'Database', 'Schema', 'Table Name', 'Column Name']
+        
+        # Add table info at the top
+        worksheet.merge_range('A1:I1', f'Foundation Layer - {table_name}', header_format)
+        worksheet.write('A2', f'Total Fields: {len(table_mappings)}', header_format)
+        
+        # Write section headers
+        worksheet.merge_range('A3:D3', 'SOURCE (DL2)', header_format)
+        worksheet.merge_range('E3:E3', 'TRANSFORMATION', header_format) 
+        worksheet.merge_range('F3:I3', 'TARGET (Foundation)', header_format)
+        
+        # Write column headers
+        for col, header in enumerate(headers):
+            worksheet.write(3, col, header, header_format)
+        
+        # Write data
+        for row, mapping in enumerate(table_mappings, start=4):
+            # Source columns (DL2)
+            worksheet.write(row, 0, mapping.get('source_database', ''), source_format)
+            worksheet.write(row, 1, mapping.get('source_schema', ''), source_format)
+            worksheet.write(row, 2, mapping.get('source_table', ''), source_format)
+            worksheet.write(row, 3, mapping.get('source_field', ''), source_format)
+            
+            # Transformation
+            worksheet.write(row, 4, mapping.get('transformation_logic', ''), transform_format)
+            
+            # Target columns (Foundation)
+            worksheet.write(row, 5, mapping.get('target_database', ''), target_format)
+            worksheet.write(row, 6, mapping.get('target_schema', ''), target_format)
+            worksheet.write(row, 7, mapping.get('target_table', ''), target_format)
+            worksheet.write(row, 8, mapping.get('target_field', ''), target_format)
+        
+        # Adjust column widths
+        for col in range(9):
+            worksheet.set_column(col, col, 20)
+    
+    workbook.close()
+    output.seek(0)
+    return output.getvalue()
+
+def generate_information_excel_report(mappings):
+    import io
+    import xlsxwriter
+
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    
+    # Define formats
+    header_format = workbook.add_format({
+        'bold': True,
+        'fg_color': '#4472C4',
+        'font_color': 'white',
+        'align': 'center',
+        'valign': 'vcenter',
+        'border': 1
+    })
+    
+    source_format = workbook.add_format({
+        'fg_color': '#D5E4BC',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    transform_format = workbook.add_format({
+        'fg_color': '#9BC2E6',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    target_format = workbook.add_format({
+        'fg_color': '#D1C4E9',
+        'border': 1,
+        'align': 'left',
+        'valign': 'vcenter'
+    })
+    
+    # Group mappings by target table
+    tables = defaultdict(list)
+    for mapping in mappings:
+        tables[mapping['target_table']].append(mapping)
+    
+    # Create a worksheet for each table
+    for table_name, table_mappings in tables.items():
+        # Clean table name for sheet name (Excel has restrictions)
+        sheet_name = table_name[:31]  # Excel sheet names max 31 chars
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Headers
+        headers = ['Database', 'Schema', 'Table Name', 'Field Name', 'Transformation Logic', 
+                  'Database', 'Schema', 'Table Name', 'Column Name']
+        
+        # Add table info at the top
+        worksheet.merge_range('A1:I1', f'Information Layer - {table_name}', header_format)
+        worksheet.write('A2', f'Total Fields: {len(table_mappings)}', header_format)
+        
+        # Write section headers
+        worksheet.merge_range('A3:D3', 'SOURCE (Foundation)', header_format)
+        worksheet.merge_range('E3:E3', 'TRANSFORMATION', header_format) 
+        worksheet.merge_range('F3:I3', 'TARGET (Information)', header_format)
+        
+        # Write column headers
+        for col, header in enumerate(headers):
+            worksheet.write(3, col, header, header_format)
+        
+        # Write data
+        for row, mapping in enumerate(table_mappings, start=4):
+            # Source columns (Foundation)
+            worksheet.write(row, 0, mapping.get('source_database', ''), source_format)
+            worksheet.write(row, 1, mapping.get('source_schema', ''), source_format)
+            worksheet.write(row, 2, mapping.get('source_table', ''), source_format)
+            worksheet.write(row, 3, mapping.get('source_field', ''), source_format)
+            
+            # Transformation
+            worksheet.write(row, 4, mapping.get('transformation_logic', ''), transform_format)
+            
+            # Target columns (Information)
+            worksheet.write(row, 5, mapping.get('target_database', ''), target_format)
+            worksheet.write(row, 6, mapping.get('target_schema', ''), target_format)
+            worksheet.write(row, 7, mapping.get('target_table', ''), target_format)
+            worksheet.write(row, 8, mapping.get('target_field', ''), target_format)
+        
+        # Adjust column widths
+        for col in range(9):
+            worksheet.set_column(col, col, 20)
+    
+    workbook.close()
+    output.seek(0)
+    return output.getvalue()
@@ -0,0 +1,76 @@
+"""Startup time and throughput of the headless `python -m dqc` CLI.
+
+Writes synthetic tilde rule files to a temporary directory, then times
+interpreter startup alone, `python -m dqc --help`, and
+`python -m dqc validate --cross-file` over all files (files/s and rows/s)
+for each worker count in --jobs.
+
+    python benchmarks/bench_cli.py [--files 200] [--rows 500] [--repeat 3] [--jobs 1 2 4]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import FIELDS
+from rule_io import rules_to_csv
+from rule_store import RuleStore
+
+SUFFIXES = ["DL2_CNT_CHK", "FND_DL3_SUM_CHK", "OP_HOP2_CNT_CHK", "INFO_DL3_DUP_CHK", "NONSTANDARD"]
+
+def make_rules(count, rng):
+    rules = []
+    for i in range(count):
+        rule = {field: (rng.choice(value) if isinstance(value, list) else value) for field, value in FIELDS.items()}
+        table = f"TABLE_{rng.randrange(10 ** 6)}"
+        rule.update(APPL_CD="EMM_PAYMENTS", RULE_NM=f"{table}_{rng.choice(SUFFIXES)}", RULE_SEQ_NR=str(i + 1),
+                    RULE_TRGT_OBJ_ID_TXT=table)
+        rules.append(rule)
+    return rules
+
+def write_files(directory, files, rows, seed=42):
+    rng = random.Random(seed)
+    for number in range(files):
+        path = os.path.join(directory, f"DATA_QC_RULE_INFO_APP{number:04d}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(rules_to_csv(RuleStore.from_records(make_rules(rows, rng)).frame))
+
+def best_wall_time(command, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory, args.files, args.rows)
+        interpreter = best_wall_time([sys.executable, "-c", "pass"], args.repeat)
+        startup = best_wall_time([sys.executable, "-m", "dqc", "--help"], args.repeat)
+        validate = {jobs: best_wall_time([sys.executable, "-m", "dqc", "validate", "-q", "--cross-file", "-j", str(jobs), directory],
+                                         args.repeat)
+                    for jobs in args.jobs}
+
+    rows = args.files * args.rows
+    print(f"{args.files} files x {args.rows} rules, best of {args.repeat}, {os.cpu_count()} cores")
+    print(f"interpreter startup         {interpreter * 1000:8.1f} ms")
+    print(f"python -m dqc --help        {startup * 1000:8.1f} ms")
+    for jobs, elapsed in validate.items():
+        print(f"python -m dqc validate -j {jobs:<2}{elapsed:8.2f} s  ({args.files / elapsed:,.1f} files/s, {rows / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cost and accuracy of DBT select-list parsing as models grow.
+
+Compares the previous parse_dbt_script, which ran a cascade of re.search
+calls on each physical line, against the single-pass select-list tokenizer,
+on dbt models whose items span several lines (synthetic.make_dbt_model). The
+per-item cost of a linear parser stays flat as the model grows.
+
+    python benchmarks/bench_dbt_parser.py [--columns 1000 10000 50000] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "DDLC"))
+
+from ddlc_parsing import parse_dbt_script, parse_handle_empty_or_null_value
+from synthetic import make_dbt_model
+
+def legacy_parse_dbt_script(dbt_script):
+    """parse_dbt_script as it was before the select-list tokenizer (descriptions from the current helper)."""
+    field_mappings = []
+    for line in dbt_script.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('--') or line.startswith('/*'):
+            continue
+        line = line.rstrip(',').strip()
+        dbt_function_match = re.search(r'\{\{\s*handle_empty_or_null_value\(([^}]+)\)\s*\}\}\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
+        if dbt_function_match:
+            source_field, transformation_description = parse_handle_empty_or_null_value(dbt_function_match.group(1).strip())
+            field_mappings.append((source_field, dbt_function_match.group(2).strip(), transformation_description))
+            continue
+        other_dbt_function_match = re.search(r'\{\{\s*([^}]+)\s*\}\}\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
+        if other_dbt_function_match:
+            field_mappings.append(("UNKNOWN", other_dbt_function_match.group(2).strip(), "UNKNOWN - Manual input required"))
+            continue
+        simple_alias_match = re.search(r'^([A-Za-z_][A-Za-z0-9_]*)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
+        if simple_alias_match:
+            field_mappings.append((simple_alias_match.group(1).strip(), simple_alias_match.group(2).strip(), "Direct mapping"))
+            continue
+        case_match = re.search(r'(CASE\s+.+?END)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE | re.DOTALL)
+        if case_match:
+            field_mappings.append(("UNKNOWN", case_match.group(2).strip(), "UNKNOWN - Manual input required"))
+            continue
+        general_as_match = re.search(r'^(.+?)\s+AS\s+([A-Za-z_][A-Za-z0-9_]*)', line, re.IGNORECASE)
+        if general_as_match:
+            field_mappings.append(("UNKNOWN", general_as_match.group(2).strip(), "UNKNOWN - Manual input required"))
+    return field_mappings
+
+def correct(mappings, expected):
+    """How many expected (source, target) pairs the parser produced."""
+    found = {(source, target) for source, target, _ in mappings}
+    return sum(1 for pair in expected if pair in found)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, nargs="+", default=[1000, 10000, 50000], help="select items per model")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'columns':>8}  {'parser':<10} {'total':>10} {'per item':>10}  correct")
+    for columns in args.columns:
+        sql, expected = make_dbt_model(columns)
+        for name, parse in (("legacy", legacy_parse_dbt_script), ("tokenizer", parse_dbt_script)):
+            seconds = min(timeit.repeat(lambda: parse(sql), number=1, repeat=args.repeat))
+            print(f"{columns:>8,}  {name:<10} {seconds * 1000:8.1f}ms {seconds / columns * 1e6:8.2f}us  "
+                  f"{correct(parse(sql), expected):,} of {columns:,}")
+
+if __name__ == "__main__":
+    main()
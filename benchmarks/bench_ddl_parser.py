@@ -0,0 +1,72 @@
+"""Cost and accuracy of DDL parsing on a synthetic schema dump.
+
+Compares the previous line/regex parse_ddl_script, which only understands one
+CREATE TABLE per call and so is run once per statement after splitting the
+dump on ";", against the tokenizer-based parse_ddl_tables reading the whole
+dump in one call. Both are checked against the columns the dump defines.
+
+    python benchmarks/bench_ddl_parser.py [--tables 5000] [--columns 50] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "DDLC"))
+
+from ddlc_parsing import parse_ddl_tables
+from synthetic import make_ddl_dump
+
+def legacy_parse_ddl_script(ddl_script):
+    """parse_ddl_script as it was before the tokenizer."""
+    columns = []
+    ddl_script = ddl_script.strip()
+    start_paren = ddl_script.find('(')
+    end_paren = ddl_script.rfind(')')
+    if start_paren == -1 or end_paren == -1:
+        return columns
+    for line in ddl_script[start_paren+1:end_paren].split('\n'):
+        line = line.strip()
+        if not line or line.startswith('--') or line.startswith('/*'):
+            continue
+        line = line.rstrip(',').strip()
+        if any(keyword in line.upper() for keyword in ['PRIMARY KEY', 'FOREIGN KEY', 'CONSTRAINT', 'INDEX', 'KEY']):
+            continue
+        match = re.match(r'^([A-Za-z_][A-Za-z0-9_]*)\s+([A-Za-z]+(?:\([^)]+\))?)', line)
+        if match:
+            columns.append((match.group(1), match.group(2)))
+    return columns
+
+def legacy_parse_dump(dump):
+    return [legacy_parse_ddl_script(statement) for statement in dump.split(";") if "(" in statement]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, default=5000)
+    parser.add_argument("--columns", type=int, default=50, help="columns per table")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dump = make_ddl_dump(args.tables, args.columns)
+    expected = args.tables * args.columns
+    print(f"{args.tables:,} tables x {args.columns} columns, {len(dump) / 1e6:.1f} MB")
+
+    legacy_columns = sum(len(columns) for columns in legacy_parse_dump(dump))
+    tables = parse_ddl_tables(dump)
+    tokenizer_columns = sum(len(columns) for _, columns in tables)
+    # Column types as the dump writes them, without the spaces the legacy regex trips over
+    wrong_types = sum(1 for _, columns in tables for _, data_type in columns
+                      if data_type not in ("VARCHAR(16777216)", "NUMBER(38,0)", "NUMBER(18,2)", "TIMESTAMP_NTZ(9)", "DATE", "BOOLEAN"))
+
+    legacy = min(timeit.repeat(lambda: legacy_parse_dump(dump), number=1, repeat=args.repeat))
+    tokenizer = min(timeit.repeat(lambda: parse_ddl_tables(dump), number=1, repeat=args.repeat))
+    print(f"legacy regex (per statement)   {legacy * 1000:9.1f} ms  {legacy_columns:>9,} of {expected:,} columns")
+    print(f"tokenizer (whole dump)         {tokenizer * 1000:9.1f} ms  {tokenizer_columns:>9,} of {expected:,} columns, "
+          f"{len(tables):,} tables, {wrong_types} unexpected types")
+    print(f"tokenizer throughput           {len(dump) / tokenizer / 1e6:9.1f} MB/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Per-name cost of rule-name validation and description generation.
+
+Compares the previous approach (14 patterns tried one by one with re.match,
+and a chain of substring tests for the description) against what ships: the
+anchored RULE_NAME_REGEX for validation and search_rule_name_class, built
+from the same alternation, for picking the description template.
+
+    python benchmarks/bench_rule_names.py [--names 20000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rule_generation import generate_rule_description
+from validation import search_rule_name_class, validate_rule_name_matches_standards
+
+LEGACY_PATTERNS = [
+    r"^[A-Z0-9_]+OP_HOP3_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+OP_HOP2_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+OP_HOP1_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+DL2_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+FND_DL3_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+STG_DL3_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+INFO_DL3_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+OP_HOP3_HOP2_DIFF_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+OP_HOP2_HOP1_DIFF_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+OP_HOP1_DL2_DIFF_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+DL2_FND_DIFF_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+STG_INFO_DIFF_(CNT|SUM)_CHK$",
+    r"^[A-Z0-9_]+INFO_DL3_DUP_CHK$",
+    r"^[A-Z0-9_]+INFO_DL3_OVERLAP_CHK$"
+]
+
+# The substring pairs generate_rule_description used to test in order
+LEGACY_DESCRIPTION_MARKERS = [
+    ("_OP_HOP3_CNT_CHK", "_OP_HOP3_SUM_CHK"),
+    ("_OP_HOP2_CNT_CHK", "_OP_HOP2_SUM_CHK"),
+    ("_OP_HOP1_CNT_CHK", "_OP_HOP1_SUM_CHK"),
+    ("_DL2_CNT_CHK", "_DL2_SUM_CHK"),
+    ("_FND_DL3_CNT_CHK", "_FND_DL3_SUM_CHK"),
+    ("_STG_DL3_CNT_CHK", "_STG_DL3_SUM_CHK"),
+    ("_INFO_DL3_CNT_CHK", "_INFO_DL3_SUM_CHK"),
+    ("_OP_HOP3_HOP2_DIFF_CNT_CHK", "_OP_HOP3_HOP2_DIFF_SUM_CHK"),
+    ("_OP_HOP2_HOP1_DIFF_CNT_CHK", "_OP_HOP2_HOP1_DIFF_SUM_CHK"),
+    ("_OP_HOP1_DL2_DIFF_CNT_CHK", "_OP_HOP1_DL2_DIFF_SUM_CHK"),
+    ("_DL2_FND_DIFF_CNT_CHK", "_DL2_FND_DIFF_SUM_CHK"),
+    ("_STG_INFO_DIFF_CNT_CHK", "_STG_INFO_DIFF_SUM_CHK"),
+    ("_INFO_DL3_DUP_CHK", "_INFO_DL3_DUP_CHK"),
+    ("_INFO_DL3_OVERLAP_CHK", "_INFO_DL3_OVERLAP_CHK"),
+]
+
+SUFFIXES = [
+    "OP_HOP3_CNT_CHK", "OP_HOP2_SUM_CHK", "OP_HOP1_CNT_CHK", "DL2_SUM_CHK", "FND_DL3_CNT_CHK",
+    "STG_DL3_SUM_CHK", "INFO_DL3_CNT_CHK", "OP_HOP3_HOP2_DIFF_CNT_CHK", "OP_HOP2_HOP1_DIFF_SUM_CHK",
+    "OP_HOP1_DL2_DIFF_CNT_CHK", "DL2_FND_DIFF_SUM_CHK", "STG_INFO_DIFF_CNT_CHK", "INFO_DL3_DUP_CHK",
+    "INFO_DL3_OVERLAP_CHK", "DL2_CHK", "NONSTANDARD",
+]
+
+def legacy_matches(rule_name):
+    return any(re.match(pattern, rule_name) for pattern in LEGACY_PATTERNS)
+
+def legacy_description_marker(rule_name):
+    for markers in LEGACY_DESCRIPTION_MARKERS:
+        if markers[0] in rule_name or markers[1] in rule_name:
+            return markers
+    return None
+
+def make_names(count, seed=42):
+    rng = random.Random(seed)
+    return [f"TABLE_{rng.randrange(10 ** 6)}_{rng.choice(SUFFIXES)}" for _ in range(count)]
+
+def per_name_us(func, names, repeat):
+    best = min(timeit.repeat(lambda: [func(name) for name in names], number=1, repeat=repeat))
+    return best / len(names) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    assert [legacy_matches(n) for n in names] == [not validate_rule_name_matches_standards({"RULE_NM": n}) for n in names]
+
+    results = [
+        ("validate: 14 x re.match (before)", per_name_us(legacy_matches, names, args.repeat)),
+        ("validate: RULE_NAME_REGEX (after)", per_name_us(lambda n: validate_rule_name_matches_standards({"RULE_NM": n}), names, args.repeat)),
+        ("validate + classify (before)", per_name_us(lambda n: (legacy_matches(n), legacy_description_marker(n)), names, args.repeat)),
+        ("validate + classify (after)", per_name_us(lambda n: (validate_rule_name_matches_standards({"RULE_NM": n}), search_rule_name_class(n)), names, args.repeat)),
+        ("generate_rule_description (after)", per_name_us(lambda n: generate_rule_description(n, "CNT_CHK", "NA", "TABLE"), names, args.repeat)),
+    ]
+    width = max(len(label) for label, _ in results)
+    print(f"{len(names)} rule names, best of {args.repeat}")
+    for label, cost in results:
+        print(f"{label:<{width}}  {cost:8.3f} us/name")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cold start and per-rerun cost of the Streamlit apps and the import cost of the core modules.
+
+Every measurement runs in a fresh interpreter. Imports are timed on their
+own; each app is run with streamlit.testing's AppTest, timing the first
+run (cold script, module imports, cached resources built) and then the
+mean of --reruns further reruns of the same session.
+
+    python benchmarks/bench_startup.py [--reruns 20] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "pandas": "pandas" in sys.modules}}))
+"""
+
+APP_PROBE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({script!r}, default_timeout=120)
+start = time.perf_counter()
+app.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range({reruns}):
+    app.run()
+print(json.dumps({{"first": first, "rerun": (time.perf_counter() - start) / {reruns}}}))
+"""
+
+MODULES = ["validation", "rule_generation", "rule_io", "dqc.cli"]
+APPS = ["dqc_app.py", os.path.join("DDLC", "ddlc_manager.py")]
+
+def probe(code, repeat):
+    """Run code in fresh interpreters and keep the fastest result of each measurement."""
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {key: min(result[key] for result in results) for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat} fresh interpreters")
+    for module in MODULES:
+        result = probe(IMPORT_PROBE.format(module=module), args.repeat)
+        print(f"import {module:<28} {result['seconds'] * 1000:8.1f} ms  (pandas loaded: {bool(result['pandas'])})")
+    for script in APPS:
+        result = probe(APP_PROBE.format(script=os.path.join(ROOT, script), reruns=args.reruns), args.repeat)
+        print(f"{script:<35} first run {result['first'] * 1000:8.1f} ms, rerun {result['rerun'] * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Timing suite over synthetic rulebooks and DDLC scripts, with a baseline to compare against.
+
+For each rulebook size it times tilde CSV ingest into a RuleStore,
+validate_single_row (per row, against the whole rulebook), bulk
+validate_dataframe, name/description generation, auto-fix and tilde CSV
+export; then the DDLC DDL and DBT parsers and both Excel writers. Every
+timing is the best of --repeat runs.
+
+    python benchmarks/bench_suite.py --save-baseline             # record benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare                   # compare against it; exit 1 on a regression
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000 --output results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "DDLC"))
+
+import pandas as pd
+
+from ddlc_parsing import parse_dbt_script, parse_ddl_script
+from ddlc_reports import generate_foundation_excel_report, generate_information_excel_report
+from rule_generation import auto_fix_frame, generate_names
+from rule_io import iter_rule_chunks, iter_rules_csv
+from rule_store import RuleStore
+from synthetic import make_dbt_script, make_ddl_script, make_mappings, make_rulebook
+from validation import SEQUENCE_KEY_FIELDS, validate_dataframe, validate_single_row
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+SINGLE_ROW_SAMPLE = 200
+MAPPING_TABLES = 10
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def ingest(data):
+    """Read a tilde CSV into a RuleStore the way the app's upload does."""
+    return RuleStore.from_frames(iter_rule_chunks(io.BytesIO(data)))
+
+def validate_rows(rows, all_rows):
+    for row in rows:
+        validate_single_row(row, all_rows, is_new_row=True)
+
+def rulebook_timings(rows, args):
+    frame = make_rulebook(rows, args.duplicate_rate, args.invalid_name_rate, args.seed)
+    data = b"".join(iter_rules_csv(frame))
+    store = ingest(data)
+    rules = store.frame.reset_index(drop=True)
+    all_rows = store.records(["RULE_NM"] + SEQUENCE_KEY_FIELDS)
+    sample = rules.head(SINGLE_ROW_SAMPLE).to_dict("records")
+    timings = {
+        "ingest": best_time(lambda: ingest(data), args.repeat),
+        "validate_single_row": best_time(lambda: validate_rows(sample, all_rows), args.repeat) / len(sample),
+        "validate_dataframe": best_time(lambda: validate_dataframe(rules), args.repeat),
+        "generate_names": best_time(lambda: generate_names(rules), args.repeat),
+        "auto_fix_frame": best_time(lambda: auto_fix_frame(rules), args.repeat),
+        "export_csv": best_time(lambda: b"".join(iter_rules_csv(store.frame)), args.repeat),
+    }
+    return {f"rulebook/{rows}/{name}": seconds for name, seconds in timings.items()}
+
+def ddlc_timings(columns, args):
+    ddl = make_ddl_script(columns)
+    dbt = make_dbt_script(columns)
+    mappings = make_mappings(MAPPING_TABLES, max(1, columns // MAPPING_TABLES))
+    timings = {
+        "parse_ddl_script": best_time(lambda: parse_ddl_script(ddl), args.repeat),
+        "parse_dbt_script": best_time(lambda: parse_dbt_script(dbt), args.repeat),
+        "foundation_excel_report": best_time(lambda: generate_foundation_excel_report(mappings), args.repeat),
+        "information_excel_report": best_time(lambda: generate_information_excel_report(mappings), args.repeat),
+    }
+    return {f"ddlc/{columns}/{name}": seconds for name, seconds in timings.items()}
+
+def run_suite(args):
+    results = {}
+    for rows in args.sizes:
+        print(f"rulebook: {rows:,} rules", file=sys.stderr)
+        results.update(rulebook_timings(rows, args))
+    print(f"ddlc: {args.ddlc_columns:,} columns", file=sys.stderr)
+    results.update(ddlc_timings(args.ddlc_columns, args))
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "duplicate_rate": args.duplicate_rate,
+            "invalid_name_rate": args.invalid_name_rate,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold, min_delta):
+    """Rows of (benchmark, baseline s, current s, change, flag); flag is "REGRESSION" when
+    current is more than threshold slower than the baseline and by at least min_delta seconds."""
+    rows = []
+    for name, seconds in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            rows.append((name, None, seconds, None, "new"))
+            continue
+        change = seconds / before - 1 if before else 0.0
+        slower = change > threshold and seconds - before >= min_delta
+        rows.append((name, before, seconds, change, "REGRESSION" if slower else ""))
+    return rows
+
+def print_results(results):
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        print(f"{name:<{width}}  {seconds * 1000:10.2f} ms")
+
+def print_comparison(rows):
+    width = max(len(row[0]) for row in rows)
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  {'change':>8}")
+    for name, before, seconds, change, flag in rows:
+        before_text = f"{before * 1000:8.2f}ms" if before is not None else f"{'-':>10}"
+        change_text = f"{change:+7.1%}" if change is not None else f"{'-':>8}"
+        print(f"{name:<{width}}  {before_text}  {seconds * 1000:8.2f}ms  {change_text}  {flag}".rstrip())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="rulebook sizes in rules")
+    parser.add_argument("--ddlc-columns", type=int, default=1000, help="columns in the DDL/DBT scripts and Excel reports")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--invalid-name-rate", type=float, default=0.05)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write the results to {os.path.relpath(BASELINE, ROOT)}")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, metavar="BASELINE",
+                        help="compare against a results file (default: the saved baseline); exit 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that counts as a regression (default 0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args()
+
+    current = run_suite(args)
+    for path in filter(None, [args.output, BASELINE if args.save_baseline else None]):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(current, handle, indent=2)
+            handle.write("\n")
+    if not args.compare:
+        print_results(current["results"])
+        return 0
+    with open(args.compare, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    rows = compare(current, baseline, args.threshold, args.min_delta)
+    print_comparison(rows)
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} against {args.compare}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
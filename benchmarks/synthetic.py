@@ -0,0 +1,258 @@
+"""Synthetic, reproducible rulebooks and DDLC scripts for benchmarks.
+
+Rulebooks draw every field from the enumerations in config.FIELDS. Each
+target table gets up to 20 rules (RULE_SEQ_NR 1-20) with distinct, standard
+rule names; duplicate_rate of the rows then repeat an earlier rule (same
+RULE_NM and sequence key) and invalid_name_rate of the rows get a RULE_NM
+outside the naming standards. The same seed always gives the same data.
+
+    python benchmarks/synthetic.py --rows 100000 --output rules.csv [--duplicate-rate 0.01] [--invalid-name-rate 0.05]
+"""
+import argparse
+import itertools
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import FIELDS, RULE_NAME_COMPONENTS
+from rule_generation import ABORT_IND_METHODS, generate_rule_description
+from validation import SUM_METHODS, classify_rule_name
+
+RULES_PER_TABLE = len(FIELDS["RULE_SEQ_NR"])
+APPLICATIONS = ["EMM_PAYMENTS", "EMM_FINANCE", "EMM_TREASURY", "EMM_LEDGER"]
+SUM_ATTRIBUTES = ["PYMT_AMT", "TXN_AMT", "FEE_AMT", "BAL_AMT"]
+EFFECTIVE_DATE = "2024-01-01"
+CREATED_TS = "2024-01-01 00:00:00"
+
+def _concrete_components(component):
+    """Every concrete choice of a component such as "OP_(HOP3_HOP2|HOP2_HOP1)"."""
+    choices = [group.split("|") for group in re.findall(r"\(([^)]*)\)", component)]
+    for picked in itertools.product(*choices):
+        values = iter(picked)
+        yield re.sub(r"\(([^)]*)\)", lambda _: next(values), component)
+
+def standard_rule_kinds():
+    """(db, method, component, layers) for every distinct rule name that meets the naming standards."""
+    kinds = {}
+    for (db, method, layer), component in RULE_NAME_COMPONENTS.items():
+        if layer is None:
+            continue
+        for concrete in _concrete_components(component):
+            if classify_rule_name(f"TBL_{concrete}_{method}") is not None:
+                kinds.setdefault((db, method, concrete), []).append(layer)
+    return [(db, method, component, layers) for (db, method, component), layers in kinds.items()]
+
+def make_rulebook(rows, duplicate_rate=0.0, invalid_name_rate=0.0, seed=42):
+    """Return a text rules frame of `rows` synthetic rules with the FIELDS columns."""
+    rng = np.random.default_rng(seed)
+    kinds = standard_rule_kinds()
+    positions = np.arange(rows)
+    tables = positions // RULES_PER_TABLE
+    # A random permutation of the rule kinds per table keeps names unique within it
+    picks = np.argsort(rng.random((tables[-1] + 1 if rows else 0, len(kinds))), axis=1)
+    kind = picks[tables, positions % RULES_PER_TABLE]
+
+    db = np.empty(rows, dtype=object)
+    method = np.empty(rows, dtype=object)
+    component = np.empty(rows, dtype=object)
+    layer = np.empty(rows, dtype=object)
+    for number, (kind_db, kind_method, kind_component, kind_layers) in enumerate(kinds):
+        selected = kind == number
+        db[selected], method[selected], component[selected] = kind_db, kind_method, kind_component
+        layer[selected] = rng.choice(kind_layers, size=int(selected.sum()))
+
+    table = pd.Series(tables).map("TBL_{:06d}".format)
+    method = pd.Series(method)
+    names = table + "_" + pd.Series(component) + "_" + method
+    invalid = rng.random(rows) < invalid_name_rate
+    names[invalid] = (table + "_" + method)[invalid]
+    is_sum = method.isin(SUM_METHODS)
+    attribute = pd.Series(rng.choice(SUM_ATTRIBUTES, size=rows)).where(is_sum, "NA")
+
+    def choose(field):
+        return rng.choice(FIELDS[field], size=rows)
+
+    target_schema = choose("RULE_TRGT_SCHM_NM")
+    frame = pd.DataFrame({
+        "DATA_QC_ID": FIELDS["DATA_QC_ID"],
+        "APPL_CD": rng.choice(APPLICATIONS, size=rows),
+        "RULE_NM": names,
+        "RULE_DSC_TXT": [generate_rule_description(*values) for values in
+                         zip(names.tolist(), method.tolist(), attribute.tolist(), table.tolist())],
+        "RULE_FREQ_CD": FIELDS["RULE_FREQ_CD"],
+        "RULE_VALID_CTGY_NM": choose("RULE_VALID_CTGY_NM"),
+        "RULE_VALID_METH_CD": method,
+        "RULE_ABORT_IND": np.where(method.isin(ABORT_IND_METHODS), "Y", "N"),
+        "RULE_SRC_DB_NM": choose("RULE_SRC_DB_NM"),
+        "RULE_SRC_SCHM_NM": choose("RULE_SRC_SCHM_NM"),
+        "RULE_SRC_OBJ_ID_TXT": "SRC_" + table,
+        "RULE_SRC_ATTR_NM": FIELDS["RULE_SRC_ATTR_NM"],
+        "RULE_TRGT_DB_NM": db,
+        "RULE_TRGT_SCHM_NM": target_schema,
+        "RULE_TRGT_OBJ_ID_TXT": table,
+        "RULE_TRGT_ATTR_NM": attribute,
+        "RULE_ACPT_VARY_PCT": "",
+        "RULE_MIN_THRESH_VALUE_TXT": "",
+        "RULE_MAX_THRESH_VALUE_TXT": "",
+        "RULE_TRGT_DATA_LAYER_NM": layer,
+        "RULE_CDE_IND": FIELDS["RULE_CDE_IND"],
+        "RULE_LOGIC_TXT": "SELECT COUNT(*) FROM " + pd.Series(target_schema) + "." + table,
+        "RULE_EFF_DT": EFFECTIVE_DATE,
+        "RULE_EXP_DT": FIELDS["RULE_EXP_DT"],
+        "RULE_ACTV_IND": np.where(rng.random(rows) < 0.9, "Y", "N"),
+        "RULE_RMRK_TXT": "",
+        "CREA_PRTY_ID": FIELDS["CREA_PRTY_ID"],
+        "CREA_TS": CREATED_TS,
+        "UPDT_PRTY_ID": "",
+        "UPDT_TS": "",
+        "ETL_CREA_NR": "",
+        "ETL_CREA_TS": "",
+        "ETL_UPDT_NR": "",
+        "ETL_UPDT_TS": "",
+        "ASSET_ID": FIELDS["ASSET_ID"],
+        "ASSET_NM": "",
+        "RULE_SEQ_NR": (positions % RULES_PER_TABLE + 1).astype(str),
+    }, index=positions)
+
+    # Duplicates re-enter an earlier rule as it was, so they collide on both RULE_NM and sequence key
+    duplicate = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    duplicate = duplicate[duplicate > 0]
+    if len(duplicate):
+        source = (rng.random(len(duplicate)) * duplicate).astype(np.int64)
+        frame.iloc[duplicate] = frame.iloc[source].to_numpy()
+    return frame[list(FIELDS)]
+
+def make_ddl_script(columns, table="TBL_000001"):
+    """A CREATE TABLE script with `columns` columns of mixed types, comments and a primary key."""
+    types = ["VARCHAR(16777216)", "NUMBER(38,0)", "NUMBER(18,2)", "TIMESTAMP_NTZ(9)", "DATE", "BOOLEAN"]
+    lines = [f"CREATE OR REPLACE TABLE DL2_CHIEF_FINANCIAL_OFFICE_RQ.ENTERPRISE.{table} ("]
+    for number in range(columns):
+        if number % 25 == 0:
+            lines.append(f"    -- column group {number // 25 + 1}")
+        lines.append(f"    COL_{number:05d} {types[number % len(types)]},")
+    lines.append("    PRIMARY KEY (COL_00000)")
+    lines.append(");")
+    return "\n".join(lines)
+
+def make_ddl_dump(tables, columns, database="DL2_CHIEF_FINANCIAL_OFFICE_RQ", schema="ENTERPRISE"):
+    """A schema dump of `tables` CREATE TABLE statements with `columns` columns each.
+
+    Besides plain columns it has what a real dump contains: comments between
+    and inside statements, quoted identifiers, several columns on one line,
+    types written with a space before their parentheses, *_KEY columns,
+    defaults with nested parentheses, constraints and table options.
+    """
+    types = ["VARCHAR(16777216)", "NUMBER (38,0)", "NUMBER(18, 2)", "TIMESTAMP_NTZ(9)", "DATE", "BOOLEAN"]
+    statements = []
+    for table in range(tables):
+        lines = [f"-- table {table + 1} of {tables}",
+                 f"CREATE OR REPLACE TRANSIENT TABLE {database}.{schema}.\"TBL_{table:06d}\" (",
+                 "    MERCHANT_KEY NUMBER(38,0) NOT NULL DEFAULT (COALESCE(NULL, (0))),"]
+        for number in range(1, columns):
+            if number % 25 == 0:
+                lines.append(f"    /* column group {number // 25 + 1}, (continued) */")
+            column = f"\"Col {number:05d}\"" if number % 10 == 0 else f"COL_{number:05d}"
+            if number % 7 == 0 and number + 1 < columns:
+                lines[-1] += f" {column} {types[number % len(types)]},"
+            else:
+                lines.append(f"    {column} {types[number % len(types)]} COMMENT 'value, (raw)',")
+        lines.append("    CONSTRAINT PK_MERCHANT PRIMARY KEY (MERCHANT_KEY)")
+        lines.append(") COMMENT = 'synthetic';")
+        statements.append("\n".join(lines))
+    return "\n\n".join(statements)
+
+def make_dbt_script(columns):
+    """A DBT select list with `columns` lines covering each pattern parse_dbt_script recognises."""
+    patterns = [
+        "{{{{ handle_empty_or_null_value(chk_type='VARCHAR', first_val='SRC_{n:05d}', length=100) }}}} AS COL_{n:05d}",
+        "{{{{ handle_empty_or_null_value(chk_type='NUMBER', first_val='SRC_{n:05d}', length=38, precision=0) }}}} AS COL_{n:05d}",
+        "{{{{ handle_empty_or_null_value(chk_type='TIMESTAMP', first_val='SRC_{n:05d}', default_val='1900-01-01', format='YYYY-MM-DD') }}}} AS COL_{n:05d}",
+        "{{{{ to_local_ts('SRC_{n:05d}') }}}} AS COL_{n:05d}",
+        "SRC_{n:05d} AS COL_{n:05d}",
+        "CASE WHEN SRC_{n:05d} = 'Y' THEN 1 ELSE 0 END AS COL_{n:05d}",
+        "COALESCE(SRC_{n:05d}, 0) AS COL_{n:05d}",
+    ]
+    lines = ["SELECT"]
+    lines.extend("    " + patterns[n % len(patterns)].format(n=n) + "," for n in range(columns))
+    lines.append("FROM {{ ref('stg_source') }}")
+    return "\n".join(lines)
+
+def make_dbt_model(columns):
+    """A dbt model whose final CTE selects `columns` items, many of them spread over several lines.
+
+    Returns (sql, expected) where expected is the (source field, target field)
+    each item should map to, UNKNOWN for expressions.
+    """
+    items = []
+    expected = []
+    for n in range(columns):
+        kind = n % 5
+        if kind == 0:
+            items.append(f"{{{{ handle_empty_or_null_value(chk_type='VARCHAR',\n"
+                         f"                                  length=100,\n"
+                         f"                                  first_val='SRC_{n:05d}') }}}} AS COL_{n:05d}")
+            expected.append((f"SRC_{n:05d}", f"COL_{n:05d}"))
+        elif kind == 1:
+            items.append(f"CASE\n            WHEN SRC_{n:05d} IN ('A', 'B') THEN 'Y'\n            ELSE 'N'\n        END AS COL_{n:05d}")
+            expected.append(("UNKNOWN", f"COL_{n:05d}"))
+        elif kind == 2:
+            items.append(f"src.SRC_{n:05d} AS COL_{n:05d}")
+            expected.append((f"SRC_{n:05d}", f"COL_{n:05d}"))
+        elif kind == 3:
+            items.append(f"CAST(SRC_{n:05d} AS NUMBER(18, 2))\n            AS COL_{n:05d}")
+            expected.append(("UNKNOWN", f"COL_{n:05d}"))
+        else:
+            items.append(f"COALESCE(SRC_{n:05d}, -- fallback, see below\n                 0) AS COL_{n:05d}")
+            expected.append(("UNKNOWN", f"COL_{n:05d}"))
+    sql = "\n".join([
+        "{{ config(materialized='table') }}",
+        "WITH src AS (",
+        "    SELECT * FROM {{ source('dl2', 'payments') }}",
+        "),",
+        "renamed AS (",
+        "    SELECT",
+        "        " + ",\n        ".join(items),
+        "    FROM src",
+        ")",
+        "SELECT * FROM renamed",
+    ])
+    return sql, expected
+
+def make_mappings(tables, columns, layer_transition="DL2_to_Foundation"):
+    """Mapping dicts as the DDLC Manager stores them, `columns` per target table."""
+    return [{
+        "layer_transition": layer_transition,
+        "source_database": "DL2_CHIEF_FINANCIAL_OFFICE_RQ", "source_schema": "ENTERPRISE", "source_table": f"SRC_{table:06d}",
+        "source_field": f"SRC_{column:05d}", "transformation_logic": "Direct mapping",
+        "target_database": "CFOPAYMENTSDB", "target_schema": "APP_CFOPYMTS", "target_table": f"TBL_{table:06d}",
+        "target_field": f"COL_{column:05d}",
+    } for table in range(tables) for column in range(columns)]
+
+def main():
+    from rule_io import iter_rules_csv, rules_to_parquet
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-name-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="tilde CSV, or Parquet when the name ends in .parquet")
+    args = parser.parse_args()
+
+    frame = make_rulebook(args.rows, args.duplicate_rate, args.invalid_name_rate, args.seed)
+    with open(args.output, "wb") as handle:
+        if args.output.lower().endswith(".parquet"):
+            handle.write(rules_to_parquet(frame))
+        else:
+            for chunk in iter_rules_csv(frame):
+                handle.write(chunk)
+    print(f"{len(frame):,} rules -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -52,3 +52,49 @@ FIELDS = {
     "ASSET_NM": "",
     "RULE_SEQ_NR": [str(i) for i in range(1, 21)]
 }
+
+# RULE_NM target component per (RULE_TRGT_DB_NM, RULE_VALID_METH_CD group, RULE_TRGT_DATA_LAYER_NM).
+# A plain string instead of a layer mapping applies to every layer.
+RULE_NAME_COMPONENT_RULES = {
+    "CFOPAYMENTSDB": {
+        ("CNT_CHK", "SUM_CHK"): {"OnPrem_HOP3": "OP_HOP3", "OnPrem_HOP2": "OP_HOP2", "OnPrem_HOP1": "OP_HOP1",
+                                 "DL2": "DL2", "DL3": "FND_DL3"},
+        ("DIFF_CNT_CHK", "DIFF_SUM_CHK"): {"OnPrem": "OP_(HOP3_HOP2|HOP2_HOP1)", "DL2": "OP_HOP1_DL2", "DL3": "DL2_FND"},
+        ("DUP_CHK", "OVERLAP_CHK"): {"DL3": "FND_DL3"},
+    },
+    "CFOINFODMDB": {
+        ("CNT_CHK", "SUM_CHK"): "(STG|INFO)_DL3",
+        ("DIFF_CNT_CHK", "DIFF_SUM_CHK"): "STG_INFO",
+        ("DUP_CHK", "OVERLAP_CHK"): "INFO_DL3",
+    },
+}
+
+def _expand_rule_name_components(rules):
+    """Flatten the rules to (db, method, layer) -> component; layer None is the any-layer fallback."""
+    components = {}
+    for db, methods in rules.items():
+        for method_group, layers in methods.items():
+            if isinstance(layers, str):
+                any_layer, layers = layers, dict.fromkeys(FIELDS["RULE_TRGT_DATA_LAYER_NM"], layers)
+            else:
+                any_layer = None
+            for method in method_group:
+                if any_layer:
+                    components[(db, method, None)] = any_layer
+                for layer, component in layers.items():
+                    components[(db, method, layer)] = component
+    return components
+
+RULE_NAME_COMPONENTS = _expand_rule_name_components(RULE_NAME_COMPONENT_RULES)
+UNKNOWN_RULE_NAME_COMPONENT = "UNKNOWN"
+
+# Check type used in descriptions; the first key contained in RULE_VALID_METH_CD wins
+CHECK_TYPES = {
+    "DIFF_CNT_CHK": "difference count check",
+    "CNT_CHK": "count check",
+    "DIFF_SUM_CHK": "difference sum check",
+    "SUM_CHK": "sum check",
+    "DUP_CHK": "duplicate check",
+    "OVERLAP_CHK": "overlap check",
+}
+DEFAULT_CHECK_TYPE = "data quality check"
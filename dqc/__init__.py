@@ -0,0 +1 @@
+"""Headless command-line tools for DQC rulebooks (``python -m dqc``)."""
@@ -0,0 +1,5 @@
+import sys
+
+from dqc.cli import main
+
+sys.exit(main())
@@ -0,0 +1,110 @@
+"""Validate many rule files in parallel, with RULE_NM and sequence-key uniqueness across files.
+
+Each worker process reads and validates one file (validate_file,
+including duplicates inside that file) and sends back its RULE_NM values and
+sequence keys. The parent merges those into global indexes and reports every
+key defined in more than one file, since the DATA_QC_RULE_INFO_* files of
+all applications are loaded into one table.
+"""
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from validation import DUPLICATE_RULE_NM_ERROR, DUPLICATE_SEQUENCE_ERROR, SEQUENCE_KEY_FIELDS, validate_dataframe
+
+# error_code -> (field, message) for collisions between files
+CROSS_FILE_ERROR_CODES = {
+    "RULE_SEQ_NR_DUPLICATE_ACROSS_FILES": ("RULE_SEQ_NR", DUPLICATE_SEQUENCE_ERROR.rstrip(".") + " in another file."),
+    "RULE_NM_DUPLICATE_ACROSS_FILES": ("RULE_NM", DUPLICATE_RULE_NM_ERROR.rstrip(".") + " in another file."),
+}
+MAX_LISTED_CONFLICTS = 5
+
+def validate_file(path, with_keys=False):
+    """Validate one rule file; returns a result dict with its rule count and error records.
+
+    with_keys also returns the file's RULE_NM values and sequence keys in row
+    order under "names" and "sequence_keys", for checks across files.
+    """
+    from rule_io import read_rules_file
+
+    try:
+        frame = read_rules_file(path).reset_index(drop=True)
+    except Exception as e:
+        return {"file": path, "rules": 0, "errors": [], "read_error": str(e)}
+    errors = validate_dataframe(frame)
+    records = [{"file": path, "row": int(row_index) + 1, "field": field, "error_code": code, "message": message}
+               for row_index, field, code, message in errors.itertuples(index=False)]
+    result = {"file": path, "rules": len(frame), "errors": records, "read_error": None}
+    if with_keys:
+        result["names"] = frame["RULE_NM"].tolist()
+        result["sequence_keys"] = list(zip(*(frame[field].tolist() for field in SEQUENCE_KEY_FIELDS)))
+    return result
+
+def merge_indexes(results):
+    """Merge per-file key lists into key -> {file: [rows]} indexes (rows 1-based)."""
+    name_index = defaultdict(lambda: defaultdict(list))
+    sequence_index = defaultdict(lambda: defaultdict(list))
+    for result in results:
+        path = result["file"]
+        for row, name in enumerate(result.get("names", []), start=1):
+            name_index[name][path].append(row)
+        for row, key in enumerate(result.get("sequence_keys", []), start=1):
+            sequence_index[key][path].append(row)
+    return name_index, sequence_index
+
+def _describe_conflicts(locations, path):
+    others = [f"{os.path.basename(other)} row {rows[0]}" for other, rows in locations.items() if other != path]
+    listed = ", ".join(others[:MAX_LISTED_CONFLICTS])
+    if len(others) > MAX_LISTED_CONFLICTS:
+        listed += f" and {len(others) - MAX_LISTED_CONFLICTS} more files"
+    return listed
+
+def find_cross_file_duplicates(results):
+    """Return error records for every RULE_NM or sequence key defined in more than one file."""
+    name_index, sequence_index = merge_indexes(results)
+    records = []
+    for code, index in (("RULE_SEQ_NR_DUPLICATE_ACROSS_FILES", sequence_index),
+                        ("RULE_NM_DUPLICATE_ACROSS_FILES", name_index)):
+        field, message = CROSS_FILE_ERROR_CODES[code]
+        for locations in index.values():
+            if len(locations) < 2:
+                continue
+            for path, rows in locations.items():
+                conflicts = _describe_conflicts(locations, path)
+                records.extend({"file": path, "row": row, "field": field, "error_code": code,
+                                "message": f"{message} Also in: {conflicts}"} for row in rows)
+    return records
+
+def unique_paths(paths):
+    """Paths in order, dropping any that resolve to a file already listed."""
+    unique = {}
+    for path in paths:
+        unique.setdefault(os.path.realpath(path), path)
+    return list(unique.values())
+
+def validate_files(paths, jobs=None, cross_file=True):
+    """Validate rule files in a pool of jobs worker processes; returns one result dict per file.
+
+    jobs=None uses every core and jobs=1 runs in this process. With
+    cross_file, collisions between files are added to each file's errors,
+    which stay ordered by row. A file listed more than once (e.g. by itself
+    and through its directory) is validated once.
+    """
+    paths = unique_paths(paths)
+    worker = partial(validate_file, with_keys=cross_file)
+    if jobs == 1 or len(paths) < 2:
+        results = [worker(path) for path in paths]
+    else:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(worker, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    if cross_file:
+        by_file = {result["file"]: result for result in results}
+        for record in find_cross_file_duplicates(results):
+            by_file[record["file"]]["errors"].append(record)
+        for result in results:
+            result.pop("names", None)
+            result.pop("sequence_keys", None)
+            result["errors"].sort(key=lambda record: record["row"])
+    return results
@@ -0,0 +1,187 @@
+"""Validate or normalise tilde-delimited rule files without Streamlit.
+
+    python -m dqc validate rules/ --report errors.json
+    python -m dqc validate rules/ --cross-file --jobs 8
+    python -m dqc normalize rules/*.csv --output-dir normalized/ --describe
+
+Run from the repository root (or with it on PYTHONPATH); Streamlit is not
+imported, and pandas only once files are read.
+
+Paths may be files or directories (scanned for *.csv and *.parquet).
+Exit status: 0 when every file is valid, 1 when validation errors were
+found, 2 when a file could not be read or the arguments are invalid.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from dqc.batch import unique_paths, validate_files
+from rule_generation import generate_rule_description
+
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_ERROR = 2
+
+RULE_FILE_EXTENSIONS = (".csv", ".parquet")
+REPORT_FIELDS = ["file", "row", "field", "error_code", "message"]
+
+def expand_paths(paths):
+    """Files as given, plus the rule files directly inside any directories, sorted; each file once."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith(RULE_FILE_EXTENSIONS)))
+        else:
+            files.append(path)
+    return unique_paths(files)
+
+def describe_rules(frame):
+    """Fill blank RULE_DSC_TXT values with the generated description."""
+    blank = frame["RULE_DSC_TXT"] == ""
+    frame.loc[blank, "RULE_DSC_TXT"] = [
+        generate_rule_description(row["RULE_NM"], row["RULE_VALID_METH_CD"], row["RULE_TRGT_ATTR_NM"], row["RULE_TRGT_OBJ_ID_TXT"])
+        for row in frame.loc[blank].to_dict("records")
+    ]
+    return frame
+
+def positive_int(value):
+    """argparse type for a count of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def output_path(path, output_dir=None):
+    """Where normalize writes a file: <name>.csv in output_dir, else next to the input."""
+    if output_dir:
+        return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".csv")
+    return os.path.splitext(path)[0] + ".csv"
+
+def output_collisions(paths, output_dir=None):
+    """{output: [inputs]} for every output path that more than one input would write."""
+    inputs = {}
+    for path in paths:
+        output = os.path.normcase(os.path.abspath(output_path(path, output_dir)))
+        inputs.setdefault(output, []).append(path)
+    return {output: sources for output, sources in inputs.items() if len(sources) > 1}
+
+def normalize_file(path, output_dir=None, describe=False):
+    """Rewrite one rule file as a normalised tilde CSV; returns a result dict."""
+    from rule_io import iter_rules_csv, read_rules_file
+
+    try:
+        frame = read_rules_file(path)
+    except Exception as e:
+        return {"file": path, "rules": 0, "output": None, "read_error": str(e)}
+    if describe:
+        frame = describe_rules(frame)
+    output = output_path(path, output_dir)
+    with open(output, "wb") as handle:
+        for chunk in iter_rules_csv(frame):
+            handle.write(chunk)
+    return {"file": path, "rules": len(frame), "output": output, "read_error": None}
+
+def write_report(results, report_path, report_format=None):
+    """Write validation results as JSON (per-file summary and errors) or CSV (one line per error)."""
+    report_format = report_format or ("csv" if report_path.lower().endswith(".csv") else "json")
+    with open(report_path, "w", newline="", encoding="utf-8") as handle:
+        if report_format == "csv":
+            writer = csv.DictWriter(handle, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for result in results:
+                writer.writerows(result["errors"])
+        else:
+            summary = {
+                "files": len(results),
+                "rules": sum(result["rules"] for result in results),
+                "errors": sum(len(result["errors"]) for result in results),
+                "unreadable_files": sum(1 for result in results if result["read_error"]),
+            }
+            json.dump({"summary": summary, "files": results}, handle, indent=2)
+
+def exit_status(results):
+    if any(result["read_error"] for result in results):
+        return EXIT_ERROR
+    if any(result.get("errors") for result in results):
+        return EXIT_INVALID
+    return EXIT_OK
+
+def print_summary(results, elapsed, out):
+    rules = sum(result["rules"] for result in results)
+    elapsed = max(elapsed, 1e-9)
+    print(f"{len(results)} files, {rules:,} rules in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.1f} files/s, {rules / elapsed:,.0f} rows/s)", file=out)
+
+def run_validate(args):
+    start = time.perf_counter()
+    results = validate_files(expand_paths(args.paths), jobs=args.jobs, cross_file=args.cross_file)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result["read_error"]:
+            print(f"{result['file']}: could not read file: {result['read_error']}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{result['file']}: {result['rules']:,} rules, {len(result['errors']):,} errors")
+    if args.report:
+        write_report(results, args.report, args.format)
+    if not args.quiet:
+        print_summary(results, elapsed, sys.stdout)
+    return exit_status(results)
+
+def run_normalize(args):
+    paths = expand_paths(args.paths)
+    # --in-place rewrites each input next to itself; otherwise --output-dir is required
+    output_dir = None if args.in_place else args.output_dir
+    collisions = output_collisions(paths, output_dir)
+    if collisions:
+        # Nothing is written: one input would silently overwrite another's output
+        for output, sources in collisions.items():
+            print(f"{output}: would be written by each of {', '.join(sources)}", file=sys.stderr)
+        return EXIT_ERROR
+    if not args.in_place:
+        os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    results = [normalize_file(path, output_dir, args.describe) for path in paths]
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result["read_error"]:
+            print(f"{result['file']}: could not read file: {result['read_error']}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{result['file']}: {result['rules']:,} rules -> {result['output']}")
+    if not args.quiet:
+        print_summary(results, elapsed, sys.stdout)
+    return exit_status(results)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m dqc", description="Validate or normalise DQC rule files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="validate rule files and report errors")
+    validate.add_argument("paths", nargs="+", help="rule files (.csv, .parquet) or directories")
+    validate.add_argument("--report", help="write an error report to this file (.json or .csv)")
+    validate.add_argument("--format", choices=["json", "csv"], help="report format (default: from the report extension)")
+    validate.add_argument("-j", "--jobs", type=positive_int, help="worker processes (default: one per core; 1 runs serially)")
+    validate.add_argument("--cross-file", action="store_true",
+                          help="also report RULE_NM and sequence-key duplicates between files, as if loaded into one table")
+    validate.add_argument("-q", "--quiet", action="store_true", help="only print unreadable files")
+    validate.set_defaults(run=run_validate)
+
+    normalize = commands.add_parser("normalize", help="rewrite rule files as normalised tilde CSVs")
+    normalize.add_argument("paths", nargs="+", help="rule files (.csv, .parquet) or directories")
+    destination = normalize.add_mutually_exclusive_group(required=True)
+    destination.add_argument("--output-dir", help="write the normalised files to this directory")
+    destination.add_argument("--in-place", action="store_true", help="overwrite the inputs (.parquet inputs get a .csv alongside)")
+    normalize.add_argument("--describe", action="store_true", help="fill blank RULE_DSC_TXT with generated descriptions")
+    normalize.add_argument("-q", "--quiet", action="store_true", help="only print unreadable files")
+    normalize.set_defaults(run=run_normalize)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.run(args)
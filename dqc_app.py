@@ -1,10 +1,20 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
-import csv
-import io
 from datetime import datetime
 from config import DEFAULT_VALUES, FIELDS, get_current_timestamp
+from rule_io import INGEST_CHUNK_SIZE, iter_rule_chunks, normalize_editor_frame, normalize_editor_values, iter_rules_csv, read_rules_parquet, rules_to_parquet
+from profiling import StageProfiler, runs_to_jsonl
+from rule_search import SEARCH_LIMIT, RuleSearchIndex
+from rule_store import RuleStore, to_rule_schema
+from validation_jobs import ValidationJob
 from validation import (
+    RuleValidationIndex,
+    error_report,
+    sort_errors,
+    tidy_errors,
+    validate_dataframe,
     validate_single_row,
     validate_rule_abort_ind,
     validate_rule_trgt_attr_nm,
@@ -14,6 +24,9 @@ from validation import (
     validate_rule_name_matches_standards
 )
 from rule_generation import (
+    AUTO_FIX_FIELDS,
+    auto_fix_changes,
+    auto_fix_frame,
     generate_rule_name,
     generate_rule_description,
     update_all_auto_fields,
@@ -30,8 +43,328 @@ st.set_page_config(
 )
 
 # Initialize session state
-if 'rows' not in st.session_state:
-    st.session_state.rows = []
+if 'rules' not in st.session_state:
+    st.session_state.rules = RuleStore()
+if 'profiler' not in st.session_state:
+    # Opt-in stage timings: the sidebar toggle, or DQC_PROFILE=1 to start with it on
+    st.session_state.profiler = StageProfiler(enabled=os.environ.get("DQC_PROFILE") == "1")
+    st.session_state.profile_runs = []
+profiler = st.session_state.profiler
+MAX_PROFILE_RUNS = 200  # rerun timings kept for the JSON-lines download
+
+def get_validation_index():
+    """Return the incremental validation index, rebuilding it if the rulebook changed under it."""
+    rules = st.session_state.rules
+    index = st.session_state.get("validation_index")
+    if index is None or index.version != rules.version:
+        index = RuleValidationIndex.from_frame(rules.frame)
+        index.version = rules.version
+        st.session_state.validation_index = index
+    return index
+
+def get_search_index():
+    """Return the rule search index, rebuilding it if the rulebook changed under it."""
+    rules = st.session_state.rules
+    index = st.session_state.get("search_index")
+    if index is None or index.version != rules.version:
+        index = RuleSearchIndex(rules.frame)
+        index.version = rules.version
+        st.session_state.search_index = index
+    return index
+
+def use_sequence_number(sequence_number):
+    st.session_state.form_rule_seq_nr = sequence_number
+
+# Validate All runs in a worker thread; a run that finishes within INLINE_VALIDATION_WAIT
+# seconds is reported in the same rerun, a longer one is polled every VALIDATION_POLL_SECONDS
+INLINE_VALIDATION_WAIT = 0.5
+VALIDATION_POLL_SECONDS = 0.5
+ERROR_PAGE_SIZES = [50, 200, 1000]
+
+# The rules editor shows one window of the rulebook, filtered and sorted on the server
+EDITOR_FILTER_FIELDS = ["APPL_CD", "RULE_VALID_METH_CD", "RULE_TRGT_DB_NM", "RULE_TRGT_DATA_LAYER_NM",
+                        "RULE_VALID_CTGY_NM", "RULE_ACTV_IND"]
+EDITOR_SEARCH_FIELDS = ["RULE_NM", "RULE_TRGT_OBJ_ID_TXT"]
+EDITOR_PAGE_SIZES = [100, 500, 2000]
+RULEBOOK_ORDER = "(rulebook order)"
+
+@st.cache_resource
+def get_validation_executor():
+    """Worker threads for background validation, shared by every session of this server."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="dqc-validate")
+
+def get_validation_job():
+    """Return the running Validate All job, cancelling it if the rules changed since it was started."""
+    job = st.session_state.get("validation_job")
+    if job is not None and job.version != st.session_state.rules.version:
+        job.cancel()
+        del st.session_state.validation_job
+        job = None
+    return job
+
+def replace_rules(store):
+    """Make store the session's rulebook, dropping the previous one's error reports and their table state."""
+    st.session_state.rules = store
+    for name in ("all_validation_errors", "auto_validation_errors", "validation_status"):
+        st.session_state.pop(name, None)
+    # Filters and page of the error tables (see show_error_report) index the old report
+    for key in ("all_errors", "auto_errors"):
+        st.session_state.pop(f"{key}_page", None)
+        st.session_state.pop(f"{key}_codes", None)
+
+def finish_validation_job(job):
+    """Store a finished Validate All job's errors for display, as the synchronous check did."""
+    st.session_state.pop("validation_job", None)
+    if job.exception() is not None:
+        st.session_state.validation_status = ("failed", str(job.exception()))
+        return
+    all_errors = job.errors()
+    if len(all_errors):
+        # Store validation errors in session state for display
+        st.session_state.all_validation_errors = error_report(all_errors, st.session_state.rules.frame["RULE_NM"])
+        st.session_state.validation_status = ("errors", None)
+    else:
+        st.session_state.validation_status = ("valid", None)
+        # Clear any previous validation errors
+        if 'all_validation_errors' in st.session_state:
+            del st.session_state.all_validation_errors
+        if 'auto_validation_errors' in st.session_state:
+            del st.session_state.auto_validation_errors
+
+@st.fragment(run_every=VALIDATION_POLL_SECONDS)
+def show_validation_progress():
+    """Poll the background Validate All job: progress, cancel, and the errors found so far."""
+    job = get_validation_job()
+    if job is None:
+        return
+    if job.done:
+        finish_validation_job(job)
+        st.rerun()
+    if job.checking_duplicates:
+        text = f"Checked {job.total:,} rules, checking for duplicates... {job.error_count:,} errors so far"
+    else:
+        text = f"Validating... {job.rows_checked:,} of {job.total:,} rules checked, {job.error_count:,} errors so far"
+    st.progress(job.rows_checked / max(job.total, 1), text=text)
+    if st.button("✖️ Cancel Validation"):
+        job.cancel()
+        del st.session_state.validation_job
+        st.rerun()
+    if job.error_count:
+        show_error_report(error_report(job.errors(), st.session_state.rules.frame["RULE_NM"]),
+                          "Validation Errors Found So Far", key="streamed_errors")
+
+def show_error_report(report, title, key):
+    """Show an error_report as one filterable, paginated table with counts by error code and a CSV download.
+
+    Only the current page is sent to the browser, so the cost of a rerun
+    does not grow with the number of errors shown.
+    """
+    st.markdown('<div class="validation-error">', unsafe_allow_html=True)
+    st.error(f"**❌ {title}:** {len(report):,} errors in {report['row'].nunique():,} rules")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    col_counts, col_filters = st.columns([1, 2])
+    with col_counts:
+        counts = report.groupby(["error_code", "field"], sort=False).size().rename("errors").reset_index()
+        st.dataframe(counts.sort_values("errors", ascending=False), hide_index=True, use_container_width=True)
+    with col_filters:
+        codes = st.multiselect("Error codes", counts["error_code"].tolist(), key=f"{key}_codes",
+                               placeholder="All error codes")
+        search = st.text_input("Search RULE_NM or message", key=f"{key}_search").strip()
+        page_size = st.selectbox("Errors per page", ERROR_PAGE_SIZES, key=f"{key}_page_size")
+
+    shown = report
+    if codes:
+        shown = shown[shown["error_code"].isin(codes)]
+    if search:
+        shown = shown[shown["RULE_NM"].str.contains(search, case=False, regex=False)
+                      | shown["message"].str.contains(search, case=False, regex=False)]
+    pages = max(1, -(-len(shown) // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        # The filters leave fewer pages than the page last viewed
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    st.dataframe(shown.iloc[start:start + page_size], hide_index=True, use_container_width=True,
+                 column_config={"row": st.column_config.NumberColumn("Row #", format="%d")})
+    filtered = f" (filtered from {len(report):,})" if len(shown) < len(report) else ""
+    st.caption(f"Showing {min(start + 1, len(shown)):,}-{min(start + page_size, len(shown)):,} of {len(shown):,} errors{filtered}.")
+    st.download_button(
+        label="📥 Download all errors (CSV)",
+        data=lambda: report.to_csv(index=False).encode("utf-8"),
+        file_name="dqc_validation_errors.csv",
+        mime="text/csv",
+        key=f"{key}_download",
+    )
+
+EXPORT_FORMATS = {
+    "csv": lambda frame: b"".join(iter_rules_csv(frame)),
+    "parquet": rules_to_parquet,
+}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_export(_frame, version, export_format):
+    """Export of one rulebook version, built at most once per version and format.
+
+    Runs on Streamlit's download thread when a download button is clicked, so
+    it only reads the frame snapshot it is given (keyed by its version) and
+    never touches session state or the profiler.
+    """
+    return EXPORT_FORMATS[export_format](_frame)
+
+@st.cache_resource
+def get_column_config():
+    """Column configuration for the rules editor; static, so built once per server process."""
+    return {
+        "Row #": st.column_config.NumberColumn("Row #", disabled=True, width="small"),
+        "DATA_QC_ID": st.column_config.TextColumn("DATA_QC_ID", disabled=True),
+        "APPL_CD": st.column_config.TextColumn("APPL_CD", required=True),
+        "RULE_NM": st.column_config.TextColumn("RULE_NM", required=True),
+        "RULE_DSC_TXT": st.column_config.TextColumn("RULE_DSC_TXT", width="large"),
+        "RULE_FREQ_CD": st.column_config.TextColumn("RULE_FREQ_CD", disabled=True),
+        "RULE_VALID_CTGY_NM": st.column_config.SelectboxColumn(
+            "RULE_VALID_CTGY_NM",
+            options=FIELDS["RULE_VALID_CTGY_NM"],
+            required=True
+        ),
+        "RULE_VALID_METH_CD": st.column_config.SelectboxColumn(
+            "RULE_VALID_METH_CD",
+            options=FIELDS["RULE_VALID_METH_CD"],
+            required=True
+        ),
+        "RULE_ABORT_IND": st.column_config.SelectboxColumn(
+            "RULE_ABORT_IND",
+            options=FIELDS["RULE_ABORT_IND"],
+            required=True
+        ),
+        "RULE_SRC_DB_NM": st.column_config.SelectboxColumn(
+            "RULE_SRC_DB_NM",
+            options=FIELDS["RULE_SRC_DB_NM"],
+            required=True
+        ),
+        "RULE_SRC_SCHM_NM": st.column_config.SelectboxColumn(
+            "RULE_SRC_SCHM_NM",
+            options=FIELDS["RULE_SRC_SCHM_NM"],
+            required=True
+        ),
+        "RULE_SRC_OBJ_ID_TXT": st.column_config.TextColumn("RULE_SRC_OBJ_ID_TXT"),
+        "RULE_SRC_ATTR_NM": st.column_config.TextColumn("RULE_SRC_ATTR_NM"),
+        "RULE_TRGT_DB_NM": st.column_config.SelectboxColumn(
+            "RULE_TRGT_DB_NM",
+            options=FIELDS["RULE_TRGT_DB_NM"],
+            required=True
+        ),
+        "RULE_TRGT_SCHM_NM": st.column_config.SelectboxColumn(
+            "RULE_TRGT_SCHM_NM",
+            options=FIELDS["RULE_TRGT_SCHM_NM"],
+            required=True
+        ),
+        "RULE_TRGT_OBJ_ID_TXT": st.column_config.TextColumn("RULE_TRGT_OBJ_ID_TXT"),
+        "RULE_TRGT_ATTR_NM": st.column_config.TextColumn("RULE_TRGT_ATTR_NM"),
+        "RULE_ACPT_VARY_PCT": st.column_config.TextColumn("RULE_ACPT_VARY_PCT"),
+        "RULE_MIN_THRESH_VALUE_TXT": st.column_config.TextColumn("RULE_MIN_THRESH_VALUE_TXT"),
+        "RULE_MAX_THRESH_VALUE_TXT": st.column_config.TextColumn("RULE_MAX_THRESH_VALUE_TXT"),
+        "RULE_TRGT_DATA_LAYER_NM": st.column_config.SelectboxColumn(
+            "RULE_TRGT_DATA_LAYER_NM",
+            options=FIELDS["RULE_TRGT_DATA_LAYER_NM"],
+            required=True
+        ),
+        "RULE_CDE_IND": st.column_config.TextColumn("RULE_CDE_IND", disabled=True),
+        "RULE_LOGIC_TXT": st.column_config.TextColumn("RULE_LOGIC_TXT", width="large"),
+        "RULE_EFF_DT": st.column_config.DateColumn("RULE_EFF_DT"),
+        "RULE_EXP_DT": st.column_config.DateColumn("RULE_EXP_DT"),
+        "RULE_ACTV_IND": st.column_config.SelectboxColumn(
+            "RULE_ACTV_IND",
+            options=FIELDS["RULE_ACTV_IND"],
+            required=True
+        ),
+        "RULE_RMRK_TXT": st.column_config.TextColumn("RULE_RMRK_TXT"),
+        "CREA_PRTY_ID": st.column_config.TextColumn("CREA_PRTY_ID", disabled=True),
+        "CREA_TS": st.column_config.TextColumn("CREA_TS", disabled=True),
+        "UPDT_PRTY_ID": st.column_config.TextColumn("UPDT_PRTY_ID", disabled=True),
+        "UPDT_TS": st.column_config.TextColumn("UPDT_TS", disabled=True),
+        "ETL_CREA_NR": st.column_config.TextColumn("ETL_CREA_NR", disabled=True),
+        "ETL_CREA_TS": st.column_config.TextColumn("ETL_CREA_TS", disabled=True),
+        "ETL_UPDT_NR": st.column_config.TextColumn("ETL_UPDT_NR", disabled=True),
+        "ETL_UPDT_TS": st.column_config.TextColumn("ETL_UPDT_TS", disabled=True),
+        "ASSET_ID": st.column_config.TextColumn("ASSET_ID", disabled=True),
+        "ASSET_NM": st.column_config.TextColumn("ASSET_NM"),
+        "RULE_SEQ_NR": st.column_config.SelectboxColumn(
+            "RULE_SEQ_NR",
+            options=FIELDS["RULE_SEQ_NR"],
+            required=True
+        ),
+    }
+
+def get_editor_view(rules, filters, contains, sort_by, ascending):
+    """Row ids of the editor window's rules, recomputed only when the rules or the view settings change."""
+    signature = (rules.version, repr(filters), repr(contains), sort_by, ascending)
+    cached = st.session_state.get("editor_view")
+    if cached is None or cached[0] != signature:
+        cached = (signature, rules.select(filters, contains, sort_by, ascending))
+        st.session_state.editor_view = cached
+    return cached[1]
+
+def show_editor_view_controls(rules):
+    """Filter, sort and page controls for the rules editor; returns the row ids of the page to edit."""
+    with st.expander("🔎 Filter, sort and page the rules", expanded=False):
+        columns = st.columns(3)
+        filters = {}
+        for number, field in enumerate(EDITOR_FILTER_FIELDS):
+            options = [value for value in rules.frame[field].cat.categories if value != ""]
+            filters[field] = columns[number % 3].multiselect(field, options, key=f"editor_filter_{field}",
+                                                             placeholder="All")
+        contains = {field: columns[number % 3].text_input(f"{field} contains", key=f"editor_search_{field}").strip()
+                    for number, field in enumerate(EDITOR_SEARCH_FIELDS)}
+        sort_by = columns[2].selectbox("Sort by", [RULEBOOK_ORDER] + list(FIELDS), key="editor_sort_by")
+        ascending = not columns[2].toggle("Descending", key="editor_sort_descending")
+        page_size = columns[0].selectbox("Rules per page", EDITOR_PAGE_SIZES, index=1, key="editor_page_size")
+
+    view = get_editor_view(rules, filters, contains, None if sort_by == RULEBOOK_ORDER else sort_by, ascending)
+    pages = max(1, -(-len(view) // page_size))
+    if st.session_state.get("editor_page", 1) > pages:
+        st.session_state.editor_page = pages
+    col_page, col_caption = st.columns([1, 3])
+    page = col_page.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key="editor_page")
+    start = (page - 1) * page_size
+    page_ids = view[start:start + page_size]
+    matching = f"{len(view):,} matching rules of {len(rules):,}" if len(view) < len(rules) else f"{len(rules):,} rules"
+    col_caption.caption(f"Editing rules {min(start + 1, len(view)):,}-{start + len(page_ids):,} of {matching}. "
+                        "Only this page is sent to the browser; added rows go to the end of the rulebook.")
+    return page_ids
+
+def apply_editor_changes():
+    """Apply the rules editor's edited/added/deleted row deltas and re-validate only what they touch."""
+    with st.session_state.profiler.stage("editor.apply"):
+        rules = st.session_state.rules
+        index = get_validation_index()
+        changes = st.session_state["rules_editor"]
+        row_ids = st.session_state.editor_row_ids
+
+        removed = [row_ids[position] for position in changes.get("deleted_rows", [])]
+        changed = []
+        for position, values in changes.get("edited_rows", {}).items():
+            row_id = row_ids[int(position)]
+            if row_id not in removed:
+                rules.update(row_id, normalize_editor_values(values))
+                changed.append(row_id)
+        if removed:
+            rules.delete(removed)
+        if changes.get("added_rows"):
+            changed.extend(rules.extend(normalize_editor_frame(pd.DataFrame(changes["added_rows"]))))
+
+        index.apply({row_id: rules.get(row_id) for row_id in changed}, removed)
+        index.version = rules.version
+        if index.errors:
+            st.session_state.auto_validation_errors = error_report(index.error_frame(rules.row_ids), rules.frame["RULE_NM"])
+            st.session_state.editor_status = "errors"
+        else:
+            st.session_state.editor_status = "valid"
+            # Clear any previous validation errors
+            if 'auto_validation_errors' in st.session_state:
+                del st.session_state.auto_validation_errors
+            if 'all_validation_errors' in st.session_state:
+                del st.session_state.all_validation_errors
 
 # CSS for styling and instant uppercase conversion
 st.markdown("""
@@ -86,6 +419,12 @@ st.sidebar.markdown("""
    - Real-time validation feedback
 """)
 
+# Opt-in per-stage timings for each rerun; the panel is filled in at the end of the script
+profile_enabled = st.sidebar.checkbox("⏱️ Profile reruns", value=profiler.enabled,
+                                      help="Record wall time, call counts and peak memory of each stage of every rerun")
+profiler.set_enabled(profile_enabled)
+profile_panel = st.sidebar.container()
+
 # Main title
 st.title("Data Quality Control Rules Manager")
 
@@ -95,33 +434,43 @@ st.title("Data Quality Control Rules Manager")
 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 st.header("📂 Upload Existing Rules")
 
-uploaded_file = st.file_uploader("Choose a CSV file", type="csv", help="Limit 200MB per file • CSV with tilde (~) delimiter")
+uploaded_file = st.file_uploader("Choose a CSV or Parquet file", type=["csv", "parquet"],
+                                 help="Limit 200MB per file • CSV with tilde (~) delimiter, or a Parquet rulebook exported by this app")
 
-if uploaded_file is not None:
+# Ingest each uploaded file once, not on every rerun while it sits in the uploader
+if uploaded_file is not None and st.session_state.get("uploaded_file_id") != uploaded_file.file_id:
     try:
-        # Read CSV with tilde delimiter
-        df = pd.read_csv(uploaded_file, delimiter='~')
-        
-        # Convert to list of dictionaries and ensure uppercase
-        uploaded_rows = []
-        for _, row in df.iterrows():
-            rule_dict = {}
-            for field in FIELDS.keys():
-                value = str(row.get(field, "")) if pd.notna(row.get(field, "")) else ""
-                # Convert text fields to uppercase
-                if field in ["APPL_CD", "RULE_NM", "RULE_DSC_TXT", "RULE_SRC_OBJ_ID_TXT", 
-                             "RULE_TRGT_SCHM_NM", "RULE_TRGT_OBJ_ID_TXT", "RULE_TRGT_ATTR_NM", "RULE_LOGIC_TXT"]:
-                    value = value.upper()
-                rule_dict[field] = value
-            uploaded_rows.append(rule_dict)
-
-        st.session_state.rows = uploaded_rows
-        # Store original data for reset functionality
-        st.session_state.original_rows = uploaded_rows.copy()
-        st.success(f"✅ Successfully uploaded {len(uploaded_rows)} records")
+        with profiler.stage("upload.ingest"):
+            if uploaded_file.name.lower().endswith(".parquet"):
+                # Parquet is already typed: load it in one go and validate the whole rulebook
+                replace_rules(RuleStore(to_rule_schema(read_rules_parquet(uploaded_file))))
+                error_frames = [validate_dataframe(st.session_state.rules.frame.reset_index(drop=True))]
+            else:
+                # Stream the tilde file in chunks: normalise and validate each chunk as it arrives,
+                # and append it to the store, so only one chunk is held at a time
+                progress = st.progress(0.0, text="Reading rules...")
+                rules = RuleStore()
+                error_frames = []
+                for chunk in iter_rule_chunks(uploaded_file, chunksize=INGEST_CHUNK_SIZE):
+                    error_frames.append(validate_dataframe(chunk, check_duplicates=False))
+                    rules.extend(chunk)
+                    issues = sum(len(errors) for errors in error_frames)
+                    progress.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0),
+                                      text=f"Read {len(rules):,} rules, {issues:,} validation issues so far")
+                progress.empty()
+
+                replace_rules(rules)
+                error_frames.append(validate_dataframe(rules.frame.reset_index(drop=True), check_rows=False))
+        st.session_state.uploaded_file_id = uploaded_file.file_id
+        st.success(f"✅ Successfully uploaded {len(st.session_state.rules)} records")
+
+        upload_errors = sort_errors(pd.concat(error_frames))
+        if len(upload_errors):
+            st.session_state.all_validation_errors = error_report(upload_errors, st.session_state.rules.frame["RULE_NM"])
+            st.warning(f"⚠️ {len(upload_errors):,} validation issues found in the uploaded rules. See below for details.")
 
     except Exception as e:
-        st.error(f"Error reading CSV file: {str(e)}")
+        st.error(f"Error reading rules file: {str(e)}")
 
 # ============================================================================
 # SECTION 2: ADD NEW RULE
@@ -208,6 +557,23 @@ with col1:
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.selectbox("RULE_SEQ_NR", FIELDS["RULE_SEQ_NR"], key="form_rule_seq_nr")
+    
+    # Sequence numbers already taken for this target table and category, from the search index
+    target_object = st.session_state.form_rule_trgt_obj_id_txt
+    category = st.session_state.form_rule_valid_ctgy_nm
+    search_index = get_search_index()
+    used_sequence_numbers = search_index.used_sequence_numbers(target_object, category)
+    next_sequence_number = search_index.next_free_sequence_number(target_object, category)
+    if used_sequence_numbers:
+        used = ", ".join(sorted(used_sequence_numbers, key=lambda value: (len(value), value)))
+        st.caption(f"Used for {target_object} / {category}: {used}")
+    if st.session_state.form_rule_seq_nr in used_sequence_numbers:
+        st.warning(f"RULE_SEQ_NR {st.session_state.form_rule_seq_nr} is already used for {target_object} / {category}.")
+    if next_sequence_number is None:
+        st.warning(f"All RULE_SEQ_NR values are used for {target_object} / {category}.")
+    elif next_sequence_number != st.session_state.form_rule_seq_nr:
+        st.button(f"Use next free RULE_SEQ_NR: {next_sequence_number}", on_click=use_sequence_number,
+                  args=(next_sequence_number,))
 
 with col2:
     # RULE_TRGT_DB_NM - triggers rule name update
@@ -317,17 +683,20 @@ if st.button("➕ Add Rule", use_container_width=True, type="primary"):
         "RULE_SEQ_NR": st.session_state.form_rule_seq_nr
     }
 
-    # Validate the rule
-    validation_errors = validate_single_row(form_data, st.session_state.rows, is_new_row=True)
+    # Validate the rule against the uniqueness indexes instead of every rule's records
+    with profiler.stage("add_rule.validate"):
+        index = get_validation_index()
+        validation_errors = index.check_new_row(form_data)
     
     if validation_errors:
         # Store validation errors in session state for display
         st.session_state.validation_errors = validation_errors
     else:
-        st.session_state.rows.append(form_data)
-        # Store original data for reset functionality if this is the first rule
-        if len(st.session_state.rows) == 1 and 'original_rows' not in st.session_state:
-            st.session_state.original_rows = st.session_state.rows.copy()
+        rules = st.session_state.rules
+        row_id = rules.append(form_data)
+        # Keep the validation index current instead of rebuilding it on the next edit
+        index.apply({row_id: rules.get(row_id)})
+        index.version = rules.version
         st.success("✅ Rule added successfully!")
         # Clear any previous validation errors
         if 'validation_errors' in st.session_state:
@@ -338,9 +707,9 @@ if st.button("➕ Add Rule", use_container_width=True, type="primary"):
 if 'validation_errors' in st.session_state:
     st.markdown('<div class="validation-error">', unsafe_allow_html=True)
     st.error("**❌ Validation Errors:**")
-    for error in st.session_state.validation_errors:
-        st.error(f"• {error}")
     st.markdown('</div>', unsafe_allow_html=True)
+    new_rule_errors = tidy_errors((0, error) for error in st.session_state.validation_errors)
+    st.dataframe(new_rule_errors[["field", "error_code", "message"]], hide_index=True, use_container_width=True)
 
 # ============================================================================
 # SECTION 3: VIEW & EDIT RULES
@@ -348,12 +717,16 @@ if 'validation_errors' in st.session_state:
 st.markdown('<div class="section-divider"></div>', unsafe_allow_html=True)
 st.header("📋 View & Edit Rules")
 
-if not st.session_state.rows:
+# Cancel a background Validate All whose rules have changed since (edits, uploads, deletions)
+get_validation_job()
+
+if not len(st.session_state.rules):
     st.info("🔍 No rules available. Please upload a CSV file or add new rules above.")
 else:
     # Summary statistics
-    total_rules = len(st.session_state.rows)
-    active_rules = len([r for r in st.session_state.rows if r.get("RULE_ACTV_IND") == "Y"])
+    rules = st.session_state.rules
+    total_rules = len(rules)
+    active_rules = int((rules.frame["RULE_ACTV_IND"] == "Y").sum())
     
     col_stats1, col_stats2, col_stats3 = st.columns(3)
     with col_stats1:
@@ -368,211 +741,167 @@ else:
 
     with col_validate:
         if st.button("🔍 Validate All Rules", use_container_width=True):
-            all_errors = []
-            for i, row in enumerate(st.session_state.rows):
-                errors = validate_single_row(row, st.session_state.rows, is_new_row=False)
-                if errors:
-                    all_errors.extend([f"Row {i+1}: {error}" for error in errors])
-            
-            if all_errors:
-                # Store validation errors in session state for display
-                st.session_state.all_validation_errors = all_errors
-                st.error("❌ Validation errors found!")
+            previous_job = get_validation_job()
+            if previous_job is not None:
+                previous_job.cancel()
+            with profiler.stage("validate_all"):
+                job = ValidationJob(rules.frame.reset_index(drop=True), rules.version).submit(get_validation_executor())
+                finished = job.wait(INLINE_VALIDATION_WAIT)
+            if finished:
+                finish_validation_job(job)
             else:
-                st.success("✅ All rules are valid!")
-                # Clear any previous validation errors
+                # Keep working while it runs: show_validation_progress polls the job below
+                st.session_state.validation_job = job
                 if 'all_validation_errors' in st.session_state:
                     del st.session_state.all_validation_errors
-                if 'auto_validation_errors' in st.session_state:
-                    del st.session_state.auto_validation_errors
+        
+        status, detail = st.session_state.pop("validation_status", (None, None))
+        if status == "errors":
+            st.error("❌ Validation errors found!")
+        elif status == "valid":
+            st.success("✅ All rules are valid!")
+        elif status == "failed":
+            st.error(f"Validation failed: {detail}")
 
     with col_download:
-        # Generate CSV download
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter='~')
-        
-        # Write header
-        writer.writerow(FIELDS.keys())
-        
-        # Write data
-        for row in st.session_state.rows:
-            writer.writerow([row.get(field, "") for field in FIELDS.keys()])
-        
-        csv_content = output.getvalue()
+        # Downloads are serialised only when clicked and then reused until the rules change;
+        # the snapshot is taken here, in the script run, and the store never changes a frame it handed out
+        frame, version = rules.frame, rules.version
         
         # Generate filename
-        appl_cd = st.session_state.rows[0].get("APPL_CD", "EMM").replace(" ", "_")
-        filename = f"DATA_QC_RULE_INFO_{appl_cd}.csv"
+        appl_cd = str(rules.frame["APPL_CD"].iloc[0]).replace(" ", "_")
+        filename = f"DATA_QC_RULE_INFO_{appl_cd}"
         
         st.download_button(
             label="📥 Download CSV",
-            data=csv_content,
-            file_name=filename,
+            data=lambda: build_export(frame, version, "csv"),
+            file_name=f"{filename}.csv",
             mime="text/csv",
             use_container_width=True
         )
+        st.download_button(
+            label="📦 Download Parquet",
+            data=lambda: build_export(frame, version, "parquet"),
+            file_name=f"{filename}.parquet",
+            mime="application/vnd.apache.parquet",
+            help="Compact typed copy of the rulebook for reloading here; use the CSV for the downstream loader",
+            use_container_width=True
+        )
 
+    # Progress and partial errors of a Validate All still running in the background
+    if get_validation_job() is not None:
+        show_validation_progress()
+    
     # Display validation errors for all rules validation
     if 'all_validation_errors' in st.session_state:
-        st.markdown('<div class="validation-error">', unsafe_allow_html=True)
-        st.error("**❌ Validation Errors Found:**")
-        for error in st.session_state.all_validation_errors:
-            st.error(f"• {error}")
-        st.markdown('</div>', unsafe_allow_html=True)
+        show_error_report(st.session_state.all_validation_errors, "Validation Errors Found", key="all_errors")
+    
+    # Bulk auto-fix: re-derive the fields the Add Rule form fills in, for every rule
+    with st.expander("🛠️ Auto-fix Derived Fields"):
+        st.caption("Recomputes RULE_ABORT_IND, RULE_TRGT_ATTR_NM, RULE_NM and RULE_DSC_TXT for every rule the same way "
+                   "the Add Rule form does. Names that need a manual choice, such as (STG|INFO), are left as they are.")
+        if st.button("🔎 Preview Auto-fix", use_container_width=True):
+            with profiler.stage("auto_fix.preview"):
+                fixed = auto_fix_frame(rules.frame)
+                st.session_state.auto_fix = {
+                    "version": rules.version,
+                    "fixed": fixed[AUTO_FIX_FIELDS],
+                    "changes": auto_fix_changes(rules.frame, fixed),
+                }
+        
+        auto_fix = st.session_state.get("auto_fix")
+        if auto_fix is not None and auto_fix["version"] != rules.version:
+            # The rules changed since the preview was computed
+            del st.session_state.auto_fix
+            auto_fix = None
+        if auto_fix is not None:
+            changes = auto_fix["changes"]
+            if len(changes) == 0:
+                st.success("✅ All derived fields are already up to date.")
+            else:
+                counts = changes["field"].value_counts().reindex(AUTO_FIX_FIELDS, fill_value=0)
+                st.info(f"Auto-fix would change {len(changes):,} values in {changes['row'].nunique():,} rules.")
+                st.dataframe(counts.rename("Values changed").to_frame(), use_container_width=True)
+                positions = rules.row_ids.get_indexer(changes["row"])
+                preview = changes.head(1000).assign(row=positions[:1000] + 1).rename(columns={"row": "Row #"})
+                st.dataframe(preview, use_container_width=True, hide_index=True)
+                if len(changes) > len(preview):
+                    st.caption(f"Showing the first {len(preview):,} of {len(changes):,} changes.")
+                if st.button("✅ Apply Auto-fix", type="primary", use_container_width=True):
+                    rules.update_columns(auto_fix["fixed"].loc[changes["row"].unique()])
+                    del st.session_state.auto_fix
+                    validation_errors = validate_dataframe(rules.frame.reset_index(drop=True))
+                    if len(validation_errors):
+                        st.session_state.all_validation_errors = error_report(validation_errors, rules.frame["RULE_NM"])
+                    elif 'all_validation_errors' in st.session_state:
+                        del st.session_state.all_validation_errors
+                    if 'auto_validation_errors' in st.session_state:
+                        del st.session_state.auto_validation_errors
+                    st.rerun()
+    
+    # Rule search: text in RULE_NM/RULE_LOGIC_TXT and exact target table, answered from the search index
+    with st.expander("🔍 Find Rules"):
+        col_text, col_mode, col_target = st.columns([3, 1, 2])
+        search_text = col_text.text_input("Search RULE_NM and RULE_LOGIC_TXT", key="rule_search_text").strip()
+        search_mode = col_mode.radio("Match", ["Contains", "Starts with"], key="rule_search_mode")
+        search_target = col_target.text_input("RULE_TRGT_OBJ_ID_TXT is", key="rule_search_target").strip().upper()
+        if search_text or search_target:
+            search_index = get_search_index()
+            if search_text:
+                search = search_index.search if search_mode == "Contains" else search_index.prefix
+                found = search(search_text, limit=None if search_target else SEARCH_LIMIT)
+            if search_target:
+                by_target = search_index.lookup("RULE_TRGT_OBJ_ID_TXT", search_target)
+                found = found.intersection(by_target, sort=False) if search_text else by_target
+            found = found[:SEARCH_LIMIT]
+            if len(found):
+                results = rules.frame.loc[found, ["RULE_NM", "RULE_TRGT_OBJ_ID_TXT", "RULE_VALID_CTGY_NM", "RULE_SEQ_NR",
+                                                  "RULE_VALID_METH_CD", "RULE_TRGT_DB_NM", "RULE_TRGT_DATA_LAYER_NM",
+                                                  "RULE_LOGIC_TXT"]]
+                results.insert(0, "Row #", rules.row_ids.get_indexer(found) + 1)
+                st.dataframe(results, hide_index=True, use_container_width=True)
+                if len(found) == SEARCH_LIMIT:
+                    st.caption(f"Showing the first {SEARCH_LIMIT} matching rules; refine the search to narrow them down.")
+            else:
+                st.info("No matching rules.")
     
     # Editable data table
     st.subheader("📊 Complete Rules Overview (Click to Edit)")
     
-    if len(st.session_state.rows) > 0:
-        # Create editable interface using st.data_editor
-        df = pd.DataFrame(st.session_state.rows)
-        
-        # Convert date columns to datetime.date for Streamlit compatibility
-        for date_col in ["RULE_EFF_DT", "RULE_EXP_DT"]:
-            if date_col in df.columns:
-                df[date_col] = pd.to_datetime(df[date_col], errors="coerce").dt.date
-        
-        # Define column configuration for better editing experience
-        column_config = {
-            "Row #": st.column_config.NumberColumn("Row #", disabled=True, width="small"),
-            "DATA_QC_ID": st.column_config.TextColumn("DATA_QC_ID", disabled=True),
-            "APPL_CD": st.column_config.TextColumn("APPL_CD", required=True),
-            "RULE_NM": st.column_config.TextColumn("RULE_NM", required=True),
-            "RULE_DSC_TXT": st.column_config.TextColumn("RULE_DSC_TXT", width="large"),
-            "RULE_FREQ_CD": st.column_config.TextColumn("RULE_FREQ_CD", disabled=True),
-            "RULE_VALID_CTGY_NM": st.column_config.SelectboxColumn(
-                "RULE_VALID_CTGY_NM",
-                options=FIELDS["RULE_VALID_CTGY_NM"],
-                required=True
-            ),
-            "RULE_VALID_METH_CD": st.column_config.SelectboxColumn(
-                "RULE_VALID_METH_CD",
-                options=FIELDS["RULE_VALID_METH_CD"],
-                required=True
-            ),
-            "RULE_ABORT_IND": st.column_config.SelectboxColumn(
-                "RULE_ABORT_IND",
-                options=FIELDS["RULE_ABORT_IND"],
-                required=True
-            ),
-            "RULE_SRC_DB_NM": st.column_config.SelectboxColumn(
-                "RULE_SRC_DB_NM",
-                options=FIELDS["RULE_SRC_DB_NM"],
-                required=True
-            ),
-            "RULE_SRC_SCHM_NM": st.column_config.SelectboxColumn(
-                "RULE_SRC_SCHM_NM",
-                options=FIELDS["RULE_SRC_SCHM_NM"],
-                required=True
-            ),
-            "RULE_SRC_OBJ_ID_TXT": st.column_config.TextColumn("RULE_SRC_OBJ_ID_TXT"),
-            "RULE_SRC_ATTR_NM": st.column_config.TextColumn("RULE_SRC_ATTR_NM"),
-            "RULE_TRGT_DB_NM": st.column_config.SelectboxColumn(
-                "RULE_TRGT_DB_NM",
-                options=FIELDS["RULE_TRGT_DB_NM"],
-                required=True
-            ),
-            "RULE_TRGT_SCHM_NM": st.column_config.SelectboxColumn(
-                "RULE_TRGT_SCHM_NM",
-                options=FIELDS["RULE_TRGT_SCHM_NM"],
-                required=True
-            ),
-            "RULE_TRGT_OBJ_ID_TXT": st.column_config.TextColumn("RULE_TRGT_OBJ_ID_TXT"),
-            "RULE_TRGT_ATTR_NM": st.column_config.TextColumn("RULE_TRGT_ATTR_NM"),
-            "RULE_ACPT_VARY_PCT": st.column_config.TextColumn("RULE_ACPT_VARY_PCT"),
-            "RULE_MIN_THRESH_VALUE_TXT": st.column_config.TextColumn("RULE_MIN_THRESH_VALUE_TXT"),
-            "RULE_MAX_THRESH_VALUE_TXT": st.column_config.TextColumn("RULE_MAX_THRESH_VALUE_TXT"),
-            "RULE_TRGT_DATA_LAYER_NM": st.column_config.SelectboxColumn(
-                "RULE_TRGT_DATA_LAYER_NM",
-                options=FIELDS["RULE_TRGT_DATA_LAYER_NM"],
-                required=True
-            ),
-            "RULE_CDE_IND": st.column_config.TextColumn("RULE_CDE_IND", disabled=True),
-            "RULE_LOGIC_TXT": st.column_config.TextColumn("RULE_LOGIC_TXT", width="large"),
-            "RULE_EFF_DT": st.column_config.DateColumn("RULE_EFF_DT"),
-            "RULE_EXP_DT": st.column_config.DateColumn("RULE_EXP_DT"),
-            "RULE_ACTV_IND": st.column_config.SelectboxColumn(
-                "RULE_ACTV_IND",
-                options=FIELDS["RULE_ACTV_IND"],
-                required=True
-            ),
-            "RULE_RMRK_TXT": st.column_config.TextColumn("RULE_RMRK_TXT"),
-            "CREA_PRTY_ID": st.column_config.TextColumn("CREA_PRTY_ID", disabled=True),
-            "CREA_TS": st.column_config.TextColumn("CREA_TS", disabled=True),
-            "UPDT_PRTY_ID": st.column_config.TextColumn("UPDT_PRTY_ID", disabled=True),
-            "UPDT_TS": st.column_config.TextColumn("UPDT_TS", disabled=True),
-            "ETL_CREA_NR": st.column_config.TextColumn("ETL_CREA_NR", disabled=True),
-            "ETL_CREA_TS": st.column_config.TextColumn("ETL_CREA_TS", disabled=True),
-            "ETL_UPDT_NR": st.column_config.TextColumn("ETL_UPDT_NR", disabled=True),
-            "ETL_UPDT_TS": st.column_config.TextColumn("ETL_UPDT_TS", disabled=True),
-            "ASSET_ID": st.column_config.TextColumn("ASSET_ID", disabled=True),
-            "ASSET_NM": st.column_config.TextColumn("ASSET_NM"),
-            "RULE_SEQ_NR": st.column_config.SelectboxColumn(
-                "RULE_SEQ_NR",
-                options=FIELDS["RULE_SEQ_NR"],
-                required=True
-            ),
-        }
+    if len(rules) > 0:
+        # Create editable interface using st.data_editor on one page of the store
+        with profiler.stage("editor.prepare"):
+            page_ids = show_editor_view_controls(rules)
+            df = rules.frame.loc[page_ids].reset_index(drop=True)
+            
+            # Convert date columns to datetime.date for Streamlit compatibility
+            for date_col in ["RULE_EFF_DT", "RULE_EXP_DT"]:
+                df[date_col] = pd.to_datetime(df[date_col].astype(object), errors="coerce").dt.date
         
-        # Use data_editor for inline editing
-        edited_df = st.data_editor(
-            df,
-            column_config=column_config,
-            use_container_width=True,
-            height=500,
-            num_rows="dynamic",  # Allow adding/deleting rows
-            key="rules_editor"
-        )
+        # Use data_editor for inline editing; apply_editor_changes saves each edit
+        # from the widget's row deltas, keyed back to store row ids by position
+        st.session_state.editor_row_ids = page_ids
+        with profiler.stage("editor.render"):
+            st.data_editor(
+                df,
+                column_config=get_column_config(),
+                use_container_width=True,
+                height=500,
+                num_rows="dynamic",  # Allow adding/deleting rows
+                key="rules_editor",
+                on_change=apply_editor_changes
+            )
         
-        # Update session state with edited data and auto-validate
-        if not edited_df.equals(df):
-            # Convert back to list of dictionaries
-            updated_rows = []
-            for _, row in edited_df.iterrows():
-                rule_dict = {}
-                for field in FIELDS.keys():
-                    value = str(row.get(field, "")) if pd.notna(row.get(field, "")) else ""
-                    # Convert text fields to uppercase
-                    if field in ["APPL_CD", "RULE_NM", "RULE_DSC_TXT", "RULE_SRC_OBJ_ID_TXT", 
-                                 "RULE_TRGT_SCHM_NM", "RULE_TRGT_OBJ_ID_TXT", "RULE_TRGT_ATTR_NM", "RULE_LOGIC_TXT", "RULE_RMRK_TXT", "ASSET_NM"]:
-                        value = value.upper()
-                    # Convert date fields back to string format
-                    if field in ["RULE_EFF_DT", "RULE_EXP_DT"] and pd.notna(row.get(field)):
-                        try:
-                            value = pd.to_datetime(row.get(field)).strftime("%Y-%m-%d")
-                        except:
-                            value = str(row.get(field, ""))
-                    rule_dict[field] = value
-                updated_rows.append(rule_dict)
-            
-            st.session_state.rows = updated_rows
-            
-            # Use the SAME validation logic as "Validate All Rules"
-            validation_errors = []
-            for i, row in enumerate(st.session_state.rows):
-                errors = validate_single_row(row, st.session_state.rows, is_new_row=False)
-                if errors:
-                    validation_errors.extend([f"Row {i+1}: {error}" for error in errors])
-            
-            if validation_errors:
-                st.session_state.auto_validation_errors = validation_errors
-                st.warning("⚠️ Changes saved but validation errors found. See below for details.")
-            else:
-                st.success("✅ Changes saved and validated successfully!")
-                # Clear any previous validation errors
-                if 'auto_validation_errors' in st.session_state:
-                    del st.session_state.auto_validation_errors
-                if 'all_validation_errors' in st.session_state:
-                    del st.session_state.all_validation_errors
+        # Report the outcome of the last edit, validated with the same checks as "Validate All Rules"
+        editor_status = st.session_state.pop("editor_status", None)
+        if editor_status == "errors":
+            st.warning("⚠️ Changes saved but validation errors found. See below for details.")
+        elif editor_status == "valid":
+            st.success("✅ Changes saved and validated successfully!")
         
         # Display auto-validation errors if any (using same format as manual validation)
         if 'auto_validation_errors' in st.session_state:
-            st.markdown('<div class="validation-error">', unsafe_allow_html=True)
-            st.error("**❌ Auto-Validation Errors:**")
-            for error in st.session_state.auto_validation_errors:
-                st.error(f"• {error}")
-            st.markdown('</div>', unsafe_allow_html=True)
+            show_error_report(st.session_state.auto_validation_errors, "Auto-Validation Errors", key="auto_errors")
         
     else:
         st.info("📋 No rules available to display. Please upload or add rules first.")
@@ -580,4 +909,34 @@ else:
 # Footer
 st.markdown("---")
 st.markdown("**Data Quality Control Rules Manager** - Streamlit Version")
-st.markdown("For DQC Rule Naming Standards, refer to the [documentation](https://wiki.usaa.com/display/EMM/Data+Control+Framework#Architecture-DQCRuleNamingStandards)")
\ No newline at end of file
+st.markdown("For DQC Rule Naming Standards, refer to the [documentation](https://wiki.usaa.com/display/EMM/Data+Control+Framework#Architecture-DQCRuleNamingStandards)")
+
+# ============================================================================
+# PROFILING PANEL
+# ============================================================================
+# Stages run by widget callbacks before this rerun count towards it; set
+# DQC_PROFILE_LOG to also append every profiled rerun to a JSON-lines file
+profile_run = profiler.finish_run(log_path=os.environ.get("DQC_PROFILE_LOG"), rules=len(st.session_state.rules))
+if profile_enabled:
+    if profile_run["stages"]:
+        st.session_state.profile_runs = (st.session_state.profile_runs + [profile_run])[-MAX_PROFILE_RUNS:]
+    with profile_panel:
+        st.markdown("**Last rerun**")
+        if profile_run["stages"]:
+            st.dataframe(pd.DataFrame([{
+                "stage": record["stage"],
+                "calls": record["calls"],
+                "total ms": round(record["total_s"] * 1000, 1),
+                "mean ms": round(record["total_s"] * 1000 / record["calls"], 1),
+                "max ms": round(record["max_s"] * 1000, 1),
+                "peak KB": round(record["peak_bytes"] / 1024, 1),
+            } for record in profile_run["stages"]]), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No profiled stages ran in this rerun.")
+        if st.session_state.profile_runs:
+            st.download_button(
+                label=f"📥 Download timings ({len(st.session_state.profile_runs)} reruns, JSONL)",
+                data=runs_to_jsonl(st.session_state.profile_runs),
+                file_name="dqc_profile.jsonl",
+                mime="application/x-ndjson",
+            )
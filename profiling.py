@@ -0,0 +1,146 @@
+"""Opt-in per-stage timing for app reruns: wall time, call counts and peak memory.
+
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage("upload.parse"):
+        ...
+
+    @profiler.profiled("auto_fix.preview")
+    def preview_auto_fix(...):
+        ...
+
+A profiler belongs to one session's script runs and is not thread-safe:
+only use it from the script thread, never in callbacks Streamlit runs
+elsewhere, such as a download button's deferred data callable.
+
+A disabled profiler makes stage() a no-op, so instrumented code costs
+nothing unless profiling is switched on. Peak memory comes from tracemalloc,
+which is process-wide while Streamlit serves every session from one process:
+it is started when the first profiler runs an enabled stage and stopped when
+the last one is switched off. A stage's peak is the peak allocated above what
+was in use when it started. tracemalloc has a single peak counter, so it is
+only reset when no other stage in the process is open. Nested stages, or
+stages overlapping another session's, read the shared peak instead; when
+that was set earlier, they report only their net growth. Treat those peaks
+as approximate.
+"""
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+# Shared tracemalloc state: the profilers currently tracing, whether
+# tracemalloc was started by them (and may be stopped), and the open stages
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+_open_stages = 0
+
+def _acquire_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+def _release_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+def _enter_stage():
+    global _open_stages
+    with _tracing_lock:
+        if _open_stages == 0:
+            tracemalloc.reset_peak()
+        _open_stages += 1
+        return tracemalloc.get_traced_memory()
+
+def _exit_stage(start_memory, start_peak):
+    """Peak memory during a stage, as an absolute traced size."""
+    global _open_stages
+    with _tracing_lock:
+        _open_stages -= 1
+        current, peak = tracemalloc.get_traced_memory()
+    return peak if peak > start_peak else max(start_memory, current)
+
+class StageProfiler:
+    """Accumulates stage timings for one run until finish_run() collects them."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._tracing = False
+        self._stages = {}
+        self._started = time.time()
+
+    def __del__(self):
+        self._stop_tracing()
+
+    def _stop_tracing(self):
+        if self._tracing:
+            self._tracing = False
+            _release_tracing()
+
+    def set_enabled(self, enabled):
+        """Switch profiling on or off; switching off releases this profiler's hold on tracemalloc."""
+        if not enabled:
+            self._stop_tracing()
+        self.enabled = enabled
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        if not self._tracing:
+            _acquire_tracing()
+            self._tracing = True
+        start_memory, start_peak = _enter_stage()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = _exit_stage(start_memory, start_peak)
+            record = self._stages.setdefault(name, {"stage": name, "calls": 0, "total_s": 0.0, "max_s": 0.0, "peak_bytes": 0})
+            record["calls"] += 1
+            record["total_s"] += elapsed
+            record["max_s"] = max(record["max_s"], elapsed)
+            record["peak_bytes"] = max(record["peak_bytes"], peak - start_memory)
+
+    def profiled(self, name):
+        """Decorator form of stage()."""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def records(self):
+        """Stage records of the current run, in the order the stages first ran."""
+        return [dict(record) for record in self._stages.values()]
+
+    def finish_run(self, log_path=None, **run_info):
+        """Close the current run and start the next one.
+
+        Returns the run as a dict (started, stages, plus run_info) and, with
+        log_path, appends it to that file as one JSON line.
+        """
+        run = {"started": self._started, **run_info, "stages": self.records()}
+        if log_path and run["stages"]:
+            with open(log_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(run) + "\n")
+        self._stages = {}
+        self._started = time.time()
+        return run
+
+def runs_to_jsonl(runs):
+    """Serialise finished runs as JSON lines."""
+    return "".join(json.dumps(run) + "\n" for run in runs)
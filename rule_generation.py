@@ -1,164 +1,213 @@
+from functools import lru_cache
+
+from config import CHECK_TYPES, DEFAULT_CHECK_TYPE, FIELDS, RULE_NAME_COMPONENTS, UNKNOWN_RULE_NAME_COMPONENT
+from validation import SUM_METHODS, search_rule_name_class
+
+# Description per naming-standard branch, keyed by layer ("<layer>_DIFF" for
+# DIFF checks, "<layer>_<method>" for DUP/OVERLAP checks)
+DESCRIPTION_TEMPLATES = {
+    "OP_HOP3": "Performs {check_type} on OnPrem Source Records (HOP3) table {table}.",
+    "OP_HOP2": "Performs {check_type} on OnPrem DS Records (HOP2) table {table}.",
+    "OP_HOP1": "Performs {check_type} on OnPrem CSV Records (HOP1) table {table}.",
+    "DL2": "Performs {check_type} on DL2 table {table}.",
+    "FND_DL3": "Performs {check_type} on foundation table {table}.",
+    "STG_DL3": "Performs {check_type} on staging DL3 table {table}.",
+    "INFO_DL3": "Performs {check_type} on information DL3 table {table}.",
+    "OP_HOP3_HOP2_DIFF": "Performs {check_type} between OnPrem Source Records (HOP3) and OnPrem DS Records (HOP2)",
+    "OP_HOP2_HOP1_DIFF": "Performs {check_type} between OnPrem DS Records (HOP2) and OnPrem CSV Records (HOP1)",
+    "OP_HOP1_DL2_DIFF": "Performs {check_type} between OnPrem CSV Records (HOP1) and DL2 table",
+    "DL2_FND_DIFF": "Performs {check_type} between DL2 and foundation table {table}.",
+    "STG_INFO_DIFF": "Performs {check_type} between staging table and information DL3 table {table}.",
+    "INFO_DL3_DUP_CHK": "Performs Duplicate check on information DL3 table {table}.",
+    "INFO_DL3_OVERLAP_CHK": "Performs Overlap check on information DL3 table {table}.",
+}
+
+RULE_NM_PLACEHOLDER = FIELDS["RULE_NM"]
+ABORT_IND_METHODS = ["DIFF_CNT_CHK", "DIFF_SUM_CHK", "DUP_CHK", "OVERLAP_CHK"]
+# Fields derived by update_all_auto_fields / auto_fix_frame
+AUTO_FIX_FIELDS = ["RULE_ABORT_IND", "RULE_TRGT_ATTR_NM", "RULE_NM", "RULE_DSC_TXT"]
+RULE_DSC_PLACEHOLDER = "Rule description will be auto-generated based on rule name"
+
+def rule_name_component(rule_trgt_db_nm, rule_valid_meth_cd, rule_trgt_data_layer_nm):
+    """Look up the RULE_NM target component for a db/method/layer combination."""
+    component = RULE_NAME_COMPONENTS.get((rule_trgt_db_nm, rule_valid_meth_cd, rule_trgt_data_layer_nm))
+    if component is None:
+        component = RULE_NAME_COMPONENTS.get((rule_trgt_db_nm, rule_valid_meth_cd, None), UNKNOWN_RULE_NAME_COMPONENT)
+    return component
+
 def generate_rule_name(rule_trgt_obj_id_txt, rule_valid_meth_cd, rule_trgt_db_nm, rule_trgt_data_layer_nm):
     if not all([rule_trgt_obj_id_txt, rule_valid_meth_cd, rule_trgt_db_nm, rule_trgt_data_layer_nm]):
-        return "Enter a rule name (e.g. TABLE_NM_DL2_CNT_CHK)"
-    rule_target_component = ""
-    if rule_trgt_db_nm == "CFOPAYMENTSDB":
-        if rule_valid_meth_cd in ["CNT_CHK", "SUM_CHK"]:
-            if rule_trgt_data_layer_nm == "OnPrem_HOP3":
-                rule_target_component = "OP_HOP3"
-            elif rule_trgt_data_layer_nm == "OnPrem_HOP2":
-                rule_target_component = "OP_HOP2"
-            elif rule_trgt_data_layer_nm == "OnPrem_HOP1":
-                rule_target_component = "OP_HOP1"
-            elif rule_trgt_data_layer_nm == "DL2":
-                rule_target_component = "DL2"
-            elif rule_trgt_data_layer_nm == "DL3":
-                rule_target_component = "FND_DL3"
-            else:
-                rule_target_component = "UNKNOWN"
-        elif rule_valid_meth_cd in ["DIFF_CNT_CHK", "DIFF_SUM_CHK"]:
-            if rule_trgt_data_layer_nm == "OnPrem":
-                rule_target_component = "OP_(HOP3_HOP2|HOP2_HOP1)"
-            elif rule_trgt_data_layer_nm == "DL2":
-                rule_target_component = "OP_HOP1_DL2"
-            elif rule_trgt_data_layer_nm == "DL3":
-                rule_target_component = "DL2_FND"
-            else:
-                rule_target_component = "UNKNOWN"
-        elif rule_valid_meth_cd in ["DUP_CHK", "OVERLAP_CHK"]:
-            if rule_trgt_data_layer_nm == "DL3":
-                rule_target_component = "FND_DL3"
-            else:
-                rule_target_component = "UNKNOWN"
-        else:
-            rule_target_component = "UNKNOWN"
-    elif rule_trgt_db_nm == "CFOINFODMDB":
-        if rule_valid_meth_cd in ["CNT_CHK", "SUM_CHK"]:
-            rule_target_component = "(STG|INFO)_DL3"
-        elif rule_valid_meth_cd in ["DIFF_CNT_CHK", "DIFF_SUM_CHK"]:
-            rule_target_component = "STG_INFO"
-        elif rule_valid_meth_cd in ["DUP_CHK", "OVERLAP_CHK"]:
-            rule_target_component = "INFO_DL3"
-        else:
-            rule_target_component = "UNKNOWN"
-    else:
-        rule_target_component = "UNKNOWN"
+        return RULE_NM_PLACEHOLDER
+    rule_target_component = rule_name_component(rule_trgt_db_nm, rule_valid_meth_cd, rule_trgt_data_layer_nm)
     return f"{rule_trgt_obj_id_txt}_{rule_target_component}_{rule_valid_meth_cd}"
 
+@lru_cache(maxsize=None)
+def check_type_for(rule_valid_meth_cd):
+    """Check type wording for a method: the first CHECK_TYPES key it contains."""
+    for method, check_type in CHECK_TYPES.items():
+        if method in rule_valid_meth_cd:
+            return method, check_type
+    return None, DEFAULT_CHECK_TYPE
+
+@lru_cache(maxsize=4096)
+def description_template(rule_nm):
+    """Description template for a rule name's naming-standard branch, or None when it contains no standard."""
+    classification = search_rule_name_class(rule_nm)
+    if classification is None:
+        return None
+    if classification.method in ["DUP_CHK", "OVERLAP_CHK"]:
+        return DESCRIPTION_TEMPLATES[f"{classification.layer}_{classification.method}"]
+    if classification.is_diff:
+        return DESCRIPTION_TEMPLATES[f"{classification.layer}_DIFF"]
+    return DESCRIPTION_TEMPLATES[classification.layer]
+
 def generate_rule_description(rule_nm, rule_valid_meth_cd, rule_trgt_attr_nm, rule_trgt_obj_id_txt):
-    if not rule_nm or rule_nm == "Enter a rule name (e.g. TABLE_NM_DL2_CNT_CHK)":
-        return "Rule description will be auto-generated based on rule name"
-    if "CNT_CHK" in rule_valid_meth_cd:
-        if "DIFF_CNT_CHK" in rule_valid_meth_cd:
-            check_type = "difference count check"
-        else:
-            check_type = "count check"
-    elif "SUM_CHK" in rule_valid_meth_cd:
-        if "DIFF_SUM_CHK" in rule_valid_meth_cd:
-            check_type = f"difference sum check on {rule_trgt_attr_nm}" if rule_trgt_attr_nm and rule_trgt_attr_nm != "NA" else "difference sum check"
-        else:
-            check_type = f"sum check on {rule_trgt_attr_nm}" if rule_trgt_attr_nm and rule_trgt_attr_nm != "NA" else "sum check"
-    elif "DUP_CHK" in rule_valid_meth_cd:
-        check_type = "duplicate check"
-    elif "OVERLAP_CHK" in rule_valid_meth_cd:
-        check_type = "overlap check"
-    else:
-        check_type = "data quality check"
-    description = ""
-    if "_OP_HOP3_CNT_CHK" in rule_nm or "_OP_HOP3_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on OnPrem Source Records (HOP3) table {rule_trgt_obj_id_txt}."
-    elif "_OP_HOP2_CNT_CHK" in rule_nm or "_OP_HOP2_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on OnPrem DS Records (HOP2) table {rule_trgt_obj_id_txt}."
-    elif "_OP_HOP1_CNT_CHK" in rule_nm or "_OP_HOP1_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on OnPrem CSV Records (HOP1) table {rule_trgt_obj_id_txt}."
-    elif "_DL2_CNT_CHK" in rule_nm or "_DL2_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on DL2 table {rule_trgt_obj_id_txt}."
-    elif "_FND_DL3_CNT_CHK" in rule_nm or "_FND_DL3_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on foundation table {rule_trgt_obj_id_txt}."
-    elif "_STG_DL3_CNT_CHK" in rule_nm or "_STG_DL3_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on staging DL3 table {rule_trgt_obj_id_txt}."
-    elif "_INFO_DL3_CNT_CHK" in rule_nm or "_INFO_DL3_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} on information DL3 table {rule_trgt_obj_id_txt}."
-    elif "_OP_HOP3_HOP2_DIFF_CNT_CHK" in rule_nm or "_OP_HOP3_HOP2_DIFF_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} between OnPrem Source Records (HOP3) and OnPrem DS Records (HOP2)"
-    elif "_OP_HOP2_HOP1_DIFF_CNT_CHK" in rule_nm or "_OP_HOP2_HOP1_DIFF_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} between OnPrem DS Records (HOP2) and OnPrem CSV Records (HOP1)"
-    elif "_OP_HOP1_DL2_DIFF_CNT_CHK" in rule_nm or "_OP_HOP1_DL2_DIFF_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} between OnPrem CSV Records (HOP1) and DL2 table"
-    elif "_DL2_FND_DIFF_CNT_CHK" in rule_nm or "_DL2_FND_DIFF_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} between DL2 and foundation table {rule_trgt_obj_id_txt}."
-    elif "_STG_INFO_DIFF_CNT_CHK" in rule_nm or "_STG_INFO_DIFF_SUM_CHK" in rule_nm:
-        description = f"Performs {check_type} between staging table and information DL3 table {rule_trgt_obj_id_txt}."
-    elif "_INFO_DL3_DUP_CHK" in rule_nm:
-        description = f"Performs Duplicate check on information DL3 table {rule_trgt_obj_id_txt}."
-    elif "_INFO_DL3_OVERLAP_CHK" in rule_nm:
-        description = f"Performs Overlap check on information DL3 table {rule_trgt_obj_id_txt}."
+    if not rule_nm or rule_nm == RULE_NM_PLACEHOLDER:
+        return RULE_DSC_PLACEHOLDER
+    method, check_type = check_type_for(rule_valid_meth_cd)
+    if method in SUM_METHODS and rule_trgt_attr_nm and rule_trgt_attr_nm != "NA":
+        check_type = f"{check_type} on {rule_trgt_attr_nm}"
+    template = description_template(rule_nm)
+    if template:
+        description = template.format(check_type=check_type, table=rule_trgt_obj_id_txt)
+    elif rule_trgt_obj_id_txt and rule_trgt_obj_id_txt != "TARGET_TABLE":
+        description = f"Performs {check_type} on table {rule_trgt_obj_id_txt}."
     else:
-        if rule_trgt_obj_id_txt and rule_trgt_obj_id_txt != "TARGET_TABLE":
-            description = f"Performs {check_type} on table {rule_trgt_obj_id_txt}."
-        else:
-            description = f"Performs {check_type}."
+        description = f"Performs {check_type}."
     if description and not description[0].isupper():
         description = description[0].upper() + description[1:]
     return description
 
-def update_all_auto_fields(st):
-    abort_ind_values = ["DIFF_CNT_CHK", "DIFF_SUM_CHK", "DUP_CHK", "OVERLAP_CHK"]
-    st.session_state.form_rule_abort_ind = "Y" if st.session_state.form_rule_valid_meth_cd in abort_ind_values else "N"
-    if st.session_state.form_rule_valid_meth_cd in ["SUM_CHK", "DIFF_SUM_CHK"]:
-        if st.session_state.form_rule_trgt_attr_nm == "NA":
-            st.session_state.form_rule_trgt_attr_nm = ""
-    else:
-        st.session_state.form_rule_trgt_attr_nm = "NA"
-    if (st.session_state.form_rule_trgt_obj_id_txt and 
-        st.session_state.form_rule_valid_meth_cd and 
-        st.session_state.form_rule_trgt_db_nm and 
-        st.session_state.form_rule_trgt_data_layer_nm):
-        st.session_state.form_rule_nm = generate_rule_name(
-            st.session_state.form_rule_trgt_obj_id_txt,
-            st.session_state.form_rule_valid_meth_cd, 
-            st.session_state.form_rule_trgt_db_nm,
-            st.session_state.form_rule_trgt_data_layer_nm
-        )
-    else:
-        st.session_state.form_rule_nm = "Enter a rule name (e.g. TABLE_NM_DL2_CNT_CHK)"
-    st.session_state.form_rule_dsc_txt = generate_rule_description(
-        st.session_state.form_rule_nm,
-        st.session_state.form_rule_valid_meth_cd,
-        st.session_state.form_rule_trgt_attr_nm,
-        st.session_state.form_rule_trgt_obj_id_txt
+def _generate_rule_names(obj, meth, db, layer):
+    """generate_rule_name over text columns, looking each distinct db/method/layer up once."""
+    import pandas as pd
+
+    keys = pd.MultiIndex.from_arrays([db, meth, layer])
+    unique_keys = keys.unique()
+    components = pd.Series([rule_name_component(*key) for key in unique_keys], index=unique_keys)
+    component = components.reindex(keys).to_numpy()
+    complete = (obj != "") & (meth != "") & (db != "") & (layer != "")
+    return (obj + "_" + component + "_" + meth).where(complete, RULE_NM_PLACEHOLDER)
+
+def _generate_rule_descriptions(names, meth, attr, obj):
+    return [generate_rule_description(*values) for values in zip(names.tolist(), meth.tolist(), attr.tolist(), obj.tolist())]
+
+def generate_names(df):
+    """Return a copy of a rules frame with RULE_NM and RULE_DSC_TXT regenerated for every row."""
+    from rule_io import as_text
+
+    frame = df.copy()
+    obj = as_text(frame["RULE_TRGT_OBJ_ID_TXT"])
+    meth = as_text(frame["RULE_VALID_METH_CD"])
+    names = _generate_rule_names(obj, meth, as_text(frame["RULE_TRGT_DB_NM"]), as_text(frame["RULE_TRGT_DATA_LAYER_NM"]))
+    frame["RULE_NM"] = names.to_numpy()
+    frame["RULE_DSC_TXT"] = _generate_rule_descriptions(names, meth, as_text(frame["RULE_TRGT_ATTR_NM"]), obj)
+    return frame
+
+def auto_fix_frame(df):
+    """Apply the Add Rule form's derivations (update_all_auto_fields) to every row of a rules frame.
+
+    Returns a copy with AUTO_FIX_FIELDS recomputed as text. RULE_NM is only
+    replaced by a complete, concrete generated name; where generation needs a
+    manual choice such as "(STG|INFO)", or fields are missing, the existing
+    name is kept and only its description is regenerated.
+    """
+    import numpy as np
+    from rule_io import as_text
+
+    frame = df.copy()
+    obj = as_text(frame["RULE_TRGT_OBJ_ID_TXT"])
+    meth = as_text(frame["RULE_VALID_METH_CD"])
+    attr = as_text(frame["RULE_TRGT_ATTR_NM"])
+    attr = attr.where(~meth.isin(SUM_METHODS), attr.replace("NA", "")).where(meth.isin(SUM_METHODS), "NA")
+    generated = _generate_rule_names(obj, meth, as_text(frame["RULE_TRGT_DB_NM"]), as_text(frame["RULE_TRGT_DATA_LAYER_NM"]))
+    concrete = (generated != RULE_NM_PLACEHOLDER) & ~generated.str.contains("(", regex=False)
+    names = generated.where(concrete, as_text(frame["RULE_NM"]))
+    frame["RULE_ABORT_IND"] = np.where(meth.isin(ABORT_IND_METHODS), "Y", "N")
+    frame["RULE_TRGT_ATTR_NM"] = attr.to_numpy()
+    frame["RULE_NM"] = names.to_numpy()
+    frame["RULE_DSC_TXT"] = _generate_rule_descriptions(names, meth, attr, obj)
+    return frame
+
+def auto_fix_changes(before, after, fields=AUTO_FIX_FIELDS):
+    """Tidy frame of the cells that differ between two rules frames: row (index label), field, before, after."""
+    import pandas as pd
+    from rule_io import as_text
+
+    changes = []
+    for field in fields:
+        old = as_text(before[field])
+        new = as_text(after[field])
+        changed = (old != new).to_numpy()
+        changes.append(pd.DataFrame({"row": before.index[changed], "field": field,
+                                     "before": old[changed].to_numpy(), "after": new[changed].to_numpy()}))
+    return pd.concat(changes).sort_values("row", kind="stable").reset_index(drop=True)
+
+# Pure derivations: a rule record (FIELDS names -> values) in, the derived
+# fields out. They touch no UI state, so batch jobs and worker processes can
+# call them directly; the update_* callbacks below wrap them for the form.
+
+def derive_rule_name(record):
+    """RULE_NM and RULE_DSC_TXT generated from the target, method, database and layer."""
+    rule_nm = generate_rule_name(
+        record.get("RULE_TRGT_OBJ_ID_TXT", ""),
+        record.get("RULE_VALID_METH_CD", ""),
+        record.get("RULE_TRGT_DB_NM", ""),
+        record.get("RULE_TRGT_DATA_LAYER_NM", "")
     )
+    return {"RULE_NM": rule_nm, **derive_description({**record, "RULE_NM": rule_nm})}
 
-def update_rule_name_only(st):
-    if (st.session_state.form_rule_trgt_obj_id_txt and 
-        st.session_state.form_rule_valid_meth_cd and 
-        st.session_state.form_rule_trgt_db_nm and 
-        st.session_state.form_rule_trgt_data_layer_nm):
-        st.session_state.form_rule_nm = generate_rule_name(
-            st.session_state.form_rule_trgt_obj_id_txt,
-            st.session_state.form_rule_valid_meth_cd, 
-            st.session_state.form_rule_trgt_db_nm,
-            st.session_state.form_rule_trgt_data_layer_nm
-        )
+def derive_description(record):
+    """RULE_DSC_TXT generated from the record's rule name, method, attribute and target."""
+    return {"RULE_DSC_TXT": generate_rule_description(
+        record.get("RULE_NM", ""),
+        record.get("RULE_VALID_METH_CD", ""),
+        record.get("RULE_TRGT_ATTR_NM", ""),
+        record.get("RULE_TRGT_OBJ_ID_TXT", "")
+    )}
+
+def derive_all_auto_fields(record):
+    """RULE_ABORT_IND, RULE_TRGT_ATTR_NM, RULE_NM and RULE_DSC_TXT, as the Add Rule form derives them."""
+    rule_valid_meth_cd = record.get("RULE_VALID_METH_CD", "")
+    rule_trgt_attr_nm = record.get("RULE_TRGT_ATTR_NM", "")
+    if rule_valid_meth_cd in SUM_METHODS:
+        if rule_trgt_attr_nm == "NA":
+            rule_trgt_attr_nm = ""
     else:
-        st.session_state.form_rule_nm = "Enter a rule name (e.g. TABLE_NM_DL2_CNT_CHK)"
-    st.session_state.form_rule_dsc_txt = generate_rule_description(
-        st.session_state.form_rule_nm,
-        st.session_state.form_rule_valid_meth_cd,
-        st.session_state.form_rule_trgt_attr_nm,
-        st.session_state.form_rule_trgt_obj_id_txt
-    )
+        rule_trgt_attr_nm = "NA"
+    derived = {
+        "RULE_ABORT_IND": "Y" if rule_valid_meth_cd in ABORT_IND_METHODS else "N",
+        "RULE_TRGT_ATTR_NM": rule_trgt_attr_nm,
+    }
+    derived.update(derive_rule_name({**record, **derived}))
+    return derived
+
+def derive_database_for_layer(record):
+    """RULE_TRGT_DB_NM forced to CFOPAYMENTSDB for OnPrem layers, then the regenerated name and description."""
+    derived = {}
+    if any(hop in record.get("RULE_TRGT_DATA_LAYER_NM", "") for hop in ["HOP1", "HOP2", "HOP3", "OnPrem"]):
+        derived["RULE_TRGT_DB_NM"] = "CFOPAYMENTSDB"
+    derived.update(derive_rule_name({**record, **derived}))
+    return derived
+
+FORM_DERIVATION_FIELDS = ["RULE_VALID_METH_CD", "RULE_TRGT_ATTR_NM", "RULE_TRGT_OBJ_ID_TXT",
+                          "RULE_TRGT_DB_NM", "RULE_TRGT_DATA_LAYER_NM", "RULE_NM"]
+
+def _form_record(st):
+    return {field: st.session_state.get(f"form_{field.lower()}", "") for field in FORM_DERIVATION_FIELDS}
+
+def _set_form_fields(st, derived):
+    for field, value in derived.items():
+        st.session_state[f"form_{field.lower()}"] = value
+
+def update_all_auto_fields(st):
+    _set_form_fields(st, derive_all_auto_fields(_form_record(st)))
+
+def update_rule_name_only(st):
+    _set_form_fields(st, derive_rule_name(_form_record(st)))
 
 def update_database_based_on_layer(st):
-    data_layer = st.session_state.form_rule_trgt_data_layer_nm
-    if any(hop in data_layer for hop in ["HOP1", "HOP2", "HOP3", "OnPrem"]):
-        st.session_state.form_rule_trgt_db_nm = "CFOPAYMENTSDB"
-    update_rule_name_only(st)
+    _set_form_fields(st, derive_database_for_layer(_form_record(st)))
 
 def update_description_only(st):
-    st.session_state.form_rule_dsc_txt = generate_rule_description(
-        st.session_state.form_rule_nm,
-        st.session_state.form_rule_valid_meth_cd,
-        st.session_state.form_rule_trgt_attr_nm,
-        st.session_state.form_rule_trgt_obj_id_txt
-    )
+    _set_form_fields(st, derive_description(_form_record(st)))
@@ -0,0 +1,124 @@
+import pandas as pd
+from config import FIELDS
+
+INGEST_CHUNK_SIZE = 10000
+EXPORT_CHUNK_SIZE = 10000
+
+# Text fields converted to uppercase when rules are uploaded or edited
+UPLOAD_UPPERCASE_FIELDS = ["APPL_CD", "RULE_NM", "RULE_DSC_TXT", "RULE_SRC_OBJ_ID_TXT",
+                           "RULE_TRGT_SCHM_NM", "RULE_TRGT_OBJ_ID_TXT", "RULE_TRGT_ATTR_NM", "RULE_LOGIC_TXT"]
+EDITOR_UPPERCASE_FIELDS = UPLOAD_UPPERCASE_FIELDS + ["RULE_RMRK_TXT", "ASSET_NM"]
+DATE_FIELDS = ["RULE_EFF_DT", "RULE_EXP_DT"]
+
+def as_text(values):
+    """A column as strings, blank for missing values (string columns are only filled, not copied)."""
+    if isinstance(values.dtype, pd.StringDtype):
+        return values.fillna("") if values.hasnans else values
+    return values.astype(object).where(values.notna(), "").astype(str)
+
+def normalize_rule_frame(df, uppercase_fields=UPLOAD_UPPERCASE_FIELDS):
+    """Align a frame to the FIELDS columns as strings, blank for missing values."""
+    frame = df.reindex(columns=list(FIELDS.keys()))
+    frame = pd.DataFrame({field: as_text(frame[field]) for field in FIELDS}, index=frame.index)
+    for field in uppercase_fields:
+        frame[field] = frame[field].str.upper()
+    return frame
+
+def iter_rule_chunks(source, chunksize=INGEST_CHUNK_SIZE):
+    """Read a tilde-delimited rules file in chunks of normalised rule frames.
+
+    Values are read as text so codes such as "NA" or "0012" survive as they
+    were written. Only the FIELDS columns are kept, and each chunk keeps its
+    row positions in the file as its index.
+    """
+    reader = pd.read_csv(source, delimiter="~", dtype=str, keep_default_na=False,
+                         usecols=lambda column: column in FIELDS, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            yield normalize_rule_frame(chunk)
+
+def normalize_editor_frame(df):
+    """Normalise st.data_editor output: uppercase text fields, dates back to YYYY-MM-DD."""
+    frame = normalize_rule_frame(df, EDITOR_UPPERCASE_FIELDS)
+    for field in DATE_FIELDS:
+        if field in df.columns:
+            dates = pd.to_datetime(df[field], errors="coerce")
+            frame[field] = frame[field].where(dates.isna(), dates.dt.strftime("%Y-%m-%d"))
+    return frame
+
+def normalize_editor_values(values):
+    """Normalise one row of st.data_editor cell edits the same way as normalize_editor_frame."""
+    normalized = {}
+    for field, value in values.items():
+        if field not in FIELDS:
+            continue
+        value = "" if value is None or (not isinstance(value, str) and pd.isna(value)) else value
+        if field in DATE_FIELDS and value != "":
+            try:
+                value = pd.to_datetime(value).strftime("%Y-%m-%d")
+            except (ValueError, TypeError):
+                value = str(value)
+        value = str(value)
+        normalized[field] = value.upper() if field in EDITOR_UPPERCASE_FIELDS else value
+    return normalized
+
+def rules_to_csv(frame):
+    """Serialise rules as the tilde-delimited export (header plus one line per rule)."""
+    return frame.to_csv(sep="~", columns=list(FIELDS.keys()), index=False, lineterminator="\r\n")
+
+def iter_rules_csv(frame, chunksize=EXPORT_CHUNK_SIZE):
+    """Yield the rules_to_csv export as UTF-8 byte chunks: the header, then chunksize rules at a time."""
+    columns = list(FIELDS.keys())
+    yield frame.iloc[:0].to_csv(sep="~", columns=columns, index=False, lineterminator="\r\n").encode("utf-8")
+    for start in range(0, len(frame), chunksize):
+        chunk = frame.iloc[start:start + chunksize]
+        yield chunk.to_csv(sep="~", columns=columns, index=False, header=False, lineterminator="\r\n").encode("utf-8")
+
+def _date_column(values):
+    """Parse YYYY-MM-DD text to dates (blank -> missing); None if any value is not a date."""
+    dates = pd.to_datetime(values.astype(str).replace("", None), format="%Y-%m-%d", errors="coerce")
+    if (dates.isna() & (values.astype(str) != "")).any():
+        return None
+    return dates.dt.date
+
+def rules_to_parquet(frame):
+    """Serialise rules as Parquet bytes: enum columns dictionary-encoded, rule dates as date32.
+
+    A date column holding any value that is not a YYYY-MM-DD date is written
+    as text instead, so the file always round-trips exactly.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frame = frame.reindex(columns=list(FIELDS.keys())).reset_index(drop=True)
+    for field in DATE_FIELDS:
+        dates = _date_column(frame[field])
+        if dates is not None:
+            frame[field] = dates
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue().to_pybytes()
+
+def read_rules_parquet(source):
+    """Read a rules_to_parquet file back into FIELDS columns, dates as YYYY-MM-DD text."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(source)
+    table = table.select([name for name in table.column_names if name in FIELDS])
+    frame = table.to_pandas()
+    for field in DATE_FIELDS:
+        if field in frame.columns and pa.types.is_date(table.schema.field(field).type):
+            dates = pd.to_datetime(frame[field])
+            frame[field] = dates.dt.strftime("%Y-%m-%d").where(dates.notna(), "")
+    return frame
+
+def read_rules_file(path):
+    """Read a whole .csv or .parquet rules file as one normalised text frame indexed by row position."""
+    if str(path).lower().endswith(".parquet"):
+        return normalize_rule_frame(read_rules_parquet(path), uppercase_fields=[])
+    chunks = list(iter_rule_chunks(path))
+    if not chunks:
+        return normalize_rule_frame(pd.DataFrame(columns=list(FIELDS.keys())))
+    return pd.concat(chunks)
@@ -0,0 +1,108 @@
+"""In-memory search over a rulebook: RULE_NM/RULE_LOGIC_TXT text search, value lookups and free RULE_SEQ_NRs.
+
+A RuleSearchIndex is built from a snapshot of a RuleStore frame and, like
+RuleValidationIndex, carries the store version it was built for; rebuild it
+when the store's version moves on. Each part of the index is built the first
+time it is used, so an index that only answers sequence-number lookups never
+pays for the text search structures.
+"""
+from bisect import bisect_left, bisect_right
+
+from config import FIELDS
+from rule_io import as_text
+
+SEARCH_FIELDS = ["RULE_NM", "RULE_LOGIC_TXT"]
+SEARCH_LIMIT = 200
+
+# Joins a field's values into one searchable string; never part of a query or a value
+_SEPARATOR = "\x00"
+
+class RuleSearchIndex:
+    """Search and lookups over one version of a rulebook frame indexed by row id.
+
+    Text search ignores case. Results are row ids in rulebook order, at most
+    `limit` of them (limit=None returns every match).
+    """
+
+    def __init__(self, frame):
+        self._frame = frame.copy(deep=False)
+        self._text = {}
+        self._sorted = {}
+        self._groups = {}
+        self._sequence_numbers = None
+        self.version = None
+
+    def _blob(self, field):
+        if field not in self._text:
+            values = as_text(self._frame[field]).str.upper().tolist()
+            starts = [0] * len(values)
+            offset = 0
+            for position, value in enumerate(values):
+                starts[position] = offset
+                offset += len(value) + len(_SEPARATOR)
+            self._text[field] = (_SEPARATOR.join(values), starts)
+        return self._text[field]
+
+    def _sorted_values(self, field):
+        if field not in self._sorted:
+            values = as_text(self._frame[field]).str.upper().tolist()
+            order = sorted(range(len(values)), key=values.__getitem__)
+            self._sorted[field] = ([values[position] for position in order], order)
+        return self._sorted[field]
+
+    def _row_ids(self, positions, limit):
+        return self._frame.index[sorted(positions)[:limit]]
+
+    def search(self, text, fields=SEARCH_FIELDS, limit=SEARCH_LIMIT):
+        """Rules whose fields contain text."""
+        text = text.upper().replace(_SEPARATOR, "")
+        if not text:
+            return self._frame.index[:0]
+        positions = set()
+        for field in fields:
+            blob, starts = self._blob(field)
+            found = 0
+            at = blob.find(text)
+            while at != -1 and (limit is None or found < limit):
+                position = bisect_right(starts, at) - 1
+                positions.add(position)
+                found += 1
+                # Each rule counts once per field: carry on from the next rule's value
+                at = blob.find(text, starts[position + 1]) if position + 1 < len(starts) else -1
+        return self._row_ids(positions, limit)
+
+    def prefix(self, text, fields=SEARCH_FIELDS, limit=SEARCH_LIMIT):
+        """Rules whose fields start with text."""
+        text = text.upper()
+        if not text:
+            return self._frame.index[:0]
+        positions = set()
+        for field in fields:
+            values, order = self._sorted_values(field)
+            start = bisect_left(values, text)
+            end = bisect_left(values, text + "\U0010ffff", lo=start)
+            positions.update(order[start:end])
+        return self._row_ids(positions, limit)
+
+    def lookup(self, field, value):
+        """Row ids of every rule whose field equals value, e.g. a target object, database or layer."""
+        if field not in self._groups:
+            self._groups[field] = self._frame.groupby(as_text(self._frame[field]).to_numpy(), sort=False).indices
+        positions = self._groups[field].get(value)
+        return self._frame.index[positions] if positions is not None else self._frame.index[:0]
+
+    def used_sequence_numbers(self, target_object, category):
+        """RULE_SEQ_NR values already taken for a RULE_TRGT_OBJ_ID_TXT and RULE_VALID_CTGY_NM."""
+        if self._sequence_numbers is None:
+            used = {}
+            columns = (as_text(self._frame[field]).tolist()
+                       for field in ("RULE_TRGT_OBJ_ID_TXT", "RULE_VALID_CTGY_NM", "RULE_SEQ_NR"))
+            for obj, ctgy, seq in zip(*columns):
+                used.setdefault((obj, ctgy), set()).add(seq)
+            self._sequence_numbers = used
+        return self._sequence_numbers.get((target_object, category), set())
+
+    def next_free_sequence_number(self, target_object, category, options=FIELDS["RULE_SEQ_NR"]):
+        """The first of options not yet used for the target object and category, or None if all are taken."""
+        used = self.used_sequence_numbers(target_object, category)
+        return next((option for option in options if option not in used), None)
@@ -0,0 +1,275 @@
+import itertools
+import numpy as np
+import pandas as pd
+from config import FIELDS
+from rule_io import as_text
+
+# Free-text fields whose values are mostly unique per rule; every other field
+# is an enumeration or a near-constant default and is stored as a categorical.
+TEXT_FIELDS = ["RULE_NM", "RULE_DSC_TXT", "RULE_SRC_OBJ_ID_TXT", "RULE_TRGT_OBJ_ID_TXT",
+               "RULE_TRGT_ATTR_NM", "RULE_LOGIC_TXT", "RULE_RMRK_TXT", "CREA_TS"]
+CATEGORICAL_FIELDS = [field for field in FIELDS if field not in TEXT_FIELDS]
+
+# Shared across stores so a version never repeats, even when a store is replaced
+_versions = itertools.count()
+
+# Rows allocated up front; buffers then grow by half so appends are amortised O(1)
+MIN_CAPACITY = 1024
+# Appends add one Arrow chunk per text column; merge them once there are this many
+MAX_TEXT_CHUNKS = 256
+
+def _categories(field, values):
+    """Configured options first, then any other values seen in the data."""
+    options = FIELDS[field] if isinstance(FIELDS[field], list) else []
+    extra = [value for value in pd.unique(values) if value not in options]
+    return list(options) + sorted(extra)
+
+def to_rule_schema(df):
+    """Coerce a frame to the store schema: FIELDS columns, text or categorical, blank for missing."""
+    frame = df.reindex(columns=list(FIELDS.keys()))
+    for field in FIELDS:
+        column = frame[field]
+        if field in CATEGORICAL_FIELDS and isinstance(column.dtype, pd.CategoricalDtype):
+            # Already dictionary-encoded (e.g. read from Parquet): only the categories need coercing
+            column = column.cat.rename_categories(as_text(pd.Series(column.cat.categories)).tolist())
+            if column.isna().any():
+                column = column.cat.add_categories([""] if "" not in column.cat.categories else []).fillna("")
+            frame[field] = column.cat.set_categories(_categories(field, column.cat.categories))
+        elif field in CATEGORICAL_FIELDS:
+            column = as_text(column)
+            frame[field] = pd.Categorical(column, categories=_categories(field, column))
+        else:
+            frame[field] = as_text(column)
+    return frame
+
+def _codes_dtype(count):
+    """The code dtype pandas uses for a categorical with count categories."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if count < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+class RuleStore:
+    """Columnar rulebook keyed by a stable row id.
+
+    The frame holds one column per FIELDS entry (text or categorical) and is
+    indexed by ROW_ID, which never changes for a rule and is never reused.
+    Treat `frame` as read-only and mutate through append/update/delete, which
+    also bump `version`. Versions are unique across stores, so anything cached
+    against one (validation, exports) is invalidated when the store is replaced.
+
+    Categorical codes live in pre-allocated buffers and text columns in
+    chunked Arrow arrays, so appends touch only the new rows; `frame` is a
+    zero-copy view built once per version. Buffers a handed-out frame still
+    views are copied before an update writes to them, so earlier frames (e.g.
+    a background validation's snapshot) never change.
+    """
+
+    def __init__(self, frame=None):
+        frame = to_rule_schema(pd.DataFrame(columns=list(FIELDS.keys()))) if frame is None else frame
+        size = len(frame)
+        capacity = max(MIN_CAPACITY, size + size // 2)
+        self._size = size
+        self._ids = np.arange(capacity, dtype=np.int64)
+        self._contiguous = True
+        self._dtypes = {}
+        self._codes = {}
+        self._lookup = {}
+        self._text = {}
+        for field in CATEGORICAL_FIELDS:
+            column = frame[field].array
+            self._dtypes[field] = column.dtype
+            codes = np.empty(capacity, dtype=_codes_dtype(len(column.categories)))
+            codes[:size] = column.codes
+            self._codes[field] = codes
+        for field in TEXT_FIELDS:
+            self._text[field] = frame[field].array
+        self._next_id = size
+        self._frame = None
+        self._shared = set()
+        self.version = next(_versions)
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(to_rule_schema(pd.DataFrame.from_records(list(records), columns=list(FIELDS.keys()))))
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Build a store by appending frames of FIELDS values one at a time.
+
+        frames may be a generator, e.g. iter_rule_chunks(), so only one chunk
+        is held besides the store itself.
+        """
+        store = cls()
+        for frame in frames:
+            store.extend(frame)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            size = self._size
+            columns = {}
+            for field in FIELDS:
+                if field in CATEGORICAL_FIELDS:
+                    columns[field] = pd.Categorical.from_codes(self._codes[field][:size], dtype=self._dtypes[field], validate=False)
+                else:
+                    columns[field] = self._text[field]
+            index = pd.RangeIndex(size, name="ROW_ID") if self._contiguous else pd.Index(self._ids[:size], name="ROW_ID")
+            self._frame = pd.DataFrame(columns, index=index, copy=False)
+            self._shared = set(CATEGORICAL_FIELDS)
+        return self._frame
+
+    @property
+    def row_ids(self):
+        return self.frame.index
+
+    def _changed(self):
+        self._frame = None
+        self.version = next(_versions)
+
+    def _positions(self, row_ids):
+        """Buffer positions of row ids; ids are kept in ascending order."""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        ids = self._ids[:self._size]
+        positions = row_ids if self._contiguous else np.searchsorted(ids, row_ids)
+        found = (positions >= 0) & (positions < self._size)
+        if not found.all() or (ids[positions] != row_ids).any():
+            raise KeyError(row_ids[~found | (ids[np.where(found, positions, 0)] != row_ids)].tolist())
+        return positions
+
+    def _encode(self, field, values):
+        """Codes for text values of a categorical field, adding categories it does not have yet."""
+        lookup = self._lookup.get(field)
+        if lookup is None:
+            lookup = self._lookup[field] = {value: code for code, value in enumerate(self._dtypes[field].categories)}
+        new = sorted(value for value in dict.fromkeys(values) if value not in lookup)
+        if new:
+            # New categories go at the end, sorted as to_rule_schema does, so the codes already stored stay valid
+            categories = list(self._dtypes[field].categories) + new
+            lookup.update((value, code) for code, value in enumerate(categories) if value in new)
+            self._dtypes[field] = pd.CategoricalDtype(categories)
+            dtype = _codes_dtype(len(categories))
+            if dtype != self._codes[field].dtype:
+                self._codes[field] = self._codes[field].astype(dtype)
+                self._shared.discard(field)
+        return np.fromiter((lookup[value] for value in values), dtype=self._codes[field].dtype, count=len(values))
+
+    def _writable_codes(self, field):
+        if field in self._shared:
+            self._codes[field] = self._codes[field].copy()
+            self._shared.discard(field)
+        return self._codes[field]
+
+    def _grow(self, needed):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity + capacity // 2)
+        ids = np.arange(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._ids = ids
+        for field, codes in self._codes.items():
+            grown = np.empty(capacity, dtype=codes.dtype)
+            grown[:self._size] = codes[:self._size]
+            self._codes[field] = grown
+        self._shared.clear()
+
+    def get(self, row_id):
+        position = int(self._positions([row_id])[0])
+        record = {}
+        for field in FIELDS:
+            if field in CATEGORICAL_FIELDS:
+                record[field] = str(self._dtypes[field].categories[self._codes[field][position]])
+            else:
+                record[field] = str(self._text[field][position])
+        return record
+
+    def records(self, fields=None):
+        """Materialise rows as dicts; pass fields to limit the columns copied."""
+        frame = self.frame if fields is None else self.frame[list(fields)]
+        return frame.astype(object).to_dict("records")
+
+    def select(self, filters=None, contains=None, sort_by=None, ascending=True):
+        """Row ids of the rules matching every filter, in rulebook order or sorted by one field.
+
+        filters maps fields to the values to keep (an empty list keeps all),
+        contains maps fields to text that must appear in them, ignoring case.
+        Categorical fields sort in category order, i.e. configured options first.
+        """
+        frame = self.frame
+        mask = pd.Series(True, index=frame.index)
+        for field, values in (filters or {}).items():
+            if values:
+                mask &= frame[field].isin(values)
+        for field, text in (contains or {}).items():
+            if text:
+                mask &= as_text(frame[field]).str.contains(text, case=False, regex=False)
+        selected = frame.index[mask.to_numpy()]
+        if sort_by:
+            selected = frame.loc[selected, sort_by].sort_values(ascending=ascending, kind="stable").index
+        return selected
+
+    def append(self, record):
+        return self.extend(pd.DataFrame([record]))[0]
+
+    def extend(self, df):
+        """Append rows from any frame of FIELDS values; returns their new row ids."""
+        count = len(df)
+        start = self._size
+        self._grow(start + count)
+        frame = df.reindex(columns=list(FIELDS.keys()))
+        for field in CATEGORICAL_FIELDS:
+            # Rows past the current size are not part of any handed-out frame
+            self._codes[field][start:start + count] = self._encode(field, as_text(frame[field]).tolist())
+        for field in TEXT_FIELDS:
+            text = self._text[field]
+            text = type(text)._concat_same_type([text, as_text(frame[field]).astype(text.dtype).array])
+            if text.dtype.storage == "pyarrow" and text.__arrow_array__().num_chunks > MAX_TEXT_CHUNKS:
+                text = type(text)(text.__arrow_array__().combine_chunks(), dtype=text.dtype)
+            self._text[field] = text
+        row_ids = list(range(self._next_id, self._next_id + count))
+        self._ids[start:start + count] = row_ids
+        self._size += count
+        self._next_id += count
+        self._changed()
+        return row_ids
+
+    def update(self, row_id, values):
+        self.update_columns(pd.DataFrame([values], index=[row_id]))
+
+    def update_columns(self, df):
+        """Overwrite fields in bulk from a frame indexed by row id whose columns are FIELDS names."""
+        positions = self._positions(df.index)
+        for field in df.columns:
+            values = as_text(df[field])
+            if field in CATEGORICAL_FIELDS:
+                codes = self._encode(field, values.tolist())
+                self._writable_codes(field)[positions] = codes
+            else:
+                column = pd.Series(self._text[field]).copy()
+                column.iloc[positions] = values.to_numpy()
+                self._text[field] = column.array
+        self._changed()
+
+    def delete(self, row_ids):
+        keep = np.ones(self._size, dtype=bool)
+        keep[self._positions(list(row_ids))] = False
+        size = int(keep.sum())
+        capacity = max(MIN_CAPACITY, size + size // 2)
+        ids = np.arange(capacity, dtype=np.int64)
+        ids[:size] = self._ids[:self._size][keep]
+        self._ids = ids
+        for field, codes in self._codes.items():
+            kept = np.empty(capacity, dtype=codes.dtype)
+            kept[:size] = codes[:self._size][keep]
+            self._codes[field] = kept
+        for field, text in self._text.items():
+            self._text[field] = text[keep]
+        self._contiguous = self._contiguous and size == self._size
+        self._size = size
+        self._shared.clear()
+        self._changed()
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app modules are flat scripts run from the repo root and DDLC/, not an installed package
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "DDLC"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+@pytest.fixture
+def make_rules():
+    """Factory for reproducible synthetic rulebooks: make_rules(rows, duplicate_rate, invalid_name_rate, seed)."""
+    from synthetic import make_rulebook
+
+    return make_rulebook
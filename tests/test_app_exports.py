@@ -0,0 +1,67 @@
+import io
+import os
+
+import pytest
+
+from rule_io import read_rules_parquet
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dqc_app.py")
+
+@pytest.fixture
+def deferred(monkeypatch):
+    """file_id -> data callable of every download button rendered in the test."""
+    from streamlit.runtime.media_file_manager import MediaFileManager
+
+    callables = {}
+    add_deferred = MediaFileManager.add_deferred
+
+    def record(self, data_callable, *args, **kwargs):
+        file_id = add_deferred(self, data_callable, *args, **kwargs)
+        callables[file_id] = data_callable
+        return file_id
+
+    monkeypatch.setattr(MediaFileManager, "add_deferred", record)
+    return callables
+
+@pytest.fixture
+def app(deferred):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=60).run()
+    assert not app.exception
+    return app
+
+def add_rule(app, table):
+    app.text_input(key="form_appl_cd").set_value("EMM_PAY").run()
+    app.text_input(key="form_rule_trgt_obj_id_txt").set_value(table).run()
+    next(button for button in app.button if "Add Rule" in button.label).click().run()
+    assert not app.exception
+
+def exports(app, deferred):
+    """The data callables of the app's download buttons, by label."""
+    return {button.proto.label: deferred[button.proto.deferred_file_id] for button in app.get("download_button")}
+
+def test_export_follows_the_rulebook_version(app, deferred, monkeypatch):
+    import rule_io
+
+    serialised = []
+    iter_rules_csv = rule_io.iter_rules_csv
+    monkeypatch.setattr(rule_io, "iter_rules_csv", lambda frame: serialised.append(len(frame)) or iter_rules_csv(frame))
+
+    add_rule(app, "FIRST")
+    first = exports(app, deferred)
+    csv_first = first["📥 Download CSV"]()
+    assert first["📥 Download CSV"]() == csv_first
+    assert serialised == [1]  # built once for the version
+    assert b"FIRST_" in csv_first
+
+    add_rule(app, "SECOND")
+    second = exports(app, deferred)
+    csv_second = second["📥 Download CSV"]()
+    assert csv_second != csv_first and b"SECOND_" in csv_second
+    # A callable from the earlier run still exports the snapshot it was given
+    assert first["📥 Download CSV"]() == csv_first
+    assert serialised == [1, 2]
+
+    parquet = read_rules_parquet(io.BytesIO(second["📦 Download Parquet"]()))
+    assert list(parquet["RULE_TRGT_OBJ_ID_TXT"].astype(str)) == ["FIRST", "SECOND"]
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from rule_io import rules_to_csv
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dqc_app.py")
+
+@pytest.fixture
+def app():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=60).run()
+    assert not app.exception
+    return app
+
+def upload(app, name, rulebook):
+    app.file_uploader[0].set_value((name, rules_to_csv(rulebook).encode("utf-8"), "text/csv")).run()
+    assert not app.exception
+
+def test_upload_drops_the_previous_rulebooks_errors(app, make_rules):
+    upload(app, "first.csv", make_rules(400, duplicate_rate=0.2, invalid_name_rate=0.5, seed=1))
+    first_report = app.session_state.all_validation_errors
+    assert len(first_report) > 150
+    app.number_input(key="all_errors_page").set_value(3).run()
+    # Errors from an earlier table edit also belong to the old rulebook
+    app.session_state.auto_validation_errors = first_report
+    app.run()
+
+    upload(app, "second.csv", make_rules(300, invalid_name_rate=0.5, seed=2))
+    assert len(app.session_state.rules) == 300
+    assert "auto_validation_errors" not in app.session_state
+    second_report = app.session_state.all_validation_errors
+    assert len(second_report) > 100 and second_report["row"].max() <= 300
+    assert app.number_input(key="all_errors_page").value == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from rule_generation import (AUTO_FIX_FIELDS, RULE_NM_PLACEHOLDER, auto_fix_changes, auto_fix_frame,
+                             derive_all_auto_fields, derive_description)
+from rule_store import RuleStore, to_rule_schema
+
+@pytest.fixture
+def frame(make_rules):
+    return RuleStore(to_rule_schema(make_rules(300, invalid_name_rate=0.2))).frame
+
+def is_concrete(name):
+    return name != RULE_NM_PLACEHOLDER and "(" not in name
+
+def test_auto_fix_is_a_no_op_on_a_fixed_frame(frame):
+    fixed = auto_fix_frame(frame)
+    assert auto_fix_changes(fixed, auto_fix_frame(fixed)).empty
+    assert auto_fix_changes(frame, frame).empty
+
+def test_auto_fix_matches_the_form_derivations(frame):
+    fixed = auto_fix_frame(frame)
+    for row_id, record in zip(frame.index, frame.astype(str).to_dict("records")):
+        derived = derive_all_auto_fields(record)
+        if not is_concrete(derived["RULE_NM"]):
+            # The existing name is kept and only its description regenerated
+            derived["RULE_NM"] = record["RULE_NM"]
+            derived.update(derive_description({**record, **derived}))
+        assert {field: fixed.at[row_id, field] for field in AUTO_FIX_FIELDS} == derived
+
+def test_auto_fix_changes_lists_each_changed_cell(frame):
+    fixed = auto_fix_frame(frame)
+    row_id = next(row_id for row_id in fixed.index if is_concrete(derive_all_auto_fields(fixed.loc[row_id].astype(str).to_dict())["RULE_NM"]))
+    broken = fixed.copy()
+    broken.loc[row_id, "RULE_ABORT_IND"] = "N" if fixed.at[row_id, "RULE_ABORT_IND"] == "Y" else "Y"
+    broken.loc[row_id, "RULE_NM"] = "WRONG_NAME"
+    changes = auto_fix_changes(broken, auto_fix_frame(broken))
+    assert list(changes.columns) == ["row", "field", "before", "after"]
+    assert set(changes["row"]) == {row_id}
+    by_field = changes.set_index("field")
+    assert by_field.loc["RULE_ABORT_IND", "after"] == fixed.at[row_id, "RULE_ABORT_IND"]
+    assert (by_field.loc["RULE_NM", "before"], by_field.loc["RULE_NM", "after"]) == ("WRONG_NAME", fixed.at[row_id, "RULE_NM"])
@@ -0,0 +1,28 @@
+import os
+
+from dqc.batch import validate_files
+from dqc.cli import expand_paths
+from rule_io import rules_to_csv
+
+def write_rules(path, rulebook):
+    path.write_text(rules_to_csv(rulebook), encoding="utf-8")
+    return str(path)
+
+def test_file_listed_twice_is_validated_once(tmp_path, make_rules):
+    path = write_rules(tmp_path / "rules.csv", make_rules(20))
+    paths = expand_paths([str(tmp_path), path, os.path.join(str(tmp_path), ".", "rules.csv")])
+    assert paths == [path]
+    [result] = validate_files(paths + [path], jobs=1)
+    assert result["rules"] == 20
+    assert not [error for error in result["errors"] if error["error_code"].endswith("_ACROSS_FILES")]
+
+def test_rules_repeated_in_another_file_are_cross_file_duplicates(tmp_path, make_rules):
+    rulebook = make_rules(20)
+    rulebook["RULE_NM"] = [f"T{position}_DL2_CNT_CHK" for position in range(20)]
+    first = write_rules(tmp_path / "first.csv", rulebook)
+    second = write_rules(tmp_path / "second.csv", rulebook.head(3))
+    results = validate_files([first, second], jobs=1)
+    for result, other in zip(results, ["second.csv", "first.csv"]):
+        across = [error for error in result["errors"] if error["error_code"] == "RULE_NM_DUPLICATE_ACROSS_FILES"]
+        assert [error["row"] for error in across] == [1, 2, 3]
+        assert all(f"Also in: {other} row" in error["message"] for error in across)
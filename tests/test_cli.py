@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from dqc.cli import EXIT_ERROR, EXIT_INVALID, EXIT_OK, main
+from rule_io import rules_to_csv
+
+@pytest.fixture
+def rule_file(tmp_path, make_rules):
+    def write(relative_path, rows=5, seed=0, invalid_name_rate=0.0):
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rules_to_csv(make_rules(rows, invalid_name_rate=invalid_name_rate, seed=seed)), encoding="utf-8")
+        return str(path)
+    return write
+
+def test_validate_reports_errors(rule_file, tmp_path):
+    path = rule_file("rules.csv", invalid_name_rate=1.0)
+    report = tmp_path / "report.json"
+    assert main(["validate", path, "--report", str(report), "-q"]) == EXIT_INVALID
+    summary = json.loads(report.read_text(encoding="utf-8"))["summary"]
+    assert summary["files"] == 1 and summary["rules"] == 5 and summary["errors"] >= 5
+
+def test_normalize_writes_each_input(rule_file, tmp_path):
+    first, second = rule_file("a/one.csv"), rule_file("b/two.csv", seed=1)
+    output_dir = tmp_path / "out"
+    assert main(["normalize", first, second, "--output-dir", str(output_dir), "-q"]) == EXIT_OK
+    assert sorted(os.listdir(output_dir)) == ["one.csv", "two.csv"]
+
+def test_normalize_refuses_colliding_outputs(rule_file, tmp_path, capsys):
+    first, second = rule_file("a/rules.csv"), rule_file("b/rules.csv", seed=1)
+    output_dir = tmp_path / "out"
+    assert main(["normalize", first, second, "--output-dir", str(output_dir)]) == EXIT_ERROR
+    assert not output_dir.exists()
+    assert "would be written by each of" in capsys.readouterr().err
+
+def test_normalize_in_place_rewrites_inputs(rule_file, tmp_path):
+    path = rule_file("rules.csv")
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write("\n")
+    size = os.path.getsize(path)
+    assert main(["normalize", path, "--in-place", "-q"]) == EXIT_OK
+    assert os.path.getsize(path) == size - 1
+    assert os.listdir(tmp_path) == ["rules.csv"]
+
+def test_normalize_needs_a_destination(rule_file):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["normalize", rule_file("rules.csv")])
+    assert exit_info.value.code == EXIT_ERROR
+
+@pytest.mark.parametrize("jobs", ["-1", "0", "x"])
+def test_validate_rejects_bad_jobs(rule_file, jobs, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["validate", rule_file("rules.csv"), "--jobs", jobs])
+    assert exit_info.value.code == EXIT_ERROR
+    assert "--jobs" in capsys.readouterr().err
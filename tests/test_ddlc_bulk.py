@@ -0,0 +1,115 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import ddlc_bulk
+from ddlc_bulk import (build_bulk_foundation_mappings, build_foundation_mappings, build_information_mappings,
+                       derive_source_table, parse_ddl_files, read_ddl_upload, read_dbt_project_zip, replace_table_mappings,
+                       scan_dbt_models, split_ddl_script)
+from ddlc_parsing import UNKNOWN_TRANSFORMATION
+from synthetic import make_ddl_dump
+
+TIMESTAMP = datetime(2024, 1, 1)
+
+def foundation(table, columns):
+    return build_foundation_mappings(columns, "SRC_DB", "SRC", table, "FND_DB", "FND", table, TIMESTAMP)
+
+def test_read_ddl_upload_zip_keeps_ddl_files():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("b/two.sql", "CREATE TABLE B (y INT);")
+        archive.writestr("a/one.DDL", "CREATE TABLE A (x INT);")
+        archive.writestr("a/.hidden.sql", "CREATE TABLE H (h INT);")
+        archive.writestr("notes.md", "not ddl")
+    assert read_ddl_upload("dump.zip", buffer.getvalue()) == [
+        ("a/one.DDL", "CREATE TABLE A (x INT);"), ("b/two.sql", "CREATE TABLE B (y INT);")]
+    assert read_ddl_upload("one.sql", "\ufeffCREATE TABLE A (x INT);".encode("utf-8")) == [
+        ("one.sql", "CREATE TABLE A (x INT);")]
+
+def test_split_ddl_script_cuts_at_create():
+    script = make_ddl_dump(12, 3)
+    parts = split_ddl_script(script, 4)
+    assert 1 < len(parts) <= 4
+    assert "".join(parts) == script
+    assert all(part.lstrip().upper().startswith("CREATE") for part in parts[1:])
+    assert split_ddl_script(script, 1) == [script]
+
+def test_parse_ddl_files_parallel_matches_serial(monkeypatch):
+    files = [("one.sql", make_ddl_dump(30, 4)), ("two.sql", "CREATE TABLE T (k VARCHAR);")]
+    serial = parse_ddl_files(files)
+    monkeypatch.setattr(ddlc_bulk, "PARALLEL_PARSE_MIN_CHARS", 0)
+    with ThreadPoolExecutor(2) as executor:
+        assert parse_ddl_files(files, executor, workers=2) == serial
+    assert len(serial) == 31 and serial[-1] == ("two.sql", "T", [("k", "VARCHAR")])
+
+def test_derive_source_table():
+    assert derive_source_table("fnd_orders", "FND_", "DL2_") == "DL2_orders"
+    assert derive_source_table("ORDERS", "FND_", "DL2_") == "DL2_ORDERS"
+
+def test_build_foundation_mappings_appends_audit_columns():
+    mappings = foundation("A", [("X", "INT")])
+    assert [m["target_field"] for m in mappings] == ["X", "LOAD_TS", "LOAD_DT", "ETL_CREA_NR"]
+    assert mappings[0]["transformation_logic"] == "Straight Move" and mappings[0]["source_field"] == ""
+    assert all(m["source_field"] == "N/A" for m in mappings[1:])
+
+def test_build_bulk_foundation_mappings_summary():
+    parsed = [("one.sql", "DB.S.FND_A", [("X", "INT")]), ("one.sql", "FND_E", []),
+              ("two.sql", "FND_A", [("X", "INT"), ("Y", "DATE")])]
+    mappings, summary = build_bulk_foundation_mappings(parsed, "SRC_DB", "SRC", "FND_DB", "FND", "FND_", "DL2_")
+    assert summary == {"tables": [("FND_A", "DL2_A", 2, "two.sql")], "redefined": ["FND_A"], "empty": ["FND_E"]}
+    assert len(mappings) == 2 + 3
+    assert {m["source_table"] for m in mappings} == {"DL2_A"}
+
+DBT_MODEL = """{{ config(materialized='table', alias='dim_orders', scd_type=2) }}
+-- %s
+SELECT o.id AS ORDER_ID,
+       CAST(o.amount AS NUMBER) AS AMOUNT
+FROM {{ ref('stg_orders') }} o JOIN {{ source('raw', 'customers') }} c ON o.cid = c.id"""
+
+def test_read_dbt_project_zip_reads_models_only():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("proj/models/marts/b.sql", "SELECT 1 AS b")
+        archive.writestr("proj/models/a.sql", "SELECT 1 AS a")
+        archive.writestr("proj/macros/m.sql", "{% macro m() %}{% endmacro %}")
+        archive.writestr("proj/models/schema.yml", "version: 2")
+    assert read_dbt_project_zip(buffer.getvalue()) == [("a.sql", "SELECT 1 AS a"), ("marts/b.sql", "SELECT 1 AS b")]
+
+def test_scan_dbt_models_describes_and_caches():
+    models = [("marts/orders.sql", DBT_MODEL % "scan test"), ("plain.sql", "SELECT x AS y FROM t -- scan test")]
+    first = scan_dbt_models(models)
+    assert first[0]["target_table"] == "DIM_ORDERS" and first[0]["source_table"] == "STG_ORDERS"
+    assert first[0]["table_type"] == "TYPE 2"
+    assert first[0]["refs"] == ["stg_orders"] and first[0]["sources"] == ["customers"]
+    assert [target for _, target, _ in first[0]["field_mappings"]] == ["ORDER_ID", "AMOUNT"]
+    assert first[1]["target_table"] == "PLAIN" and first[1]["source_table"] == ""
+    assert first[1]["table_type"] == "TYPE 1"
+    assert [result["cached"] for result in first] == [False, False]
+    again = scan_dbt_models(models)
+    assert [result["cached"] for result in again] == [True, True]
+    assert [result["field_mappings"] for result in again] == [result["field_mappings"] for result in first]
+
+def test_build_information_mappings_appends_audit_columns():
+    mappings = build_information_mappings([("a", "A", "Direct mapping"), ("UNKNOWN", "B", "anything")], "TYPE 1",
+                                          "FND_DB", "FND", "SRC", "INF_DB", "INF", "TGT", TIMESTAMP)
+    assert [m["target_field"] for m in mappings][:2] == ["A", "B"]
+    assert len(mappings) > 2 and all(m["target_data_type"] == "TYPE 1" for m in mappings)
+    assert mappings[1]["source_table"] == "SRC" and mappings[1]["transformation_logic"] == UNKNOWN_TRANSFORMATION
+
+def test_replace_table_mappings_replaces_loaded_tables():
+    first = foundation("A", [("X", "INT")])
+    other = foundation("B", [("Y", "INT")])
+    mappings, replaced = replace_table_mappings([], first + other)
+    assert replaced == []
+
+    reloaded = foundation("A", [("X", "INT"), ("Z", "DATE")])
+    mappings, replaced = replace_table_mappings(mappings, reloaded)
+    assert replaced == ["A"]
+    assert mappings == other + reloaded
+
+def test_replace_table_mappings_keeps_other_layers():
+    dl2 = foundation("A", [("X", "INT")])
+    information = [dict(mapping, layer_transition="Foundation_to_Information") for mapping in dl2]
+    mappings, replaced = replace_table_mappings(information, foundation("A", [("X", "INT")]))
+    assert replaced == [] and len(mappings) == 2 * len(dl2)
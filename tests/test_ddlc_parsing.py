@@ -0,0 +1,79 @@
+import os
+
+from ddlc_parsing import UNKNOWN_TRANSFORMATION, parse_dbt_script, parse_ddl_script, parse_ddl_tables
+from synthetic import make_ddl_dump
+
+SQL_TEST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DDLC", "sql_test")
+
+def read_sql_test():
+    with open(SQL_TEST, encoding="utf-8") as handle:
+        return handle.read()
+
+DDL_SCRIPT = """-- dump
+CREATE OR REPLACE TRANSIENT TABLE DB.S.A (
+  ID NUMBER(38, 0) NOT NULL,
+  "Name" VARCHAR(100) DEFAULT 'x,y',
+  AMT NUMBER (18,2), /* note ( */
+  CONSTRAINT PK_A PRIMARY KEY (ID)
+);
+create table if not exists b (x int, y double precision, z timestamp_ntz(9));
+CREATE VIEW V AS SELECT 1 AS c;
+CREATE TABLE C (k VARCHAR);"""
+
+def test_ddl_multi_table_script():
+    assert parse_ddl_tables(DDL_SCRIPT) == [
+        ("DB.S.A", [("ID", "NUMBER(38,0)"), ("Name", "VARCHAR(100)"), ("AMT", "NUMBER(18,2)")]),
+        ("b", [("x", "int"), ("y", "double precision"), ("z", "timestamp_ntz(9)")]),
+        ("C", [("k", "VARCHAR")]),
+    ]
+    assert parse_ddl_script(DDL_SCRIPT) == parse_ddl_tables(DDL_SCRIPT)[0][1]
+
+def test_ddl_bare_column_list():
+    assert parse_ddl_script("(a INT, b VARCHAR(5))") == [("a", "INT"), ("b", "VARCHAR(5)")]
+
+def test_ddl_synthetic_dump():
+    tables = parse_ddl_tables(make_ddl_dump(20, 15))
+    assert len(tables) == 20
+    assert all(len(columns) == 15 for _, columns in tables)
+
+def test_ddl_sql_test():
+    tables = parse_ddl_tables(read_sql_test())
+    assert [name for name, _ in tables] == ["QCFOPAYMENTSDB.APP_CFOPYMTS.STRIPE_CUSTOMERS"]
+    columns = tables[0][1]
+    assert len(columns) == 40
+    assert columns[:3] == [("BATCH_TIMESTAMP", "TIMESTAMP_NTZ(9)"), ("MERCHANT_ID", "VARCHAR(16777216)"),
+                           ("ACCOUNT_BALANCE", "NUMBER(38,0)")]
+    assert ("DELINGUENT", "BOOLEAN") in columns
+
+def test_dbt_select_list_items():
+    script = ("SELECT a AS b, CAST(x AS INT) AS y, CASE WHEN z = 1 THEN 'a' ELSE 'b' END AS c, "
+              "'lit' AS l FROM t WHERE a = 1")
+    assert parse_dbt_script(script) == [
+        ("a", "b", "Direct mapping"),
+        ("UNKNOWN", "y", UNKNOWN_TRANSFORMATION),
+        ("UNKNOWN", "c", UNKNOWN_TRANSFORMATION),
+        ("UNKNOWN", "l", UNKNOWN_TRANSFORMATION),
+    ]
+
+def test_dbt_ctes_and_scalar_subqueries():
+    script = "WITH s AS (SELECT q AS r FROM t) SELECT (SELECT MAX(k) AS inner_k FROM u) AS m, s.r AS r2 FROM s"
+    assert [target for _, target, _ in parse_dbt_script(script)] == ["r", "m", "r2"]
+
+def test_dbt_macro_and_typo_alias():
+    script = ("SELECT {{ handle_empty_or_null_value(chk_type='VARCHAR', length=5, first_val='A') }} AS A2, "
+              "b AS B2 C FROM t")
+    assert parse_dbt_script(script) == [
+        ("A", "A2", "Transform A to VARCHAR(5); Replace NULL values with '!'"),
+        ("b", "B2", "Direct mapping"),
+    ]
+
+def test_dbt_bare_select_lists_across_statements():
+    assert [target for _, target, _ in parse_dbt_script("a AS x, b AS y; c AS z")] == ["x", "y", "z"]
+
+def test_dbt_sql_test_reads_past_the_ddl():
+    script = read_sql_test()
+    field_mappings = parse_dbt_script(script)
+    assert field_mappings == parse_dbt_script(script[script.index("{{"):])
+    assert len(field_mappings) == 9
+    assert field_mappings[0] == ("ACCOUNT_HOLDER_FULL_NM", "ACCT_HOLD_FULL_NM",
+                                 "Transform ACCOUNT_HOLDER_FULL_NM to VARCHAR(150); Replace NULL values with '!'")
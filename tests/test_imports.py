@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+@pytest.mark.parametrize("module", ["validation", "rule_generation", "dqc.cli"])
+def test_module_loads_without_pandas(module):
+    probe = f"import sys; import {module}; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
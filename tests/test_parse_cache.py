@@ -0,0 +1,45 @@
+import pytest
+
+import ddlc_parsing
+from ddlc_parsing import ParseCache, cached_parse_dbt_script, cached_parse_ddl_tables, parse_ddl_tables, script_digest
+
+@pytest.fixture(autouse=True)
+def empty_parse_cache():
+    ddlc_parsing.parse_cache.clear()
+    yield
+    ddlc_parsing.parse_cache.clear()
+
+def test_hit_and_miss():
+    cache = ParseCache(2)
+    assert cache.get("a") is None and "a" not in cache
+    cache.put("a", 1)
+    assert cache.get("a") == 1 and "a" in cache
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_put_replaces_and_evicts_least_recently_used():
+    cache = ParseCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 3)
+    assert cache.get("a") == 3 and len(cache) == 2
+    cache.get("b")
+    cache.put("c", 4)
+    # "a" was used least recently: put("a") came before get("b")
+    assert "a" not in cache and cache.get("b") == 2 and cache.get("c") == 4
+
+def test_cached_ddl_parse_is_shared_and_read_only():
+    script = "CREATE TABLE T (\n  A INT,\n  B VARCHAR(5)\n);"
+    tables = cached_parse_ddl_tables(script)
+    assert tables == (("T", (("A", "INT"), ("B", "VARCHAR(5)"))),)
+    assert [(name, list(columns)) for name, columns in tables] == parse_ddl_tables(script)
+    # Whitespace the parser ignores gives the same key
+    assert cached_parse_ddl_tables("\r\n" + script.replace("\n", "  \r\n") + "  \n") is tables
+    assert ddlc_parsing.parse_cache.hits == 1
+
+def test_cached_dbt_parse_keys_by_kind():
+    script = "SELECT a AS b FROM t"
+    field_mappings = cached_parse_dbt_script(script)
+    assert field_mappings == (("a", "b", "Direct mapping"),)
+    assert cached_parse_dbt_script(script) is field_mappings
+    assert ("DBT", script_digest(script)) in ddlc_parsing.parse_cache
+    assert ("DDL", script_digest(script)) not in ddlc_parsing.parse_cache
@@ -0,0 +1,51 @@
+import tracemalloc
+
+import pytest
+
+from profiling import StageProfiler
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc is already running")
+    yield
+    assert not tracemalloc.is_tracing()
+
+def test_stage_records_calls_and_peak():
+    profiler = StageProfiler(enabled=True)
+    for _ in range(2):
+        with profiler.stage("build"):
+            data = bytearray(2_000_000)
+            del data
+    [record] = profiler.records()
+    assert record["stage"] == "build" and record["calls"] == 2
+    assert record["peak_bytes"] >= 2_000_000
+    profiler.set_enabled(False)
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler()
+    with profiler.stage("build"):
+        pass
+    assert profiler.records() == [] and not tracemalloc.is_tracing()
+
+def test_tracing_stops_with_the_last_profiler():
+    first, second = StageProfiler(enabled=True), StageProfiler(enabled=True)
+    with first.stage("a"):
+        with second.stage("b"):
+            first.set_enabled(False)
+            assert tracemalloc.is_tracing()
+            data = bytearray(1_000_000)
+            del data
+    assert second.records()[0]["peak_bytes"] >= 1_000_000
+    assert tracemalloc.is_tracing()
+    second.set_enabled(False)
+    assert not tracemalloc.is_tracing()
+
+def test_finish_run_starts_a_new_run():
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage("a"):
+        pass
+    run = profiler.finish_run(rules=3)
+    assert run["rules"] == 3 and [record["stage"] for record in run["stages"]] == ["a"]
+    assert profiler.records() == []
+    profiler.set_enabled(False)
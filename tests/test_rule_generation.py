@@ -0,0 +1,45 @@
+from rule_generation import generate_rule_description, generate_rule_name
+
+def test_description_for_lowercase_table_keeps_layer():
+    name = generate_rule_name("tbl", "CNT_CHK", "CFOPAYMENTSDB", "DL2")
+    assert generate_rule_description(name, "CNT_CHK", "NA", "tbl") == "Performs count check on DL2 table tbl."
+
+def test_description_for_dotted_table_keeps_layer():
+    assert (generate_rule_description("my.tbl-1_FND_DL3_SUM_CHK", "SUM_CHK", "AMT", "my.tbl-1")
+            == "Performs sum check on AMT on foundation table my.tbl-1.")
+
+def test_description_branches():
+    assert (generate_rule_description("T_OP_HOP1_DL2_DIFF_CNT_CHK", "DIFF_CNT_CHK", "NA", "T")
+            == "Performs difference count check between OnPrem CSV Records (HOP1) and DL2 table")
+    assert (generate_rule_description("T_INFO_DL3_DUP_CHK", "DUP_CHK", "NA", "T")
+            == "Performs Duplicate check on information DL3 table T.")
+    assert generate_rule_description("T_CHECK", "CNT_CHK", "NA", "T") == "Performs count check on table T."
+
+def test_rule_name_components():
+    assert generate_rule_name("tbl", "CNT_CHK", "CFOPAYMENTSDB", "DL2") == "tbl_DL2_CNT_CHK"
+    assert generate_rule_name("T", "DIFF_SUM_CHK", "CFOPAYMENTSDB", "OnPrem") == "T_OP_(HOP3_HOP2|HOP2_HOP1)_DIFF_SUM_CHK"
+    assert generate_rule_name("T", "SUM_CHK", "CFOINFODMDB", "DL3") == "T_(STG|INFO)_DL3_SUM_CHK"
+    assert generate_rule_name("T", "DUP_CHK", "CFOPAYMENTSDB", "DL2") == "T_UNKNOWN_DUP_CHK"
+    assert generate_rule_name("T", "CNT_CHK", "OTHERDB", "DL2") == "T_UNKNOWN_CNT_CHK"
+
+def test_search_classifier_agrees_with_validation_classifier():
+    from validation import RuleNameClass, classify_rule_name, search_rule_name_class
+
+    for name in ["T_OP_HOP3_HOP2_DIFF_SUM_CHK", "T_FND_DL3_CNT_CHK", "T_INFO_DL3_OVERLAP_CHK", "T_DL2_FND_DIFF_CNT_CHK"]:
+        assert search_rule_name_class(name) == classify_rule_name(name) is not None
+    assert classify_rule_name("tbl_DL2_CNT_CHK") is None
+    assert search_rule_name_class("tbl_DL2_CNT_CHK") == RuleNameClass("DL2", "CNT_CHK", False)
+    assert search_rule_name_class("T_CHECK") is None
+
+def test_form_derivations():
+    from rule_generation import derive_all_auto_fields, derive_database_for_layer
+
+    record = {"RULE_VALID_METH_CD": "SUM_CHK", "RULE_TRGT_ATTR_NM": "NA", "RULE_TRGT_OBJ_ID_TXT": "T",
+              "RULE_TRGT_DB_NM": "CFOPAYMENTSDB", "RULE_TRGT_DATA_LAYER_NM": "DL2"}
+    assert derive_all_auto_fields(record) == {
+        "RULE_ABORT_IND": "N", "RULE_TRGT_ATTR_NM": "", "RULE_NM": "T_DL2_SUM_CHK",
+        "RULE_DSC_TXT": "Performs sum check on DL2 table T."}
+    derived = derive_all_auto_fields(record | {"RULE_VALID_METH_CD": "DUP_CHK", "RULE_TRGT_DATA_LAYER_NM": "DL3"})
+    assert (derived["RULE_ABORT_IND"], derived["RULE_TRGT_ATTR_NM"], derived["RULE_NM"]) == ("Y", "NA", "T_FND_DL3_DUP_CHK")
+    derived = derive_database_for_layer(record | {"RULE_TRGT_DB_NM": "CFOINFODMDB", "RULE_TRGT_DATA_LAYER_NM": "OnPrem_HOP1"})
+    assert (derived["RULE_TRGT_DB_NM"], derived["RULE_NM"]) == ("CFOPAYMENTSDB", "T_OP_HOP1_SUM_CHK")
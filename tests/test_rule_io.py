@@ -0,0 +1,19 @@
+import io
+
+import pandas as pd
+
+from config import FIELDS
+from rule_io import iter_rule_chunks
+
+def test_chunks_keep_text_codes_and_file_positions():
+    text = "APPL_CD~RULE_NM~RULE_SEQ_NR~EXTRA\nna~t_dl2_cnt_chk~0012~x\nNA~T2~~y\nab~t3~7~z\n"
+    chunks = list(iter_rule_chunks(io.StringIO(text), chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    frame = pd.concat(chunks)
+    assert list(frame.columns) == list(FIELDS)
+    assert list(frame.index) == [0, 1, 2]
+    assert list(frame["APPL_CD"]) == ["NA", "NA", "AB"]
+    assert list(frame["RULE_NM"]) == ["T_DL2_CNT_CHK", "T2", "T3"]
+    assert list(frame["RULE_SEQ_NR"]) == ["0012", "", "7"]
+    assert (frame["ASSET_NM"] == "").all()
@@ -0,0 +1,54 @@
+import pytest
+
+from config import FIELDS
+from rule_search import RuleSearchIndex
+from rule_store import RuleStore
+
+def rule(name, target="T", category=None, sequence="1", logic=""):
+    category = category or FIELDS["RULE_VALID_CTGY_NM"][0]
+    return {"RULE_NM": name, "RULE_TRGT_OBJ_ID_TXT": target, "RULE_VALID_CTGY_NM": category,
+            "RULE_SEQ_NR": sequence, "RULE_LOGIC_TXT": logic}
+
+@pytest.fixture
+def store():
+    store = RuleStore.from_records([
+        rule("PAY_DL2_CNT_CHK", sequence="1", logic="select count(*) from pay"),
+        rule("PAY_DL2_SUM_CHK", sequence="2"),
+        rule("PAYMENT_FND_DL3_CNT_CHK", sequence="4"),
+        rule("FIN_DL2_CNT_CHK", target="FIN", sequence="1"),
+        rule("PAY", sequence="5", logic="PAYMENT totals"),
+    ])
+    store.delete([1])
+    return store
+
+def test_search_is_case_insensitive_and_in_rulebook_order(store):
+    index = RuleSearchIndex(store.frame)
+    assert list(index.search("pay")) == [0, 2, 4]
+    assert list(index.search("count(*)")) == [0]
+    assert list(index.search("PAY", limit=2)) == [0, 2]
+    assert list(index.search("")) == []
+    assert list(index.search("\x00")) == []
+
+def test_prefix_bisects_sorted_values(store):
+    index = RuleSearchIndex(store.frame)
+    assert list(index.prefix("pay")) == [0, 2, 4]
+    assert list(index.prefix("PAYM")) == [2, 4]
+    assert list(index.prefix("PAY_DL2")) == [0]
+    assert list(index.prefix("PAYZ")) == []
+    assert list(index.prefix("FIN", fields=["RULE_NM"])) == [3]
+
+def test_lookup(store):
+    index = RuleSearchIndex(store.frame)
+    assert list(index.lookup("RULE_TRGT_OBJ_ID_TXT", "T")) == [0, 2, 4]
+    assert list(index.lookup("RULE_TRGT_OBJ_ID_TXT", "MISSING")) == []
+
+def test_next_free_sequence_number_skips_used_numbers(store):
+    index = RuleSearchIndex(store.frame)
+    category = FIELDS["RULE_VALID_CTGY_NM"][0]
+    # Row 1 (sequence 2) was deleted, so 2 is free again; 3 is a gap
+    assert index.used_sequence_numbers("T", category) == {"1", "4", "5"}
+    assert index.next_free_sequence_number("T", category) == "2"
+    assert index.next_free_sequence_number("T", category, options=["1", "4", "3"]) == "3"
+    assert index.next_free_sequence_number("FIN", category) == "2"
+    assert index.next_free_sequence_number("NEW", category) == "1"
+    assert index.next_free_sequence_number("T", category, options=["1", "4", "5"]) is None
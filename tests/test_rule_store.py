@@ -0,0 +1,103 @@
+import io
+
+import pandas as pd
+import pytest
+
+from config import FIELDS
+from rule_io import iter_rule_chunks, read_rules_parquet, rules_to_csv, rules_to_parquet
+from rule_store import CATEGORICAL_FIELDS, TEXT_FIELDS, RuleStore, to_rule_schema
+
+@pytest.fixture
+def rulebook(make_rules):
+    return make_rules(500, duplicate_rate=0.05, invalid_name_rate=0.1)
+
+def as_strings(frame):
+    return frame.reset_index(drop=True).astype(str)
+
+def test_schema_is_categorical(rulebook):
+    frame = RuleStore(to_rule_schema(rulebook)).frame
+    assert list(frame.columns) == list(FIELDS)
+    assert all(isinstance(frame[field].dtype, pd.CategoricalDtype) for field in CATEGORICAL_FIELDS)
+    assert all(frame[field].dtype == "str" for field in TEXT_FIELDS)
+
+def test_categorical_round_trip(rulebook):
+    store = RuleStore(to_rule_schema(rulebook))
+    pd.testing.assert_frame_equal(as_strings(store.frame), as_strings(rulebook))
+    assert pd.DataFrame(store.records()).equals(as_strings(rulebook))
+    assert store.get(3) == as_strings(rulebook).iloc[3].to_dict()
+
+def test_csv_and_parquet_round_trip(rulebook):
+    store = RuleStore(to_rule_schema(rulebook))
+    from_csv = RuleStore.from_frames(iter_rule_chunks(io.StringIO(rules_to_csv(store.frame))))
+    # Uploads upper-case some free-text fields
+    pd.testing.assert_frame_equal(as_strings(from_csv.frame).map(str.upper), as_strings(store.frame).map(str.upper))
+    from_parquet = RuleStore(to_rule_schema(read_rules_parquet(io.BytesIO(rules_to_parquet(store.frame)))))
+    pd.testing.assert_frame_equal(as_strings(from_parquet.frame), as_strings(store.frame))
+    for field in CATEGORICAL_FIELDS:
+        assert isinstance(from_parquet.frame[field].dtype, pd.CategoricalDtype)
+
+def test_streamed_chunks_match_one_shot_store(rulebook):
+    data = rules_to_csv(RuleStore(to_rule_schema(rulebook)).frame)
+    one_shot = RuleStore(to_rule_schema(pd.concat(iter_rule_chunks(io.StringIO(data)))))
+    streamed = RuleStore.from_frames(iter_rule_chunks(io.StringIO(data), chunksize=64))
+    pd.testing.assert_frame_equal(as_strings(streamed.frame), as_strings(one_shot.frame))
+    assert list(streamed.row_ids) == list(range(len(rulebook)))
+    for field in CATEGORICAL_FIELDS:
+        assert isinstance(streamed.frame[field].dtype, pd.CategoricalDtype)
+        options = FIELDS[field] if isinstance(FIELDS[field], list) else []
+        assert list(streamed.frame[field].cat.categories[:len(options)]) == options
+
+def test_append_update_delete(rulebook):
+    store = RuleStore(to_rule_schema(rulebook.head(10)))
+    record = as_strings(rulebook).iloc[20].to_dict()
+    version = store.version
+    row_id = store.append(record | {"RULE_FREQ_CD": "NEW_FREQ"})
+    assert row_id == 10 and store.version != version
+    assert store.get(row_id)["RULE_FREQ_CD"] == "NEW_FREQ"
+    assert isinstance(store.frame["RULE_FREQ_CD"].dtype, pd.CategoricalDtype)
+
+    store.update(2, {"RULE_NM": "T_DL2_CNT_CHK", "RULE_VALID_METH_CD": "NEW_METHOD", "RULE_SEQ_NR": None})
+    assert store.get(2)["RULE_NM"] == "T_DL2_CNT_CHK"
+    assert store.get(2)["RULE_VALID_METH_CD"] == "NEW_METHOD"
+    assert store.get(2)["RULE_SEQ_NR"] == ""
+
+    store.delete([0, 5])
+    assert list(store.row_ids) == [1, 2, 3, 4, 6, 7, 8, 9, 10]
+    assert store.extend(pd.DataFrame([record, record])) == [11, 12]
+    assert store.get(11) == record
+    with pytest.raises(KeyError):
+        store.get(5)
+
+def test_update_columns(rulebook):
+    store = RuleStore(to_rule_schema(rulebook.head(10)))
+    store.update_columns(pd.DataFrame({"RULE_NM": ["A", "B"], "RULE_ACTV_IND": ["N", "NEW"]}, index=[2, 7]))
+    assert [store.get(row_id)["RULE_NM"] for row_id in (2, 7)] == ["A", "B"]
+    assert [store.get(row_id)["RULE_ACTV_IND"] for row_id in (2, 7)] == ["N", "NEW"]
+    assert as_strings(store.frame).drop(index=[2, 7]).equals(as_strings(rulebook.head(10)).drop(index=[2, 7]))
+
+def test_select_filters_and_sorts(rulebook):
+    store = RuleStore(to_rule_schema(rulebook))
+    selected = store.select({"RULE_ACTV_IND": ["Y"], "RULE_VALID_METH_CD": []}, {"RULE_NM": "tbl_000001"})
+    frame = as_strings(store.frame)
+    expected = frame.index[(frame["RULE_ACTV_IND"] == "Y") & frame["RULE_NM"].str.contains("TBL_000001")]
+    assert list(selected) == list(expected)
+    by_name = store.select(sort_by="RULE_NM", ascending=False)
+    assert list(frame.loc[by_name, "RULE_NM"]) == sorted(frame["RULE_NM"], reverse=True)
+
+def test_frames_handed_out_do_not_change(rulebook):
+    store = RuleStore(to_rule_schema(rulebook.head(50)))
+    frame = store.frame
+    before = as_strings(frame)
+    store.update(1, {"RULE_NM": "CHANGED", "RULE_ACTV_IND": "N"})
+    store.update_columns(pd.DataFrame({"RULE_VALID_CTGY_NM": ["X", "Y"]}, index=[3, 4]))
+    store.append(before.iloc[0].to_dict())
+    store.delete([7])
+    pd.testing.assert_frame_equal(as_strings(frame), before)
+    assert store.frame is not frame
+
+def test_many_appends(rulebook):
+    store = RuleStore()
+    records = as_strings(rulebook).to_dict("records")
+    for record in records:
+        store.append(record)
+    pd.testing.assert_frame_equal(as_strings(store.frame), as_strings(rulebook))
@@ -0,0 +1,35 @@
+import pytest
+
+from validation import (DUPLICATE_RULE_NM_ERROR, DUPLICATE_SEQUENCE_ERROR, find_duplicate_groups, validate_all,
+                        validate_dataframe, validate_single_row)
+
+@pytest.fixture
+def rows(make_rules):
+    rows = make_rules(300, duplicate_rate=0.05, invalid_name_rate=0.1).to_dict("records")
+    # Blank and short application codes, abort flags and sum attributes the other way round
+    rows[1] = dict(rows[1], APPL_CD="EMM_")
+    rows[2] = dict(rows[2], APPL_CD="AB")
+    rows[3] = dict(rows[3], RULE_VALID_METH_CD="SUM_CHK", RULE_ABORT_IND="Y", RULE_TRGT_ATTR_NM="NA")
+    rows[4] = dict(rows[4], RULE_VALID_METH_CD="DUP_CHK", RULE_ABORT_IND="N")
+    rows[5] = dict(rows[5], RULE_NM="T_DUPE_DL2_CNT_CHK")
+    rows[6] = dict(rows[6], RULE_NM="T_DUPE_DL2_CNT_CHK")
+    return rows
+
+def test_validate_all_matches_validate_single_row(rows):
+    assert validate_all(rows) == [validate_single_row(row, rows, is_new_row=False) for row in rows]
+
+def test_validate_dataframe_matches_validate_all(rows):
+    import pandas as pd
+
+    errors = validate_dataframe(pd.DataFrame(rows))
+    expected = [(position, error) for position, row_errors in enumerate(validate_all(rows)) for error in row_errors]
+    assert list(zip(errors["row_index"], errors["message"])) == expected
+
+def test_duplicates_are_reported_on_every_member(rows):
+    errors = validate_all(rows)
+    assert DUPLICATE_RULE_NM_ERROR in errors[5] and DUPLICATE_RULE_NM_ERROR in errors[6]
+    groups = find_duplicate_groups(rows)
+    assert [5, 6] in groups["RULE_NM"].values()
+    assert groups["RULE_SEQ_NR"]
+    for positions in groups["RULE_SEQ_NR"].values():
+        assert all(DUPLICATE_SEQUENCE_ERROR in errors[position] for position in positions)
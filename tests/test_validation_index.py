@@ -0,0 +1,55 @@
+from validation import RuleValidationIndex, validate_dataframe, validate_single_row
+
+def full_errors(frame):
+    """{row_id: [messages]} from a full validate_dataframe run."""
+    errors = {}
+    found = validate_dataframe(frame)
+    for row_id, message in zip(found["row_index"].tolist(), found["message"].tolist()):
+        errors.setdefault(row_id, []).append(message)
+    return errors
+
+def apply_to_frame(frame, changed=None, removed=()):
+    frame = frame.drop(index=list(removed))
+    for row_id, row in (changed or {}).items():
+        frame.loc[row_id] = row
+    return frame
+
+def check_apply(frame, changed=None, removed=()):
+    index = RuleValidationIndex.from_frame(frame)
+    index.apply(changed, removed)
+    assert index.errors == full_errors(apply_to_frame(frame, changed, removed))
+
+def test_from_frame_matches_full_validation(make_rules):
+    frame = make_rules(300, duplicate_rate=0.05, invalid_name_rate=0.1)
+    assert RuleValidationIndex.from_frame(frame).errors == full_errors(frame)
+
+def test_multi_row_apply_flags_existing_row(make_rules):
+    frame = make_rules(1)
+    duplicate = frame.iloc[0].to_dict()
+    check_apply(frame, {1: duplicate, 2: duplicate})
+    index = RuleValidationIndex.from_frame(frame)
+    index.apply({1: duplicate, 2: duplicate})
+    assert index.errors[0]
+
+def test_multi_row_apply_clears_duplicates(make_rules):
+    frame = make_rules(5)
+    duplicate = frame.iloc[0].to_dict()
+    frame = apply_to_frame(frame, {5: duplicate, 6: duplicate})
+    others = make_rules(10, seed=7)
+    # Rows 5 and 6 move away together, leaving row 0 unique again
+    check_apply(frame, {5: others.iloc[8].to_dict() | {"RULE_NM": "X_DL2_CNT_CHK"}, 6: others.iloc[9].to_dict()})
+    check_apply(frame, removed=[5, 6])
+
+def test_apply_matches_full_validation_on_edits(make_rules):
+    frame = make_rules(200, duplicate_rate=0.05, invalid_name_rate=0.1, seed=3)
+    rows = frame.to_dict("index")
+    changed = {1: rows[0], 2: rows[0], 3: rows[10], 250: rows[10], 251: rows[20]}
+    check_apply(frame, changed, removed=[4, 20, 30])
+
+def test_check_new_row_matches_validate_single_row(make_rules):
+    frame = make_rules(100, duplicate_rate=0.05, invalid_name_rate=0.1)
+    index = RuleValidationIndex.from_frame(frame)
+    rows = frame.to_dict("records")
+    others = make_rules(20, seed=11).to_dict("records")
+    for row in rows[:30] + others:
+        assert index.check_new_row(row) == validate_single_row(row, rows, is_new_row=True)
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import validation_jobs
+from rule_store import RuleStore, to_rule_schema
+from validation import sort_errors, validate_dataframe
+from validation_jobs import ValidationJob
+
+@pytest.fixture
+def frame(make_rules):
+    rulebook = make_rules(250, duplicate_rate=0.05, invalid_name_rate=0.1)
+    return RuleStore(to_rule_schema(rulebook)).frame.reset_index(drop=True)
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+def test_job_matches_validate_dataframe_across_chunk_boundaries(frame, executor):
+    job = ValidationJob(frame, version=7, chunksize=64).submit(executor)
+    assert job.wait(timeout=30) and job.exception() is None
+    assert job.rows_checked == job.total == 250
+    assert not job.cancelled and not job.checking_duplicates
+    expected = sort_errors(validate_dataframe(frame))
+    pd.testing.assert_frame_equal(job.errors(), expected, check_dtype=False)
+    assert job.error_count == len(expected)
+
+def test_cancelled_job_keeps_partial_results(frame, executor, monkeypatch):
+    job = ValidationJob(frame, version=7, chunksize=64)
+    calls = []
+
+    def validate_then_cancel(chunk, **kwargs):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            job.cancel()
+        return validate_dataframe(chunk, **kwargs)
+
+    monkeypatch.setattr(validation_jobs, "validate_dataframe", validate_then_cancel)
+    job.submit(executor)
+    assert job.wait(timeout=30) and job.cancelled
+    assert calls == [64, 64]
+    assert job.rows_checked == 128 and job.rows_checked / job.total < 1
+    errors = job.errors()
+    assert errors["row_index"].max() < 128
+    assert not errors["error_code"].isin(["RULE_SEQ_NR_DUPLICATE", "RULE_NM_DUPLICATE"]).any()
+    expected = sort_errors(validate_dataframe(frame.iloc[:128], check_duplicates=False))
+    pd.testing.assert_frame_equal(errors, expected, check_dtype=False)
+
+def test_empty_rulebook(executor):
+    frame = RuleStore().frame.reset_index(drop=True)
+    job = ValidationJob(frame, version=0).submit(executor)
+    assert job.wait(timeout=30)
+    assert job.total == job.rows_checked == 0 and job.errors().empty
@@ -1,30 +1,115 @@
 import re
+from collections import defaultdict, namedtuple
+
+# numpy and pandas are imported inside the frame-based functions, so the
+# per-row validators and the rule-name classifiers load without them
+
+APPL_CD_INCOMPLETE_ERROR = "APPL_CD must be completed. Please provide a full application code (e.g., EMM_PAYMENTS, EMM_FINANCE, etc.)."
+APPL_CD_TOO_SHORT_ERROR = "APPL_CD appears to be too short. Please provide a meaningful application code."
+ABORT_IND_NOT_N_ERROR = "RULE_ABORT_IND must be 'N' for CNT_CHK or SUM_CHK."
+ABORT_IND_NOT_Y_ERROR = "RULE_ABORT_IND must be 'Y' for RULE_VALID_METH_CD values other than CNT_CHK or SUM_CHK."
+TRGT_ATTR_NM_MISSING_ERROR = "RULE_TRGT_ATTR_NM cannot be blank or 'NA' when RULE_VALID_METH_CD is SUM_CHK or DIFF_SUM_CHK. Please specify the attribute/column name to sum."
+DUPLICATE_SEQUENCE_ERROR = "Duplicate RULE_TRGT_OBJ_ID_TXT with same RULE_VALID_CTGY_NM and RULE_SEQ_NR."
+DUPLICATE_RULE_NM_ERROR = "RULE_NM already exists."
+RULE_NM_NONSTANDARD_ERROR = "RULE_NM does not match any of the specified patterns"
+
+# error_code -> (field, message), in the order validate_single_row reports them
+ERROR_CODES = {
+    "APPL_CD_INCOMPLETE": ("APPL_CD", APPL_CD_INCOMPLETE_ERROR),
+    "APPL_CD_TOO_SHORT": ("APPL_CD", APPL_CD_TOO_SHORT_ERROR),
+    "RULE_ABORT_IND_NOT_N": ("RULE_ABORT_IND", ABORT_IND_NOT_N_ERROR),
+    "RULE_ABORT_IND_NOT_Y": ("RULE_ABORT_IND", ABORT_IND_NOT_Y_ERROR),
+    "RULE_TRGT_ATTR_NM_MISSING": ("RULE_TRGT_ATTR_NM", TRGT_ATTR_NM_MISSING_ERROR),
+    "RULE_SEQ_NR_DUPLICATE": ("RULE_SEQ_NR", DUPLICATE_SEQUENCE_ERROR),
+    "RULE_NM_DUPLICATE": ("RULE_NM", DUPLICATE_RULE_NM_ERROR),
+    "RULE_NM_NONSTANDARD": ("RULE_NM", RULE_NM_NONSTANDARD_ERROR),
+}
+
+ERROR_MESSAGE_CODES = {message: code for code, (field, message) in ERROR_CODES.items()}
+
+NO_ABORT_METHODS = ["CNT_CHK", "SUM_CHK"]
+SUM_METHODS = ["SUM_CHK", "DIFF_SUM_CHK"]
+SEQUENCE_KEY_FIELDS = ["RULE_TRGT_OBJ_ID_TXT", "RULE_VALID_CTGY_NM", "RULE_SEQ_NR"]
+
+# Every naming standard in one alternation. The named groups tell which
+# branch matched: plain layer checks, DIFF checks between two layers, or the
+# information-layer DUP/OVERLAP checks.
+RULE_NAME_STANDARD_PATTERN = (
+    r"(?P<standard>"
+    r"(?P<diff_layer>OP_HOP3_HOP2|OP_HOP2_HOP1|OP_HOP1_DL2|DL2_FND|STG_INFO)_DIFF_(?P<diff_check>CNT|SUM)"
+    r"|(?P<layer>OP_HOP3|OP_HOP2|OP_HOP1|DL2|FND_DL3|STG_DL3|INFO_DL3)_(?P<check>CNT|SUM)"
+    r"|(?P<info_layer>INFO_DL3)_(?P<info_check>DUP|OVERLAP)"
+    r")_CHK"
+)
+RULE_NAME_REGEX = re.compile(rf"^[A-Z0-9_]+{RULE_NAME_STANDARD_PATTERN}$")
+# Unanchored variant for description generation: finds "_<standard>_CHK"
+# anywhere in the name, so names typed with lowercase or dotted table names
+# still classify
+RULE_NAME_SEARCH_REGEX = re.compile(rf"_{RULE_NAME_STANDARD_PATTERN}")
+
+RuleNameClass = namedtuple("RuleNameClass", ["layer", "method", "is_diff"])
+
+def _class_from_match(match):
+    if match.group("diff_layer"):
+        return RuleNameClass(match.group("diff_layer"), f"DIFF_{match.group('diff_check')}_CHK", True)
+    if match.group("layer"):
+        return RuleNameClass(match.group("layer"), f"{match.group('check')}_CHK", False)
+    return RuleNameClass(match.group("info_layer"), f"{match.group('info_check')}_CHK", False)
+
+# The "standard" group can only take a couple of dozen values, so each one is
+# classified up front and classify_rule_name becomes a dict lookup.
+_RULE_NAME_STANDARDS = (
+    [f"{layer}_DIFF_{check}" for layer in ["OP_HOP3_HOP2", "OP_HOP2_HOP1", "OP_HOP1_DL2", "DL2_FND", "STG_INFO"] for check in ["CNT", "SUM"]]
+    + [f"{layer}_{check}" for layer in ["OP_HOP3", "OP_HOP2", "OP_HOP1", "DL2", "FND_DL3", "STG_DL3", "INFO_DL3"] for check in ["CNT", "SUM"]]
+    + ["INFO_DL3_DUP", "INFO_DL3_OVERLAP"]
+)
+_RULE_NAME_CLASSES = {
+    standard: _class_from_match(RULE_NAME_REGEX.match(f"X{standard}_CHK")) for standard in _RULE_NAME_STANDARDS
+}
+
+def classify_rule_name(rule_name):
+    """Classify a RULE_NM against the naming standards in a single regex pass.
+
+    Returns RuleNameClass(layer, method, is_diff), e.g. ("OP_HOP1_DL2",
+    "DIFF_CNT_CHK", True), or None when the name matches no standard.
+    """
+    match = RULE_NAME_REGEX.match(rule_name)
+    return _RULE_NAME_CLASSES[match.group("standard")] if match else None
+
+def search_rule_name_class(rule_name):
+    """Classify the first naming standard found anywhere in a RULE_NM, or None.
+
+    Unlike classify_rule_name this does not require the whole name to conform,
+    e.g. "my.tbl_DL2_CNT_CHK" classifies as DL2.
+    """
+    match = RULE_NAME_SEARCH_REGEX.search(rule_name)
+    return _RULE_NAME_CLASSES[match.group("standard")] if match else None
 
 def validate_rule_abort_ind(row):
     errors = []
     rule_valid_meth_cd = row.get("RULE_VALID_METH_CD", "")
     rule_abort_ind = row.get("RULE_ABORT_IND", "")
-    if rule_valid_meth_cd in ["CNT_CHK", "SUM_CHK"] and rule_abort_ind == "Y":
-        errors.append("RULE_ABORT_IND must be 'N' for CNT_CHK or SUM_CHK.")
-    if rule_valid_meth_cd not in ["CNT_CHK", "SUM_CHK"] and rule_abort_ind == "N":
-        errors.append("RULE_ABORT_IND must be 'Y' for RULE_VALID_METH_CD values other than CNT_CHK or SUM_CHK.")
+    if rule_valid_meth_cd in NO_ABORT_METHODS and rule_abort_ind == "Y":
+        errors.append(ABORT_IND_NOT_N_ERROR)
+    if rule_valid_meth_cd not in NO_ABORT_METHODS and rule_abort_ind == "N":
+        errors.append(ABORT_IND_NOT_Y_ERROR)
     return errors
 
 def validate_rule_trgt_attr_nm(row):
     errors = []
     meth = row.get("RULE_VALID_METH_CD", "")
     attr = row.get("RULE_TRGT_ATTR_NM", "")
-    if meth in ["SUM_CHK", "DIFF_SUM_CHK"] and (not attr or attr.strip() == "" or attr == "NA"):
-        errors.append("RULE_TRGT_ATTR_NM cannot be blank or 'NA' when RULE_VALID_METH_CD is SUM_CHK or DIFF_SUM_CHK. Please specify the attribute/column name to sum.")
+    if meth in SUM_METHODS and (not attr or attr.strip() == "" or attr == "NA"):
+        errors.append(TRGT_ATTR_NM_MISSING_ERROR)
     return errors
 
 def validate_appl_cd(row):
     errors = []
     appl_cd = row.get("APPL_CD", "").strip()
     if not appl_cd or appl_cd == "EMM_" or appl_cd.endswith("_"):
-        errors.append("APPL_CD must be completed. Please provide a full application code (e.g., EMM_PAYMENTS, EMM_FINANCE, etc.).")
+        errors.append(APPL_CD_INCOMPLETE_ERROR)
     if appl_cd and len(appl_cd) < 4:
-        errors.append("APPL_CD appears to be too short. Please provide a meaningful application code.")
+        errors.append(APPL_CD_TOO_SHORT_ERROR)
     return errors
 
 def validate_rule_sequence_number(row, all_rows, is_new_row=True):
@@ -37,7 +122,7 @@ def validate_rule_sequence_number(row, all_rows, is_new_row=True):
             r.get("RULE_SEQ_NR") == row.get("RULE_SEQ_NR"))
     ]
     if len(sequence_number_duplicates) > allowed_duplicate_count:
-        errors.append("Duplicate RULE_TRGT_OBJ_ID_TXT with same RULE_VALID_CTGY_NM and RULE_SEQ_NR.")
+        errors.append(DUPLICATE_SEQUENCE_ERROR)
     return errors
 
 def validate_rule_name_is_unique(row, all_rows, is_new_row=True):
@@ -45,30 +130,14 @@ def validate_rule_name_is_unique(row, all_rows, is_new_row=True):
     allowed_duplicate_count = 0 if is_new_row else 1
     rule_name_duplicates = [r for r in all_rows if r.get("RULE_NM") == row.get("RULE_NM")]
     if len(rule_name_duplicates) > allowed_duplicate_count:
-        errors.append("RULE_NM already exists.")
+        errors.append(DUPLICATE_RULE_NM_ERROR)
     return errors
 
 def validate_rule_name_matches_standards(row):
     errors = []
-    rule_name_patterns = [
-        r"^[A-Z0-9_]+OP_HOP3_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+OP_HOP2_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+OP_HOP1_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+DL2_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+FND_DL3_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+STG_DL3_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+INFO_DL3_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+OP_HOP3_HOP2_DIFF_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+OP_HOP2_HOP1_DIFF_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+OP_HOP1_DL2_DIFF_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+DL2_FND_DIFF_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+STG_INFO_DIFF_(CNT|SUM)_CHK$",
-        r"^[A-Z0-9_]+INFO_DL3_DUP_CHK$",
-        r"^[A-Z0-9_]+INFO_DL3_OVERLAP_CHK$"
-    ]
     rule_name = row.get("RULE_NM", "")
-    if not any(re.match(pattern, rule_name) for pattern in rule_name_patterns):
-        errors.append("RULE_NM does not match any of the specified patterns")
+    if not RULE_NAME_REGEX.match(rule_name):
+        errors.append(RULE_NM_NONSTANDARD_ERROR)
     return errors
 
 def validate_single_row(row, all_rows, is_new_row=True):
@@ -80,3 +149,269 @@ def validate_single_row(row, all_rows, is_new_row=True):
     errors.extend(validate_rule_name_is_unique(row, all_rows, is_new_row))
     errors.extend(validate_rule_name_matches_standards(row))
     return errors
+
+def sequence_key(row):
+    return tuple(row.get(field) for field in SEQUENCE_KEY_FIELDS)
+
+def build_duplicate_indexes(rows):
+    """Index row positions by RULE_NM and by the target/category/sequence key in one pass."""
+    name_index = defaultdict(list)
+    sequence_index = defaultdict(list)
+    for i, row in enumerate(rows):
+        name_index[row.get("RULE_NM")].append(i)
+        sequence_index[sequence_key(row)].append(i)
+    return name_index, sequence_index
+
+def find_duplicate_groups(rows):
+    """Return every RULE_NM and sequence-key group that holds more than one row."""
+    name_index, sequence_index = build_duplicate_indexes(rows)
+    return {
+        "RULE_NM": {key: idx for key, idx in name_index.items() if len(idx) > 1},
+        "RULE_SEQ_NR": {key: idx for key, idx in sequence_index.items() if len(idx) > 1},
+    }
+
+def validate_all(rows):
+    """Validate a whole rulebook in linear time.
+
+    Returns one error list per row, identical to calling
+    validate_single_row(row, rows, is_new_row=False) for every row.
+    """
+    name_index, sequence_index = build_duplicate_indexes(rows)
+    results = []
+    for row in rows:
+        errors = []
+        errors.extend(validate_appl_cd(row))
+        errors.extend(validate_rule_abort_ind(row))
+        errors.extend(validate_rule_trgt_attr_nm(row))
+        if len(sequence_index[sequence_key(row)]) > 1:
+            errors.append(DUPLICATE_SEQUENCE_ERROR)
+        if len(name_index[row.get("RULE_NM")]) > 1:
+            errors.append(DUPLICATE_RULE_NM_ERROR)
+        errors.extend(validate_rule_name_matches_standards(row))
+        results.append(errors)
+    return results
+
+def _text_column(df, field):
+    import pandas as pd
+
+    if field not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    values = df[field]
+    if isinstance(values.dtype, pd.StringDtype) and not values.hasnans:
+        return values
+    return values.astype(object).where(values.notna(), "").astype(str)
+
+def validate_dataframe(df, check_rows=True, check_duplicates=True):
+    """Run the validate_single_row checks column-wise over a whole rulebook frame.
+
+    Returns a tidy frame with one row per error: row_index (the label of the
+    offending row in df), field, error_code and message, ordered the same way
+    as the per-row validators report them. check_rows and check_duplicates
+    select the row-local checks and the two uniqueness checks respectively.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rule_nm = _text_column(df, "RULE_NM")
+    checks = []
+    if check_rows:
+        appl_cd = _text_column(df, "APPL_CD").str.strip()
+        meth = _text_column(df, "RULE_VALID_METH_CD")
+        abort_ind = _text_column(df, "RULE_ABORT_IND")
+        attr = _text_column(df, "RULE_TRGT_ATTR_NM")
+        no_abort = meth.isin(NO_ABORT_METHODS)
+        checks.extend([
+            ("APPL_CD_INCOMPLETE", (appl_cd == "") | (appl_cd == "EMM_") | appl_cd.str.endswith("_")),
+            ("APPL_CD_TOO_SHORT", (appl_cd != "") & (appl_cd.str.len() < 4)),
+            ("RULE_ABORT_IND_NOT_N", no_abort & (abort_ind == "Y")),
+            ("RULE_ABORT_IND_NOT_Y", ~no_abort & (abort_ind == "N")),
+            ("RULE_TRGT_ATTR_NM_MISSING", meth.isin(SUM_METHODS) & ((attr.str.strip() == "") | (attr == "NA"))),
+        ])
+    if check_duplicates:
+        sequence = pd.DataFrame({field: _text_column(df, field) for field in SEQUENCE_KEY_FIELDS})
+        checks.append(("RULE_SEQ_NR_DUPLICATE", sequence.duplicated(keep=False)))
+        checks.append(("RULE_NM_DUPLICATE", rule_nm.duplicated(keep=False)))
+    if check_rows:
+        checks.append(("RULE_NM_NONSTANDARD", ~rule_nm.str.match(RULE_NAME_REGEX.pattern)))
+
+    positions = [np.empty(0, dtype=np.intp)]
+    orders = [np.empty(0, dtype=np.intp)]
+    for order, (code, mask) in enumerate(checks):
+        hits = np.flatnonzero(mask.to_numpy(dtype=bool))
+        positions.append(hits)
+        orders.append(np.full(len(hits), order))
+    positions = np.concatenate(positions)
+    orders = np.concatenate(orders)
+    sort = np.lexsort((orders, positions))
+    check_codes = [code for code, _ in checks]
+    return pd.DataFrame({
+        "row_index": df.index.to_numpy()[positions[sort]],
+        "field": np.array([ERROR_CODES[code][0] for code in check_codes], dtype=object)[orders[sort]],
+        "error_code": np.array(check_codes, dtype=object)[orders[sort]],
+        "message": np.array([ERROR_CODES[code][1] for code in check_codes], dtype=object)[orders[sort]],
+    })
+
+def sort_errors(errors):
+    """Order a tidy error frame by row, then in validate_single_row check order."""
+    import numpy as np
+
+    check_order = errors["error_code"].map({code: i for i, code in enumerate(ERROR_CODES)})
+    order = np.lexsort((check_order.to_numpy(), errors["row_index"].to_numpy()))
+    return errors.iloc[order].reset_index(drop=True)
+
+def format_errors(errors):
+    """Render a tidy error frame as "Row N: message" lines."""
+    return [f"Row {row_index + 1}: {message}" for row_index, message in zip(errors["row_index"], errors["message"])]
+
+def tidy_errors(row_messages):
+    """Build a tidy error frame (as validate_dataframe returns) from (row_index, message) pairs."""
+    import pandas as pd
+
+    row_messages = list(row_messages)
+    codes = [ERROR_MESSAGE_CODES[message] for _, message in row_messages]
+    return pd.DataFrame({
+        "row_index": pd.array([row_index for row_index, _ in row_messages], dtype="int64"),
+        "field": pd.Series([ERROR_CODES[code][0] for code in codes], dtype=object),
+        "error_code": pd.Series(codes, dtype=object),
+        "message": pd.Series([message for _, message in row_messages], dtype=object),
+    })
+
+def error_report(errors, rule_names):
+    """Error report for display and download: 1-based row, RULE_NM, field, error_code and message.
+
+    errors is a tidy error frame whose row_index values are positions in
+    rule_names, the RULE_NM column of the validated rules.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rows = errors["row_index"].to_numpy(dtype=np.int64)
+    return pd.DataFrame({
+        "row": rows + 1,
+        "RULE_NM": np.asarray(rule_names, dtype=object)[rows],
+        "field": errors["field"].to_numpy(),
+        "error_code": errors["error_code"].to_numpy(),
+        "message": errors["message"].to_numpy(),
+    })
+
+class RuleValidationIndex:
+    """Uniqueness indexes and per-row errors for a rulebook, maintained by row id.
+
+    Row-local errors are cached per row, so applying an edit only re-checks
+    the edited rows and recomposes the errors of rows whose RULE_NM or
+    sequence-key group gained or lost a member.
+    """
+
+    def __init__(self):
+        self._by_name = defaultdict(set)
+        self._by_sequence = defaultdict(set)
+        self._keys = {}
+        self._local_errors = {}
+        self.errors = {}
+        self.version = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the index for a rulebook frame whose index labels are row ids."""
+        index = cls()
+        names = _text_column(df, "RULE_NM").tolist()
+        sequences = zip(*(_text_column(df, field).tolist() for field in SEQUENCE_KEY_FIELDS))
+        for row_id, name, key in zip(df.index.tolist(), names, sequences):
+            index._add_keys(row_id, name, key)
+            index._local_errors[row_id] = ([], [])
+        errors = validate_dataframe(df)
+        for row_id, code, message in zip(errors["row_index"].tolist(), errors["error_code"].tolist(), errors["message"].tolist()):
+            if code not in ("RULE_SEQ_NR_DUPLICATE", "RULE_NM_DUPLICATE"):
+                leading, trailing = index._local_errors[row_id]
+                (trailing if code == "RULE_NM_NONSTANDARD" else leading).append(message)
+        for row_id in set(errors["row_index"].tolist()):
+            index._compose(row_id)
+        return index
+
+    def _add_keys(self, row_id, name, key):
+        self._keys[row_id] = (name, key)
+        self._by_name[name].add(row_id)
+        self._by_sequence[key].add(row_id)
+
+    def _remove_keys(self, row_id):
+        name, key = self._keys.pop(row_id)
+        for index, value in ((self._by_name, name), (self._by_sequence, key)):
+            index[value].discard(row_id)
+            if not index[value]:
+                del index[value]
+        return name, key
+
+    def _compose(self, row_id):
+        name, key = self._keys[row_id]
+        leading, trailing = self._local_errors[row_id]
+        errors = list(leading)
+        if len(self._by_sequence[key]) > 1:
+            errors.append(DUPLICATE_SEQUENCE_ERROR)
+        if len(self._by_name[name]) > 1:
+            errors.append(DUPLICATE_RULE_NM_ERROR)
+        errors.extend(trailing)
+        if errors:
+            self.errors[row_id] = errors
+        else:
+            self.errors.pop(row_id, None)
+
+    def check_new_row(self, row):
+        """validate_single_row(row, indexed rules, is_new_row=True) from the indexes, without adding row."""
+        errors = validate_appl_cd(row) + validate_rule_abort_ind(row) + validate_rule_trgt_attr_nm(row)
+        if sequence_key(row) in self._by_sequence:
+            errors.append(DUPLICATE_SEQUENCE_ERROR)
+        if row.get("RULE_NM") in self._by_name:
+            errors.append(DUPLICATE_RULE_NM_ERROR)
+        errors.extend(validate_rule_name_matches_standards(row))
+        return errors
+
+    def apply(self, changed=None, removed=()):
+        """Apply upserted rows ({row_id: row dict}) and removed row ids.
+
+        Returns the set of row ids whose errors were recomposed.
+        """
+        changed = changed or {}
+        groups = {}
+        for row_id in list(removed) + list(changed):
+            if row_id in self._keys:
+                name, key = self._keys[row_id]
+                groups[(0, name)] = groups[(1, key)] = None
+        for row in changed.values():
+            groups[(0, row.get("RULE_NM"))] = groups[(1, sequence_key(row))] = None
+        indexes = (self._by_name, self._by_sequence)
+        # Sizes before the whole batch: one apply() can take a group from one member to many
+        for which, value in groups:
+            groups[(which, value)] = len(indexes[which].get(value, ()))
+        for row_id in removed:
+            if row_id in self._keys:
+                self._remove_keys(row_id)
+                self._local_errors.pop(row_id, None)
+                self.errors.pop(row_id, None)
+        for row_id, row in changed.items():
+            if row_id in self._keys:
+                self._remove_keys(row_id)
+            self._add_keys(row_id, row.get("RULE_NM"), sequence_key(row))
+            self._local_errors[row_id] = (
+                validate_appl_cd(row) + validate_rule_abort_ind(row) + validate_rule_trgt_attr_nm(row),
+                validate_rule_name_matches_standards(row),
+            )
+        affected = set(changed)
+        for (which, value), size in groups.items():
+            group = indexes[which].get(value, set())
+            # Members only change duplicate status when their group crosses between one and two members
+            if (size > 1) != (len(group) > 1):
+                affected |= group
+        for row_id in affected:
+            self._compose(row_id)
+        return affected
+
+    def error_frame(self, row_ids):
+        """Tidy error frame of the current errors, row_index being each row's position in row_ids."""
+        error_ids = list(self.errors)
+        positions = row_ids.get_indexer(error_ids)
+        return tidy_errors((position, error) for position, row_id in sorted(zip(positions.tolist(), error_ids))
+                           for error in self.errors[row_id])
+
+    def error_lines(self, row_ids):
+        """Render the errors as "Row N: message" lines, N being the position in row_ids."""
+        return format_errors(self.error_frame(row_ids))
@@ -0,0 +1,92 @@
+"""Whole-rulebook validation in a background thread.
+
+A ValidationJob validates a snapshot of the rules frame: the row checks run
+chunk by chunk, so progress and the errors found so far can be read while
+it runs, then the uniqueness checks run over the whole snapshot. cancel()
+stops the job before its next chunk. The worker only touches its own
+snapshot, never Streamlit, so the app can poll it from later reruns.
+"""
+import threading
+import time
+from concurrent.futures import wait
+
+from validation import sort_errors, validate_dataframe
+
+VALIDATION_CHUNK_SIZE = 10000
+
+class ValidationJob:
+    """Background validation of one rulebook version; submit() starts it on an executor."""
+
+    def __init__(self, frame, version, chunksize=VALIDATION_CHUNK_SIZE):
+        self.version = version
+        self.total = len(frame)
+        self.rows_checked = 0
+        self.error_count = 0
+        self.future = None
+        self.started = None
+        self.finished = None
+        self._frame = frame
+        self._chunksize = chunksize
+        self._error_frames = [validate_dataframe(frame.iloc[:0])]
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def submit(self, executor):
+        self.started = time.perf_counter()
+        self.future = executor.submit(self._run)
+        return self
+
+    def _add_errors(self, errors, rows_checked=0):
+        with self._lock:
+            self._error_frames.append(errors)
+            self.error_count += len(errors)
+            self.rows_checked += rows_checked
+
+    def _run(self):
+        frame = self._frame
+        try:
+            for start in range(0, len(frame), self._chunksize):
+                if self._cancelled.is_set():
+                    return
+                chunk = frame.iloc[start:start + self._chunksize]
+                self._add_errors(validate_dataframe(chunk, check_duplicates=False), len(chunk))
+            if not self._cancelled.is_set():
+                self._add_errors(validate_dataframe(frame, check_rows=False))
+        finally:
+            self._frame = None
+            self.finished = time.perf_counter()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    @property
+    def checking_duplicates(self):
+        """True once every row is checked and only the uniqueness checks remain."""
+        return self.rows_checked == self.total and not self.done
+
+    def wait(self, timeout=None):
+        """Wait up to timeout seconds for the job; returns whether it has finished."""
+        done, _ = wait([self.future], timeout=timeout)
+        return bool(done)
+
+    def exception(self):
+        """The exception that stopped the job, or None."""
+        return self.future.exception() if self.done and not self.future.cancelled() else None
+
+    def errors(self):
+        """Tidy error frame of everything found so far, ordered by row (see validate_dataframe)."""
+        import pandas as pd
+
+        with self._lock:
+            frames = list(self._error_frames)
+        return sort_errors(pd.concat(frames, ignore_index=True))